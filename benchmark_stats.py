@@ -0,0 +1,228 @@
+"""
+Benchmark Statistik: versi lama vs engine yang dipakai scraper
+==============================================================
+Data: 1 tahun sampel 5 menit (105.120 baris) dengan format CSV Cacti
+(Date, CDEF_In, Inbound, CDEF_Out, Outbound) dan sebagian nilai NaN.
+
+Yang dibandingkan (semua mulai dari teks respons, kecuali nomor 4):
+1. Versi lama: csv.reader + _calculate_stats_from_csv (loop float +
+   sum/max, termasuk bug outbound yang ter-append dua kali)
+2. csv_stream.iter_samples (parser cepat, schema sudah di-cache seperti
+   export kedua dst. dalam satu run) + stats_from_samples: kolom float64
+   lalu NumPy, dan fallback tanpa NumPy (StatsAccumulator)
+3. Parse + day_slot_stats: statistik config.TIME_SLOTS setiap hari
+   (jalur slot mode cepat)
+4. stats_from_columns dari kolom float64 (jalur day_files, tanpa
+   parse), NumPy jika terinstall dan Python murni
+(lalu sekali lagi dengan persentil config.PERCENTILE, atau p95 jika 0)
+
+Hasil di satu mesin (NumPy terinstall, tanpa persentil): versi lama
+~188 ms, parse + stats_from_samples NumPy ~180 ms / tanpa NumPy ~207 ms,
+parse + day_slot_stats ~272 ms, stats_from_columns NumPy ~0.4 ms /
+Python ~11 ms. Parse per baris adalah bagian terbesar; begitu data ada
+sebagai kolom float64 (day_files), statistiknya hampir gratis.
+
+Jalankan: python benchmark_stats.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(__file__))
+import csv
+import config
+import traffic_stats
+from csv_stream import SchemaCache, detect_columns, iter_samples
+from traffic_stats import day_slot_stats, stats_from_columns, stats_from_samples
+
+
+HEADER = ["Date", "CDEF_In", "Inbound", "CDEF_Out", "Outbound"]
+ROUNDS = 5
+
+
+def legacy_parse(text):
+    """Salinan parse CSV scraper sebelum csv_stream (csv.reader, list baris)"""
+    if text.startswith('\ufeff'):
+        text = text[1:]
+    metadata = {}
+    rows = []
+    reading_data = False
+    header_row = None
+    for row in csv.reader(StringIO(text)):
+        if not row:
+            continue
+        if len(row) >= 2 and "Title" in row[0]:
+            metadata['title'] = row[1]
+        if row[0] == "Date":
+            reading_data = True
+            header_row = row
+            continue
+        if reading_data:
+            rows.append(row)
+    return {"title": metadata.get('title', ''), "header": header_row, "rows": rows}
+
+
+def legacy_stats(rows, header):
+    """Salinan _calculate_stats_from_csv sebelum engine baru (sebagai pembanding)"""
+    if not rows or not header:
+        return None
+
+    idx_in, idx_out = detect_columns(header)
+    in_values = []
+    out_values = []
+
+    for row in rows:
+        try:
+            if idx_in != -1 and idx_in < len(row):
+                val = row[idx_in]
+                if val and val != 'NaN':
+                    in_values.append(float(val))
+                elif val == 'NaN':
+                    in_values.append(0.0)
+
+            if idx_out != -1 and idx_out < len(row):
+                val = row[idx_out]
+                if val and val != 'NaN':
+                    out_values.append(float(val))
+                elif val == 'NaN':
+                    out_values.append(0.0)
+                val = row[idx_out]
+                if val and val != 'NaN':
+                    out_values.append(float(val))
+        except ValueError:
+            continue
+
+    fmt = traffic_stats.fmt
+    return {
+        "curr_in": fmt(in_values[-1] if in_values else 0),
+        "avg_in": fmt(sum(in_values) / len(in_values) if in_values else 0),
+        "max_in": fmt(max(in_values) if in_values else 0),
+        "curr_out": fmt(out_values[-1] if out_values else 0),
+        "avg_out": fmt(sum(out_values) / len(out_values) if out_values else 0),
+        "max_out": fmt(max(out_values) if out_values else 0),
+    }
+
+
+def generate_year(seed=42, nan_ratio=0.02):
+    """Baris CSV 1 tahun (5 menit), nilai acak dengan pola harian"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    rows = []
+    for i in range(365 * 288):
+        ts = start + timedelta(minutes=5 * i)
+        base = 20e6 + 60e6 * max(0.0, 1 - abs(ts.hour - 13) / 9)
+        if rng.random() < nan_ratio:
+            in_val = out_val = "NaN"
+        else:
+            in_val = f"{base * rng.uniform(0.7, 1.3):.6e}"
+            out_val = f"{base * 0.2 * rng.uniform(0.7, 1.3):.6e}"
+        rows.append([ts.strftime("%Y-%m-%d %H:%M:%S"), in_val, in_val, out_val, out_val])
+    return rows
+
+
+def to_lines(rows):
+    """Respons graph_xport (baris teks) dari baris data"""
+    lines = ['"Title","Router - Traffic - ether1"', '"Vertical Label","bits per second"', '',
+             ",".join(f'"{col}"' for col in HEADER)]
+    lines.extend(f'"{row[0]}",' + ",".join(row[1:]) for row in rows)
+    return lines
+
+
+def legacy_run(text):
+    """Jalur lama lengkap: parse teks lalu statistik"""
+    csv_data = legacy_parse(text)
+    return legacy_stats(csv_data['rows'], csv_data['header'])
+
+
+def sample_stats(lines, schemas, use_numpy):
+    """Parser cepat (schema sudah di-cache) + stats_from_samples"""
+    saved = traffic_stats.HAS_NUMPY
+    traffic_stats.HAS_NUMPY = use_numpy
+    try:
+        return stats_from_samples(iter_samples(lines, {}, schemas, "g"))
+    finally:
+        traffic_stats.HAS_NUMPY = saved
+
+
+def slot_stats(lines, schemas):
+    """Parser cepat + statistik semua slot config.TIME_SLOTS untuk 365 hari"""
+    return day_slot_stats(iter_samples(lines, {}, schemas, "g"), None, config.TIME_SLOTS, raw=True)
+
+
+def bench(label, fn, data):
+    fn(data)  # warm-up
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = fn(data)
+    elapsed = (time.perf_counter() - started) / ROUNDS
+    print(f"  {label:<38} {elapsed * 1000:9.1f} ms")
+    return result, elapsed
+
+
+def main():
+    print("=" * 70)
+    print("  BENCHMARK STATISTIK TRAFFIC (1 tahun, sampel 5 menit)")
+    print("=" * 70)
+
+    rows = generate_year()
+    lines = to_lines(rows)
+    text = "\r\n".join(lines)
+    # Export pertama mengisi cache schema, setelah itu parser cepat
+    schemas = SchemaCache()
+    samples = list(iter_samples(lines, {}, schemas, "g"))
+    nan = float('nan')
+    columns = ([nan if s[1] is None else s[1] for s in samples],
+               [nan if s[2] is None else s[2] for s in samples])
+    print(f"\n  Baris data : {len(rows):,}")
+    print(f"  NumPy      : {'ya' if traffic_stats.HAS_NUMPY else 'tidak terinstall'}\n")
+
+    def run_engines():
+        results = {}
+        if traffic_stats.HAS_NUMPY:
+            results['samples_numpy'], _ = bench("Parse + stats_from_samples (NumPy)",
+                                                lambda l: sample_stats(l, schemas, True), lines)
+        results['samples_python'], _ = bench("Parse + stats_from_samples (Python)",
+                                             lambda l: sample_stats(l, schemas, False), lines)
+        bench(f"Parse + day_slot_stats ({len(config.TIME_SLOTS)} slot)",
+              lambda l: slot_stats(l, schemas), lines)
+        results['python'], _ = bench("stats_from_columns (Python)",
+                                     lambda c: stats_from_columns(list(c[0]), list(c[1])), columns)
+        if traffic_stats.HAS_NUMPY:
+            arrays = (traffic_stats.np.array(columns[0]), traffic_stats.np.array(columns[1]))
+            results['numpy'], _ = bench("stats_from_columns (NumPy)",
+                                        lambda c: stats_from_columns(*c), arrays)
+        return results
+
+    # Perbandingan setara dengan versi lama: tanpa persentil
+    saved = config.PERCENTILE, config.EXCEL_COL_PCT_IN
+    percentile = config.PERCENTILE or 95
+    config.PERCENTILE = 0
+
+    legacy, _ = bench("Versi lama (parse + statistik)", legacy_run, text)
+    results = run_engines()
+    if any(result != results['python'] for result in results.values()):
+        print("  ❌ Hasil engine BERBEDA!")
+        return 1
+
+    # Persentil hanya dihitung jika ada kolom Excel-nya
+    config.PERCENTILE, config.EXCEL_COL_PCT_IN = percentile, config.EXCEL_COL_PCT_IN or 9
+    print(f"\n  Dengan persentil p{percentile}:")
+    pct = run_engines()['python']
+    print(f"    pct_in={pct['pct_in']}, pct_out={pct['pct_out']}")
+    config.PERCENTILE, config.EXCEL_COL_PCT_IN = saved
+
+    print("\n  Hasil (NAN_POLICY = zero):")
+    for key in ("curr_in", "avg_in", "max_in", "curr_out", "avg_out", "max_out"):
+        marker = "" if legacy[key] == results['python'][key] else "  <- bug double-append versi lama"
+        print(f"    {key:<9} lama={legacy[key]:>10}  baru={results['python'][key]:>10}{marker}")
+
+    skip = stats_from_columns(*columns, nan_policy=traffic_stats.NAN_SKIP)
+    print(f"\n  NAN_POLICY = skip: avg_in={skip['avg_in']}, avg_out={skip['avg_out']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Cacti Auth Module
+Login ulang ke Cacti tanpa browser (requests only)
+
+- Token CSRF (__csrf_magic) diambil dari halaman auth_login.php
+- Username/password dari environment (CACTI_USERNAME / CACTI_PASSWORD)
+  atau file lokal config.CREDENTIALS_FILE
+- Cookie baru ditulis ke cacti_cookies.json secara atomic
+- Worker paralel berbagi satu proses login (tidak saling balapan)
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Callable, Optional, Tuple
+from urllib.parse import urlparse
+
+import config
+
+
+CSRF_INPUT_PATTERN = re.compile(r'<input\b[^>]*\bname=["\']__csrf_magic["\'][^>]*>', re.IGNORECASE)
+CSRF_VALUE_PATTERN = re.compile(r'\bvalue=["\']([^"\']+)["\']')
+CSRF_SCRIPT_PATTERN = re.compile(r'csrfMagicToken\s*=\s*["\']([^"\']+)["\']')
+
+
+def load_credentials() -> Optional[Tuple[str, str]]:
+    """
+    Username & password Cacti
+
+    Urutan: environment CACTI_USERNAME/CACTI_PASSWORD, lalu file
+    config.CREDENTIALS_FILE ({"username": "...", "password": "..."}).
+
+    Returns:
+        (username, password), atau None jika tidak dikonfigurasi
+    """
+    username = os.environ.get("CACTI_USERNAME")
+    password = os.environ.get("CACTI_PASSWORD")
+    if username and password:
+        return username, password
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.CREDENTIALS_FILE)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (IOError, ValueError):
+        return None
+
+    if data.get("username") and data.get("password"):
+        return data["username"], data["password"]
+    return None
+
+
+def login_url() -> str:
+    """URL auth_login.php di server yang sama dengan config.CACTI_URL"""
+    parsed = urlparse(config.CACTI_URL)
+    base_path = parsed.path.rsplit('/', 1)[0]
+    return f"{parsed.scheme}://{parsed.netloc}{base_path}/auth_login.php"
+
+
+def extract_csrf_token(page: str) -> Optional[str]:
+    """Token __csrf_magic dari form login (atau variabel JS csrfMagicToken)"""
+    tag = CSRF_INPUT_PATTERN.search(page)
+    if tag:
+        value = CSRF_VALUE_PATTERN.search(tag.group(0))
+        if value:
+            return value.group(1)
+    script = CSRF_SCRIPT_PATTERN.search(page)
+    return script.group(1) if script else None
+
+
+def login(session, username: str, password: str) -> bool:
+    """
+    Login ke Cacti memakai session requests (cookie session ikut diperbarui)
+
+    Returns:
+        True jika login berhasil
+    """
+    url = login_url()
+    timeout = (config.REQUEST_CONNECT_TIMEOUT, config.REQUEST_READ_TIMEOUT)
+
+    page = session.get(url, verify=False, timeout=timeout)
+    form = {
+        "action": "login",
+        "login_username": username,
+        "login_password": password,
+    }
+    token = extract_csrf_token(page.text)
+    if token:
+        form["__csrf_magic"] = token
+
+    resp = session.post(url, data=form, verify=False, timeout=timeout)
+    return (resp.status_code == 200
+            and 'auth_login.php' not in resp.url
+            and 'login_password' not in resp.text)
+
+
+def save_cookies(session, cookies_file: str):
+    """Tulis cookie session ke cacti_cookies.json (atomic replace)"""
+    json_cookies = [{
+        "name": c.name,
+        "value": c.value,
+        "domain": c.domain,
+        "path": c.path or "/",
+        "secure": bool(c.secure),
+    } for c in session.cookies]
+
+    tmp_path = cookies_file + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(json_cookies, f, indent=2)
+    os.replace(tmp_path, cookies_file)
+
+
+class SharedLogin:
+    """Satu login ulang yang dipakai bersama oleh semua worker"""
+
+    def __init__(self, cookies_file: str, progress_callback: Optional[Callable] = None):
+        """
+        Args:
+            cookies_file: Path cacti_cookies.json yang diperbarui setelah login
+            progress_callback: Fungsi callback (message, percentage) untuk log
+        """
+        self.cookies_file = cookies_file
+        self.progress_callback = progress_callback or (lambda msg, pct: None)
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._failed = False
+
+    def available(self) -> bool:
+        """True jika login otomatis aktif dan username/password tersedia"""
+        return bool(config.AUTO_LOGIN) and not self._failed and load_credentials() is not None
+
+    def relogin(self, session, seen_generation: int) -> bool:
+        """
+        Login ulang, kecuali worker lain sudah melakukannya
+
+        Args:
+            session: Session requests bersama
+            seen_generation: Nilai self.generation saat worker melihat redirect ke login
+
+        Returns:
+            True jika session sekarang (seharusnya) sudah login
+        """
+        with self._lock:
+            if self.generation > seen_generation:
+                # Sudah login ulang oleh worker lain setelah request ini dikirim
+                return True
+            if not self.available():
+                return False
+
+            username, password = load_credentials()
+            self.progress_callback("🔑 Session expired, login ulang otomatis (tanpa browser)...", -1)
+            try:
+                ok = login(session, username, password)
+            except Exception as e:
+                self.progress_callback(f"❌ Login otomatis gagal: {str(e)}", -1)
+                ok = False
+
+            if not ok:
+                # Jangan coba lagi di run ini (hindari akun terkunci)
+                self._failed = True
+                self.progress_callback("❌ Login otomatis gagal. Cek username/password.", -1)
+                return False
+
+            save_cookies(session, self.cookies_file)
+            self.generation += 1
+            self.progress_callback("✅ Login berhasil, cookies diperbarui", -1)
+            return True
@@ -18,11 +18,22 @@ INTERFACE_TO_SHEET = {
     "Moratel": "Moratel",
 }
 
+# Graph ID per interface dicari otomatis dari halaman tree (GRAPH_DISCOVERY).
+# Isi GRAPH_IDS hanya untuk override manual, contoh: {"iForte": "1503"}
+GRAPH_IDS = {}
+GRAPH_DISCOVERY = True
+GRAPH_INDEX_FILE = "graph_index.json"
+GRAPH_INDEX_TTL = 7 * 24 * 3600   # Detik
+
 # Slot waktu yang akan diambil datanya
 TIME_SLOTS = [
     (9, 0),   # 09.00
     (16, 0),  # 16.00
 ]
+NAN_POLICY = "zero"               # NaN di CSV: "zero" = dihitung 0, "skip" = diabaikan
+SLOT_WINDOW_MINUTES = 0           # Jendela slot (menit) sebelum jam slot, 0 = dari 00:00
+PERCENTILE = 95                   # Persentil (p95 burstable billing), 0 = tidak; dihitung jika kolom PCT diisi
+PERCENTILE_ACCURACY = 0.01        # Error relatif sketch untuk seri panjang
 
 # ============================================================
 # KONFIGURASI KOLOM EXCEL
@@ -35,6 +46,8 @@ EXCEL_COL_MAX_IN = 5     # Kolom E
 EXCEL_COL_MAX_OUT = 6    # Kolom F
 EXCEL_COL_AVG_IN = 7     # Kolom G
 EXCEL_COL_AVG_OUT = 8    # Kolom H
+EXCEL_COL_PCT_IN = None  # Kolom persentil In (misal 9 = Kolom I), None = tidak ditulis
+EXCEL_COL_PCT_OUT = None # Kolom persentil Out (misal 10 = Kolom J)
 
 # ============================================================
 # FORMAT WAKTU & TANGGAL DI EXCEL
@@ -54,3 +67,56 @@ ACTION_DELAY = 1.0
 # ============================================================
 EXCEL_DATA_START_ROW = 2
 SKIP_FILLED_ROWS = True
+
+# ============================================================
+# PENGATURAN MODE CEPAT (REQUESTS)
+# ============================================================
+FETCH_WORKERS = 8                 # Request graph_xport paralel (1 = serial)
+PARSE_PROCESSES = 0               # Proses worker untuk parse & statistik (0 = di thread fetch)
+ADAPTIVE_CONCURRENCY = True       # Batas in-flight adaptif (AIMD), maks FETCH_WORKERS
+FETCH_WORKERS_INITIAL = 2
+SLOW_RESPONSE_FACTOR = 3.0        # Lambat = latency > terbaik request sejenis x faktor
+REQUEST_CONNECT_TIMEOUT = 10      # Detik
+REQUEST_READ_TIMEOUT = 60         # Detik
+RUN_DEADLINE = 0                  # Batas waktu satu run (detik), 0 = tanpa batas
+HEDGE_REQUESTS = False            # Kirim duplikat jika request > latency p95
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 20
+SESSION_CHECK_TTL = 600           # Cache hasil cek cookie (detik), 0 = selalu cek
+SESSION_CHECK_FILE = "session_check.json"
+AUTO_LOGIN = True                 # Login ulang tanpa browser jika cookie expired
+CREDENTIALS_FILE = "cacti_credentials.json"  # Atau env CACTI_USERNAME/CACTI_PASSWORD
+STREAM_CHUNK_SIZE = 65536         # Byte per potongan saat streaming respons CSV
+
+RRA_ARCHIVES = [                  # (rra_id, step detik, retensi detik)
+    (1, 300, 600 * 300),
+    (2, 1800, 700 * 1800),
+    (3, 7200, 775 * 7200),
+    (4, 86400, 797 * 86400),
+]
+XPORT_MAX_DAYS = 7                # Maks hari per export gabungan (arsip 5 menit)
+RESOLUTION_TARGET = 300           # Step arsip terbesar yang diterima (300 = terhalus)
+RRA_LEARN = True                  # Pelajari step/retensi arsip tiap graph dari Cacti
+RRA_PROFILE_FILE = "rra_profiles.json"
+RRA_PROFILE_TTL = 30 * 24 * 3600
+
+# ============================================================
+# CACHE RESPONS GRAPH_XPORT
+# ============================================================
+RESPONSE_CACHE = True
+RESPONSE_CACHE_DIR = "xport_cache"
+RESPONSE_CACHE_MAX_MB = 200
+RESPONSE_CACHE_RECENT_TTL = 300   # Detik, untuk jendela yang menyentuh waktu sekarang
+
+# ============================================================
+# FILE SAMPEL HARIAN (MMAP)
+# ============================================================
+DAY_FILES = True                  # Statistik hari yang sudah ada dari file biner (mmap)
+DAY_FILES_DIR = "day_files"
+
+# ============================================================
+# STORE SAMPEL LOKAL
+# ============================================================
+SAMPLE_STORE = True               # Simpan sampel 5 menit, ambil gap saja
+SAMPLE_STORE_FILE = "samples.db"
+SAMPLE_ARCHIVE_DAYS = 7           # Kompres sampel hari yang lebih tua dari ini (0 = mati)
@@ -20,20 +20,50 @@ INTERFACE_TO_SHEET = {
 }
 
 # Mapping interface ke Graph ID Cacti (untuk mode tanpa Selenium)
-# Didapat dari inspect HTML halaman Cacti
+# Didapat dari inspect HTML halaman Cacti.
+# Opsional: jika GRAPH_DISCOVERY aktif, graph id untuk setiap interface di
+# INTERFACE_TO_SHEET dicari otomatis dari halaman tree. Entri di sini
+# menjadi override manual (boleh dikosongkan: GRAPH_IDS = {}).
 GRAPH_IDS = {
     "iForte": "1503",
     "Telkom": "1573",
     "Moratel": "1528",
 }
 
+# Discovery graph otomatis (mode cepat): halaman tree di CACTI_URL diambil
+# sekali, hasilnya disimpan di GRAPH_INDEX_FILE selama GRAPH_INDEX_TTL detik
+GRAPH_DISCOVERY = True
+GRAPH_INDEX_FILE = "graph_index.json"
+GRAPH_INDEX_TTL = 7 * 24 * 3600
+
 # Slot waktu yang akan diambil datanya
 # Format: (jam, menit)
+# Setiap slot dihitung dari 00:00 sampai jam slot. Mode cepat hanya
+# download 1 CSV per graph per hari (sampai slot terakhir), jadi
+# menambah slot (misal per jam) tidak menambah jumlah request.
 TIME_SLOTS = [
     (9, 0),   # 09.00
     (16, 0),  # 16.00
 ]
 
+# Nilai NaN (tidak ada data) di CSV Cacti saat menghitung Current/Avg/Max:
+# "zero" = dihitung sebagai 0 (Avg ikut turun), "skip" = diabaikan.
+# Sel kosong/rusak (bukan NaN) selalu dilewati, apa pun kebijakannya.
+NAN_POLICY = "zero"
+
+# Panjang jendela setiap slot (menit) sebelum jam slot, misal 60 = rata-rata
+# 1 jam terakhir (08:00-09:05 untuk slot 09.00). 0 = dari 00:00 (default).
+SLOT_WINDOW_MINUTES = 0
+
+# Persentil yang dihitung di samping Current/Avg/Max (95 = p95, 0 = tidak).
+# Nearest-rank: buang 5% sampel tertinggi, ambil nilai tertinggi sisanya.
+# Untuk seri panjang (> ~1 minggu) dipakai sketch dengan error relatif
+# maksimal PERCENTILE_ACCURACY (0.01 = 1%).
+# Hanya dihitung jika EXCEL_COL_PCT_IN/OUT diisi (tanpa kolom itu hasilnya
+# tidak ditulis, jadi tidak perlu membayar waktu hitungnya).
+PERCENTILE = 95
+PERCENTILE_ACCURACY = 0.01
+
 # ============================================================
 # KONFIGURASI KOLOM EXCEL
 # ============================================================
@@ -53,6 +83,11 @@ EXCEL_COL_MAX_OUT = 6   # Kolom F: Max (Out)
 EXCEL_COL_AVG_IN = 7    # Kolom G: Average (IN)
 EXCEL_COL_AVG_OUT = 8   # Kolom H: Average (Out)
 
+# Kolom persentil (misal p95 untuk tagihan burstable ISP), None = tidak ditulis
+# Contoh: EXCEL_COL_PCT_IN = 9 (Kolom I), EXCEL_COL_PCT_OUT = 10 (Kolom J)
+EXCEL_COL_PCT_IN = None
+EXCEL_COL_PCT_OUT = None
+
 # ============================================================
 # FORMAT WAKTU DI EXCEL
 # ============================================================
@@ -102,3 +137,128 @@ EXCEL_DATA_START_ROW = 2
 # ============================================================
 # Jika True, data hari Sabtu dan Minggu tidak akan diambil
 SKIP_WEEKENDS = True
+
+# ============================================================
+# PENGATURAN MODE CEPAT (REQUESTS)
+# ============================================================
+# Jumlah maksimal request graph_xport yang berjalan paralel.
+# 1 = serial (seperti versi lama). Jangan terlalu besar agar
+# server Cacti kantor tidak kewalahan.
+FETCH_WORKERS = 8
+
+# Decode CSV & hitung statistik di proses terpisah (ProcessPoolExecutor),
+# untuk backfill panjang yang dibatasi CPU satu core. Thread fetch hanya
+# mengunduh bytes respons. 0 = parse di thread fetch (default),
+# N = jumlah proses worker (misal jumlah core CPU).
+# Tidak dipakai untuk hari yang diambil lewat SAMPLE_STORE.
+PARSE_PROCESSES = 0
+
+# Flow control adaptif (AIMD): jumlah request in-flight mulai dari
+# FETCH_WORKERS_INITIAL, naik pelan selama latency stabil, dan dipotong
+# setengah jika respons lambat / status bukan 200 / redirect ke login.
+# FETCH_WORKERS menjadi batas atasnya.
+ADAPTIVE_CONCURRENCY = True
+FETCH_WORKERS_INITIAL = 2
+
+# Respons dianggap lambat jika latency > latency terbaik request sejenis
+# (halaman & lebar jendela export yang sama) x faktor ini
+SLOW_RESPONSE_FACTOR = 3.0
+
+# Batas waktu per request (detik): connect ke server & tunggu data
+REQUEST_CONNECT_TIMEOUT = 10
+REQUEST_READ_TIMEOUT = 60
+
+# Batas waktu keseluruhan satu run mode cepat (detik), 0 = tanpa batas.
+# Request yang belum jalan saat batas habis dibatalkan dan dilaporkan
+# sebagai export gagal. Backfill panjang bisa jauh lebih dari 15 menit.
+RUN_DEADLINE = 0
+
+# Hedging: jika request lebih lama dari latency persentil HEDGE_PERCENTILE
+# (diukur dari request sebelumnya), kirim duplikat dan pakai yang selesai
+# duluan. Aktif setelah minimal HEDGE_MIN_SAMPLES request tercatat.
+HEDGE_REQUESTS = False
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 20
+
+# Hasil cek session Cacti (cookie masih valid) di-cache selama ini (detik)
+# agar run berikutnya langsung mulai. 0 = selalu cek.
+SESSION_CHECK_TTL = 600
+SESSION_CHECK_FILE = "session_check.json"
+
+# Login ulang otomatis tanpa browser saat cookie expired (auth_login.php).
+# Username/password dari environment CACTI_USERNAME & CACTI_PASSWORD, atau
+# file CREDENTIALS_FILE: {"username": "...", "password": "..."} (jangan di-commit).
+AUTO_LOGIN = True
+CREDENTIALS_FILE = "cacti_credentials.json"
+
+# Ukuran potongan (byte) saat membaca respons CSV secara streaming
+STREAM_CHUNK_SIZE = 65536
+
+# Arsip RRA (Round Robin Archive) Cacti: (rra_id, step detik, retensi detik)
+# Nilai default = RRA standar Cacti. Sesuaikan jika RRA di server kantor
+# diperpanjang (lihat Console > Data Source Profiles).
+RRA_ARCHIVES = [
+    (1, 300, 600 * 300),        # Daily: 5 menit, 600 baris (~2 hari)
+    (2, 1800, 700 * 1800),      # Weekly: 30 menit, 700 baris (~14 hari)
+    (3, 7200, 775 * 7200),      # Monthly: 2 jam, 775 baris (~64 hari)
+    (4, 86400, 797 * 86400),    # Yearly: 1 hari, 797 baris (~2 tahun)
+]
+
+# Maksimal jumlah hari yang digabung dalam satu export graph_xport untuk
+# arsip 5 menit. Arsip yang lebih kasar boleh lebih panjang dengan jumlah
+# baris yang sama (misal arsip 30 menit: 6x lebih banyak hari).
+XPORT_MAX_DAYS = 7
+
+# Target akurasi planner: step arsip terbesar (detik) yang masih diterima.
+# Setiap hari diambil dari arsip termurah yang masih menyimpannya dengan
+# step <= target ini; baris arsip kasar dihitung berbobot waktu, jadi Avg
+# tetap benar, tapi Max/Current/persentil hanya setajam step arsipnya.
+# 300 = selalu pakai data terhalus yang masih ada (perilaku lama).
+# Contoh: 7200 -> backfill bulan lalu cukup ambil arsip 2 jam (24x lebih sedikit baris).
+RESOLUTION_TARGET = 300
+
+# Step & retensi arsip RRA tiap graph dipelajari sekali dari Cacti (probe
+# per arsip) saat ada tanggal di luar arsip 5 menit, lalu disimpan di
+# RRA_PROFILE_FILE selama RRA_PROFILE_TTL detik. False = pakai RRA_ARCHIVES.
+RRA_LEARN = True
+RRA_PROFILE_FILE = "rra_profiles.json"
+RRA_PROFILE_TTL = 30 * 24 * 3600
+
+# ============================================================
+# CACHE RESPONS GRAPH_XPORT
+# ============================================================
+# Data hari yang sudah lewat tidak berubah lagi, jadi CSV-nya disimpan
+# di disk dan tidak perlu di-download ulang saat run berikutnya.
+# Jendela yang menyentuh waktu sekarang hanya di-cache selama
+# RESPONSE_CACHE_RECENT_TTL detik.
+RESPONSE_CACHE = True
+RESPONSE_CACHE_DIR = "xport_cache"
+RESPONSE_CACHE_MAX_MB = 200       # Entri paling lama tidak dipakai dibuang duluan
+RESPONSE_CACHE_RECENT_TTL = 300
+
+# ============================================================
+# FILE SAMPEL HARIAN (MMAP)
+# ============================================================
+# Sampel setiap graph-hari yang diambil lewat export (tanpa SAMPLE_STORE,
+# atau arsip RRA kasar) disimpan sebagai file biner ukuran tetap. Run
+# berikutnya menghitung statistik langsung dari file itu lewat mmap,
+# tanpa download dan tanpa parse CSV. Hanya data yang sudah final.
+DAY_FILES = True
+DAY_FILES_DIR = "day_files"
+
+# ============================================================
+# STORE SAMPEL LOKAL
+# ============================================================
+# Sampel 5 menit disimpan di SQLite beserta index rentang waktu yang
+# sudah diambil. Run berikutnya hanya meminta bagian yang belum ada
+# (misal run sore cukup ambil 09:00-16:05). Hanya untuk hari yang masih
+# ada di arsip 5 menit (lihat RRA_ARCHIVES).
+# Store juga menyimpan rollup per jam/hari/bulan yang diperbarui setiap ada
+# sampel baru, jadi statistik slot cukup membaca beberapa baris rollup.
+SAMPLE_STORE = True
+SAMPLE_STORE_FILE = "samples.db"
+
+# Sampel hari yang lebih tua dari sekian hari dipindah
+# ke arsip terkompresi (blok per graph per hari: timestamp delta-of-delta,
+# nilai XOR ala Gorilla) di file yang sama. 0 = tidak pernah dikompresi.
+SAMPLE_ARCHIVE_DAYS = 7
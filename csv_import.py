@@ -0,0 +1,215 @@
+"""
+CSV Import Module
+Impor offline file CSV graph_xport Cacti dari folder (tanpa jaringan)
+
+- Folder ditelusuri rekursif, setiap *.csv diparse sekali dengan aturan
+  preamble yang sama seperti mode cepat (csv_stream.iter_samples:
+  Title, Step, header Date)
+- File dibaca per baris (file besar lewat mmap), tidak dibaca utuh ke memori
+- Title (terisi begitu sampel pertama terbaca) dicocokkan ke
+  config.INTERFACE_TO_SHEET (match_interface); file yang tidak cocok
+  dilewati
+- Stream sampel semua file satu interface digabung urut waktu
+  (timestamp sama: file terakhir menang) langsung ke statistik per hari
+  & TIME_SLOTS, engine yang sama seperti mode cepat. Sampel tidak
+  dikumpulkan: yang ditahan hanya sampel hari yang sedang dihitung.
+  Semua file tetap terbuka sampai interface-nya selesai digabung (satu
+  file descriptor + buffer baca per file). Hasilnya ScrapeResults, siap
+  untuk preview GUI / write_to_excel
+
+Jalankan: python csv_import.py <folder_csv> [file_excel.xlsx]
+"""
+
+import heapq
+import mmap
+import os
+import sys
+from datetime import datetime
+from itertools import chain
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import config
+from csv_stream import DECODE_ERRORS, SchemaCache, iter_samples
+from fetch_planner import regrid_samples
+from graph_discovery import match_interface
+from sample_store import Sample
+from scrape_results import ScrapeResults
+from traffic_stats import day_slot_stats
+
+
+# File sebesar ini atau lebih dibaca lewat mmap
+MMAP_MIN_BYTES = 1024 * 1024
+
+# Kunci SchemaCache untuk semua file: schema hanya dipakai jika header
+# persis sama, jadi file dengan header lain cukup menyimpan schema baru
+SCHEMA_KEY = "csv_import"
+
+
+def iter_csv_files(directory: str) -> Iterator[str]:
+    """Path semua file *.csv di folder (rekursif, urut nama)"""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(".csv"):
+                yield os.path.join(root, name)
+
+
+def iter_path_lines(path: str, encoding: Optional[str] = None) -> Iterator[str]:
+    """
+    Baris teks file CSV tanpa newline (BOM dibuang)
+
+    File kecil dibaca per baris lewat buffer file biasa; file >=
+    MMAP_MIN_BYTES di-mmap. Keduanya didecode per baris.
+    """
+    encoding = encoding or 'utf-8'
+    with open(path, 'rb') as f:
+        mm = None
+        if os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            first = True
+            for raw in (iter(mm.readline, b'') if mm is not None else f):
+                line = raw.decode(encoding, errors='replace')
+                if first:
+                    if line.startswith('\ufeff'):
+                        line = line[1:]
+                    first = False
+                yield line.rstrip('\r\n')
+        finally:
+            if mm is not None:
+                mm.close()
+
+
+def merge_samples(streams: List[Iterator[Sample]]) -> Iterator[Sample]:
+    """Gabung beberapa seri urut waktu; timestamp sama: seri terakhir menang"""
+    def tagged(order: int, stream: Iterator[Sample]) -> Iterator[Tuple[int, int, Sample]]:
+        for sample in stream:
+            yield sample[0], order, sample
+
+    pending = None
+    for ts, _, sample in heapq.merge(*(tagged(order, stream) for order, stream in enumerate(streams))):
+        if pending is not None and ts != pending[0]:
+            yield pending
+        pending = sample
+    if pending is not None:
+        yield pending
+
+
+def _counted(samples: Iterable[Sample], name: str, counts: Dict[str, int],
+             progress: Callable) -> Iterator[Sample]:
+    """Stream sampel satu file; file yang gagal dibaca di tengah jalan dilaporkan lalu berhenti"""
+    try:
+        for sample in samples:
+            counts[name] += 1
+            yield sample
+    except (OSError, ValueError) + DECODE_ERRORS as e:
+        progress(f"✗ {name}: {str(e)}")
+
+
+def _in_range(samples: Iterable[Sample], start_date: Optional[datetime],
+              end_date: Optional[datetime]) -> Iterator[Sample]:
+    """Sampel pada tanggal [start_date, end_date] (None = tanpa batas), tanpa akhir pekan jika SKIP_WEEKENDS"""
+    for sample in samples:
+        day = datetime.fromtimestamp(sample[0]).replace(hour=0, minute=0, second=0, microsecond=0)
+        if ((start_date is None or day >= start_date) and (end_date is None or day <= end_date)
+                and not (config.SKIP_WEEKENDS and day.weekday() >= 5)):
+            yield sample
+
+
+def import_csv_directory(directory: str, start_date: Optional[datetime] = None,
+                         end_date: Optional[datetime] = None,
+                         progress_callback: Optional[Callable] = None) -> ScrapeResults:
+    """
+    Impor semua CSV di folder menjadi data per tanggal & slot
+
+    Args:
+        directory: Folder berisi file CSV export Cacti
+        start_date: Tanggal awal (None = sejak data paling awal)
+        end_date: Tanggal akhir (None = sampai data paling akhir)
+        progress_callback: Callback (message, percentage) seperti scraper
+
+    Returns:
+        ScrapeResults urut (tanggal, slot, interface)
+    """
+    progress = progress_callback or (lambda msg, pct=-1: None)
+    files = list(iter_csv_files(directory))
+    progress(f"📂 {len(files)} file CSV di {directory}", 15)
+
+    # Buka setiap file sekali: sampel pertama mengisi Title, sisanya tetap stream
+    schemas = SchemaCache()
+    streams: Dict[str, List[Tuple[str, Iterator[Sample]]]] = {}
+    counts: Dict[str, int] = {}
+    for path in files:
+        name = os.path.relpath(path, directory)
+        meta = {}
+        stream = iter_samples(iter_path_lines(path), meta, schemas, SCHEMA_KEY)
+        try:
+            first = next(stream, None)
+        except (OSError, ValueError) + DECODE_ERRORS as e:
+            progress(f"✗ {name}: {str(e)}")
+            continue
+        title = meta.get('title')
+        matched_interface = match_interface(title or "")
+        if not matched_interface:
+            stream.close()
+            progress(f"⏭ {name}: title tidak cocok dengan interface ({title or '-'})")
+            continue
+        if first is None:
+            progress(f"⚠ {name}: tidak ada baris data")
+            continue
+        samples = regrid_samples(chain([first], stream), meta, None)
+        counts[name] = 0
+        streams.setdefault(matched_interface, []).append((name, _counted(samples, name, counts, progress)))
+
+    # Statistik per interface, hari demi hari dari stream gabungan
+    slots = list(config.TIME_SLOTS)
+    stats_by_interface = {}
+    done = 0
+    for interface_name, interface_streams in streams.items():
+        last_ts: Dict[datetime, int] = {}
+
+        def on_day(day: datetime, timestamps, inbound, outbound):
+            if timestamps:
+                last_ts[day] = timestamps[-1]
+
+        merged = merge_samples([stream for _, stream in interface_streams])
+        day_stats = day_slot_stats(_in_range(merged, start_date, end_date),
+                                   None, slots, raw=True, on_day=on_day)
+        # Slot setelah sampel terakhir hari itu tidak punya data sampai jam slot
+        for day in day_stats:
+            day_stats[day] = {slot: stats for slot, stats in day_stats[day].items()
+                              if int(day.replace(hour=slot[0], minute=slot[1]).timestamp()) <= last_ts[day]}
+        stats_by_interface[interface_name] = day_stats
+        for name, _ in interface_streams:
+            done += 1
+            progress(f"✓ {name} → {interface_name} ({counts[name]} sampel)", 15 + int(done / len(files) * 65))
+
+    # Urutan sama seperti mode cepat: (tanggal, slot, interface)
+    results = ScrapeResults()
+    interfaces = [name for name in config.INTERFACE_TO_SHEET if name in stats_by_interface]
+    all_days = sorted({day for name in interfaces for day in stats_by_interface[name]})
+    for day in all_days:
+        for hour, minute in slots:
+            for interface_name in interfaces:
+                stats = stats_by_interface[interface_name].get(day, {}).get((hour, minute))
+                if stats:
+                    results.append(day, hour, minute, interface_name, stats)
+
+    progress(f"Selesai impor {len(results)} data dari {len(files)} file!", 85)
+    return results
+
+
+def main(argv: List[str]) -> int:
+    if not argv:
+        print("Pemakaian: python csv_import.py <folder_csv> [file_excel.xlsx]")
+        return 1
+    directory = argv[0]
+    data = import_csv_directory(directory, progress_callback=lambda msg, pct=-1: print(msg))
+    if len(argv) > 1 and data:
+        from excel_writer import write_to_excel
+        write_to_excel(argv[1], data, lambda msg, pct=-1: print(msg))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
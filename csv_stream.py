@@ -0,0 +1,277 @@
+"""
+CSV Stream Module
+Decoder CSV graph_xport Cacti secara streaming
+
+Respons dibaca per potongan (chunk), preamble Title/Vertical Label
+dilewati, lalu setiap baris data langsung diubah menjadi sampel
+(timestamp, inbound, outbound). Isi respons tidak pernah disimpan utuh
+di memori, jadi pemakaian memori tetap walau rentang waktunya panjang.
+"""
+
+import codecs
+import csv
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from sample_store import Sample
+
+
+# Error decode/parse isi export (respons rusak, encoding tidak dikenal)
+DECODE_ERRORS = (csv.Error, UnicodeError, LookupError)
+
+
+def parse_timestamp(value: str) -> Optional[int]:
+    """Konversi kolom Date CSV Cacti ("2026-01-23 09:00:00") ke Unix timestamp"""
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"):
+        try:
+            return int(datetime.strptime(value.strip(), fmt).timestamp())
+        except ValueError:
+            continue
+    return None
+
+
+def detect_columns(header: List[str]):
+    """
+    Deteksi index kolom In/Out dari header CSV
+
+    Returns:
+        (idx_in, idx_out), -1 jika tidak ditemukan
+    """
+    idx_in = -1
+    idx_out = -1
+
+    # Cari kolom dengan kata kunci (biasanya "Traffic - In" atau "Inbound")
+    for i, col in enumerate(header):
+        col_lower = col.lower()
+        if "traffic_in" in col_lower or "inbound" in col_lower:
+            idx_in = i
+        elif "traffic_out" in col_lower or "outbound" in col_lower:
+            idx_out = i
+
+    # Fallback jika tidak menemukan nama spesifik (Cacti standard: 1=In, 2=Out, atau 1=In, 3=Out)
+    # Ingat kolom 0 adalah Date
+    if idx_in == -1 and len(header) > 1: idx_in = 1
+    if idx_out == -1 and len(header) > 2:
+        # Jika kolom 2 sepertinya bukan duplicate dari In (kadang format In, In_d, Out...)
+        idx_out = 2 if len(header) == 3 else 3
+        if idx_out >= len(header): idx_out = -1
+
+    return idx_in, idx_out
+
+
+def parse_value(row: List[str], idx: int) -> Optional[float]:
+    """
+    Nilai float kolom idx, None untuk NaN dari RRD (atau kolom tidak ada di header)
+
+    Raises:
+        ValueError: Sel kosong, terpotong, atau bukan angka. Ini bukan NaN:
+                    baris seperti itu dilewati, tidak dihitung 0 oleh NAN_POLICY
+    """
+    if idx == -1:
+        return None
+    if idx >= len(row):
+        raise ValueError(f"Kolom {idx} tidak ada di baris")
+    val = float(row[idx])
+    return None if val != val else val  # NaN -> None
+
+
+def iter_response_lines(resp, chunk_size: int = 65536) -> Iterator[str]:
+    """
+    Baris teks dari respons requests (stream=True), didecode per chunk
+
+    Args:
+        resp: Response requests yang dibuka dengan stream=True
+        chunk_size: Ukuran potongan yang dibaca dari socket (byte)
+    """
+    decoder = codecs.getincrementaldecoder(resp.encoding or 'utf-8')(errors='replace')
+    pending = ''
+    first = True
+
+    for chunk in resp.iter_content(chunk_size):
+        pending += decoder.decode(chunk)
+        if first and pending:
+            # Strip BOM (Byte Order Mark) jika ada
+            if pending.startswith('\ufeff'):
+                pending = pending[1:]
+            first = False
+        lines = pending.split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip('\r')
+
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending.rstrip('\r')
+
+
+def iter_bytes_lines(data: bytes, encoding: Optional[str] = None) -> Iterator[str]:
+    """Baris teks dari isi respons utuh (bytes), sama seperti iter_response_lines"""
+    text = data.decode(encoding or 'utf-8', errors='replace')
+    if text.startswith('\ufeff'):
+        text = text[1:]
+    lines = text.split('\n')
+    if not lines[-1]:
+        lines.pop()
+    for line in lines:
+        yield line.rstrip('\r')
+
+
+def iter_file_lines(f: TextIO) -> Iterator[str]:
+    """Baris teks dari file CSV (misal dari cache), tanpa newline"""
+    for line in f:
+        yield line.rstrip('\r\n')
+
+
+class HeaderSchema(NamedTuple):
+    """Schema CSV satu graph: header persis + index kolom In/Out"""
+    header: Tuple[str, ...]
+    idx_in: int
+    idx_out: int
+
+
+class SchemaCache:
+    """Cache schema header CSV per local_graph_id (thread-safe)"""
+
+    def __init__(self):
+        self._schemas: Dict[str, HeaderSchema] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, graph_id: str, header: List[str]) -> Optional[HeaderSchema]:
+        """Schema tersimpan jika header persis sama dengan respons sebelumnya"""
+        with self._lock:
+            schema = self._schemas.get(graph_id)
+        if schema is not None and schema.header == tuple(header):
+            return schema
+        return None
+
+    def store(self, graph_id: str, header: List[str]) -> HeaderSchema:
+        """Deteksi kolom dari header dan simpan sebagai schema graph ini"""
+        schema = HeaderSchema(tuple(header), *detect_columns(header))
+        with self._lock:
+            self._schemas[graph_id] = schema
+        return schema
+
+
+def _parse_row(line: str) -> List[str]:
+    """Parse satu baris dengan aturan CSV lengkap (fallback parser cepat)"""
+    return next(csv.reader([line]), [])
+
+
+def _iter_general_samples(lines: Iterator[str], idx_in: int, idx_out: int) -> Iterator[Sample]:
+    """Baris data -> sampel lewat csv.reader (aturan quoting lengkap)"""
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        ts = parse_timestamp(row[0])
+        if ts is None:
+            continue
+        try:
+            in_val, out_val = parse_value(row, idx_in), parse_value(row, idx_out)
+        except ValueError:
+            continue
+        yield ts, in_val, out_val
+
+
+def _iter_fast_samples(lines: Iterator[str], schema: HeaderSchema) -> Iterator[Sample]:
+    """
+    Baris data -> sampel dengan pemisah posisi tetap
+
+    Baris data Cacti tidak pernah berisi koma di dalam field, jadi cukup
+    split(',') dan buang tanda kutip pembungkus. Baris yang jumlah
+    kolomnya beda, tanggalnya tidak standar, atau nilainya tidak bisa
+    dibaca diparse ulang dengan parser umum (dan dilewati jika sel In/Out
+    memang kosong/rusak).
+    """
+    ncols = len(schema.header)
+    idx_in, idx_out = schema.idx_in, schema.idx_out
+    hour_base: Dict[str, int] = {}  # "YYYY-MM-DD HH" -> timestamp awal jam itu
+
+    def field_value(parts, idx):
+        if idx == -1:
+            return None
+        val = parts[idx]
+        if val[:1] == '"':
+            val = val[1:-1]
+        val = float(val)  # ValueError -> fallback
+        return None if val != val else val
+
+    for line in lines:
+        if not line:
+            continue
+        parts = line.split(',')
+        try:
+            if len(parts) != ncols:
+                raise ValueError
+            date = parts[0].strip('"')
+            if len(date) != 19 or date[13] != ':' or date[16] != ':':
+                raise ValueError
+            base = hour_base.get(date[:13])
+            if base is None:
+                base = int(datetime(int(date[0:4]), int(date[5:7]), int(date[8:10]),
+                                    int(date[11:13])).timestamp())
+                hour_base[date[:13]] = base
+            ts = base + int(date[14:16]) * 60 + int(date[17:19])
+            yield ts, field_value(parts, idx_in), field_value(parts, idx_out)
+        except ValueError:
+            row = _parse_row(line)
+            ts = parse_timestamp(row[0]) if row else None
+            if ts is None:
+                continue
+            try:
+                in_val, out_val = parse_value(row, idx_in), parse_value(row, idx_out)
+            except ValueError:
+                continue
+            yield ts, in_val, out_val
+
+
+def iter_samples(lines: Iterable[str], meta: Dict, schemas: Optional[SchemaCache] = None,
+                 graph_id: Optional[str] = None) -> Iterator[Sample]:
+    """
+    Parse baris CSV graph_xport menjadi sampel satu per satu
+
+    Args:
+        lines: Baris teks CSV (preamble + header Date + data)
+        meta: Dictionary yang diisi 'title', 'header' (dan 'step' jika ada
+              baris "Step") saat preamble terbaca
+        schemas: Cache schema per graph; jika header sama dengan respons
+                 sebelumnya, baris data diparse dengan parser posisi tetap
+        graph_id: Local graph id (kunci schemas)
+
+    Yields:
+        (timestamp, inbound, outbound), None = NaN dari RRD. Baris dengan
+        sel In/Out kosong atau rusak dilewati (lihat parse_value)
+    """
+    lines = iter(lines)
+
+    # Preamble: Title, Vertical Label, baris kosong, lalu header Date
+    for line in lines:
+        row = _parse_row(line) if line else []
+        if not row:
+            continue
+        # Handle "Title" with potential BOM
+        if len(row) >= 2 and "Title" in row[0]:
+            meta['title'] = row[1]
+        elif len(row) >= 2 and row[0].startswith("Step"):
+            try:
+                meta['step'] = int(row[1])
+            except ValueError:
+                pass
+        if row[0] == "Date":
+            meta['header'] = row
+            break
+    else:
+        return
+
+    header = meta['header']
+    if schemas is not None and graph_id is not None:
+        schema = schemas.lookup(graph_id, header)
+        if schema is not None:
+            yield from _iter_fast_samples(lines, schema)
+            return
+        schema = schemas.store(graph_id, header)
+        idx_in, idx_out = schema.idx_in, schema.idx_out
+    else:
+        idx_in, idx_out = detect_columns(header)
+
+    yield from _iter_general_samples(lines, idx_in, idx_out)
@@ -0,0 +1,230 @@
+"""
+Day Files Module
+File biner per graph per hari untuk statistik tanpa parse
+
+Layout satu file (little-endian, ukuran tetap per sampel):
+- header 40 byte: magic "CADF", versi, step sampel, jumlah sampel,
+  rentang waktu yang tercakup (start_ts, end_ts)
+- int64 timestamp[n], float64 in[n], float64 out[n] (NaN = tidak ada data)
+
+File dibuka dengan mmap; dengan NumPy kolomnya menjadi array
+np.frombuffer di atas mmap itu (seperti numpy.memmap), tanpa NumPy
+memoryview 'q'/'d'. Statistik slot dihitung langsung dari page cache OS:
+tidak ada parse CSV dan tidak ada salinan data. Yang disimpan adalah
+sampel 5 menit setelah regrid_samples, jadi hasilnya sama dengan jalur
+streaming.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from traffic_stats import slot_window, stats_from_columns
+
+
+MAGIC = b"CADF"
+VERSION = 1
+
+# magic, versi, cadangan, step, jumlah sampel, start_ts, end_ts, cadangan
+HEADER = struct.Struct("<4sHHIIqqq")
+HEADER_SIZE = HEADER.size  # 40: kolom mulai di offset kelipatan 8
+
+# Tanpa NumPy kolom dibaca lewat memoryview (urutan byte native)
+_NATIVE_LE = sys.byteorder == "little"
+
+
+class DayFile:
+    """Satu file graph-hari yang sedang dibuka (mmap), tutup dengan close()"""
+
+    def __init__(self, path: str):
+        """
+        Raises:
+            ValueError: File bukan day file versi ini / terpotong
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _, self.step, count, self.start_ts, self.end_ts, _ = \
+                HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC or version != VERSION or len(self._mmap) != HEADER_SIZE + 24 * count:
+                raise ValueError(f"Day file tidak valid: {path}")
+            self.count = count
+            if HAS_NUMPY:
+                self.timestamps = np.frombuffer(self._mmap, dtype='<i8', count=count, offset=HEADER_SIZE)
+                self.inbound = np.frombuffer(self._mmap, dtype='<f8', count=count,
+                                             offset=HEADER_SIZE + 8 * count)
+                self.outbound = np.frombuffer(self._mmap, dtype='<f8', count=count,
+                                              offset=HEADER_SIZE + 16 * count)
+            elif _NATIVE_LE:
+                view = memoryview(self._mmap)
+                self.timestamps = view[HEADER_SIZE:HEADER_SIZE + 8 * count].cast('q')
+                self.inbound = view[HEADER_SIZE + 8 * count:HEADER_SIZE + 16 * count].cast('d')
+                self.outbound = view[HEADER_SIZE + 16 * count:].cast('d')
+            else:
+                # Mesin big-endian tanpa NumPy: terpaksa salin & byteswap
+                columns = []
+                for code, offset in (('q', 0), ('d', 8 * count), ('d', 16 * count)):
+                    column = array(code)
+                    column.frombytes(self._mmap[HEADER_SIZE + offset:HEADER_SIZE + offset + 8 * count])
+                    column.byteswap()
+                    columns.append(column)
+                self.timestamps, self.inbound, self.outbound = columns
+        except Exception:
+            self.close()
+            raise
+
+    def covers(self, start_ts: int, end_ts: int) -> bool:
+        return self.start_ts <= start_ts and end_ts <= self.end_ts
+
+    def _bounds(self, start_ts: int, end_ts: int) -> Tuple[int, int]:
+        if HAS_NUMPY:
+            return (int(np.searchsorted(self.timestamps, start_ts, 'left')),
+                    int(np.searchsorted(self.timestamps, end_ts, 'right')))
+        return bisect_left(self.timestamps, start_ts), bisect_right(self.timestamps, end_ts)
+
+    def query(self, start_ts: int, end_ts: int, nan_policy: Optional[str] = None,
+              raw: bool = False) -> Optional[Dict]:
+        """Statistik sampel start_ts <= ts <= end_ts (lihat stats_from_columns)"""
+        lo, hi = self._bounds(start_ts, end_ts)
+        return stats_from_columns(self.inbound[lo:hi], self.outbound[lo:hi], nan_policy, raw)
+
+    def close(self):
+        # View di atas mmap harus dilepas dulu sebelum mmap ditutup
+        self.timestamps = self.inbound = self.outbound = None
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DayFiles:
+    """Folder day file: <folder>/<graph_id>/<YYYY-MM-DD>.bin"""
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Folder penyimpanan (dibuat saat file pertama ditulis)
+        """
+        self.directory = directory
+
+    def path(self, graph_id: str, date: datetime) -> str:
+        return os.path.join(self.directory, graph_id, date.strftime("%Y-%m-%d") + ".bin")
+
+    def write(self, graph_id: str, date: datetime, timestamps: array, inbound: array,
+              outbound: array, start_ts: int, end_ts: int, step: int):
+        """
+        Simpan kolom sampel satu graph-hari (atomic replace)
+
+        Args:
+            graph_id: Local graph id Cacti
+            date: Tanggal data
+            timestamps, inbound, outbound: Kolom 'q'/'d'/'d' urut waktu
+                (setelah regrid, NaN = tidak ada data; lihat SlotStats)
+            start_ts, end_ts: Rentang yang datanya lengkap & final
+            step: Step arsip asal sampel (detik)
+        """
+        path = self.path(graph_id, date)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        count = len(timestamps)
+        columns = (timestamps, inbound, outbound)
+        if not _NATIVE_LE:
+            columns = tuple(array(column.typecode, column) for column in columns)
+            for column in columns:
+                column.byteswap()
+
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, VERSION, 0, step, count, start_ts, end_ts, 0))
+                for column in columns:
+                    column.tofile(f)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def open(self, graph_id: str, date: datetime) -> Optional[DayFile]:
+        """DayFile graph-hari ini, None jika belum ada / rusak"""
+        try:
+            return DayFile(self.path(graph_id, date))
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def slot_stats(self, graph_id: str, days: Iterable[datetime], slots: Iterable[Tuple[int, int]],
+                   max_step: int, raw: bool = False) -> Optional[Dict]:
+        """
+        Statistik per hari & slot dari day file, jika semuanya tersedia
+
+        Args:
+            days: Tanggal yang diminta
+            slots: (jam, menit)
+            max_step: Step terbesar yang boleh dipakai (step jendela export)
+
+        Returns:
+            {tanggal: {(jam, menit): stats}}, None jika ada hari / slot
+            yang belum tercakup file (ambil dari Cacti seperti biasa)
+        """
+        slots = list(slots)
+        result = {}
+        for date in days:
+            day_file = self.open(graph_id, date)
+            if day_file is None:
+                return None
+            with day_file:
+                if day_file.step > max_step:
+                    return None
+                day_stats = {}
+                for hour, minute in slots:
+                    start_ts, end_ts = slot_window(date, hour, minute)
+                    if not day_file.covers(start_ts, end_ts):
+                        return None
+                    stats = day_file.query(start_ts, end_ts, raw=raw)
+                    if stats:
+                        day_stats[(hour, minute)] = stats
+            result[date] = day_stats
+        return result
+
+
+def day_writer(day_files: DayFiles, graph_id: str, window_end: int, settled_ts: int, step: int,
+               on_error: Optional[Callable[[str], None]] = None):
+    """
+    Callback on_day untuk traffic_stats.day_slot_stats
+
+    Hari disimpan dari 00:00 sampai akhir jendela export / akhir hari /
+    batas data final (settled_ts), mana yang paling awal.
+
+    Day file hanya cache: gagal tulis (folder read-only, disk penuh)
+    dilaporkan lewat on_error(pesan) sekali per jendela, lalu hari
+    berikutnya tidak dicoba lagi. Statistik tetap dihitung.
+    """
+    failed = False
+
+    def write(date: datetime, timestamps: array, inbound: array, outbound: array):
+        nonlocal failed
+        start_ts = int(date.replace(hour=0, minute=0, second=0).timestamp())
+        end_ts = min(window_end, settled_ts,
+                     int(datetime.fromordinal(date.toordinal() + 1).timestamp()) - 1)
+        if failed or not timestamps or end_ts <= start_ts:
+            return
+        try:
+            day_files.write(graph_id, date, timestamps, inbound, outbound, start_ts, end_ts, step)
+        except OSError as e:
+            failed = True
+            if on_error is not None:
+                on_error(f"⚠ Gagal menyimpan file harian graph {graph_id}: {str(e)}")
+    return write
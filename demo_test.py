@@ -177,12 +177,17 @@ class MockCactiHandler(http.server.BaseHTTPRequestHandler):
                 self.send_response(404)
                 self.end_headers()
         
-        # Handle graph_view.php (main page - for connection test)
+        # Handle graph_view.php (main page - tree view dengan semua graph)
         elif 'graph_view' in parsed.path:
+            graphs = "".join(
+                f"<div id='wrapper_{gid}'><img class='graphimage' id='graph_{gid}' "
+                f"src='graph_image.php?local_graph_id={gid}' alt='{info['title']}'></div>"
+                for gid, info in GROUND_TRUTH.items()
+            )
             self.send_response(200)
             self.send_header('Content-Type', 'text/html')
             self.end_headers()
-            self.wfile.write(b"<html><body>Mock Cacti Server</body></html>")
+            self.wfile.write(f"<html><body>Mock Cacti Server{graphs}</body></html>".encode())
         
         else:
             self.send_response(200)
@@ -193,8 +198,8 @@ class MockCactiHandler(http.server.BaseHTTPRequestHandler):
         info = GROUND_TRUTH[graph_id]
         title = info["title"]
         
-        # Base date from start_ts
-        base_date = datetime.fromtimestamp(start_ts)
+        # Pola data diulang setiap hari, mulai dari 00:00 hari start_ts
+        first_day = datetime.fromtimestamp(start_ts).replace(hour=0, minute=0, second=0)
         
         lines = []
         lines.append(f'"Title","{title}"')
@@ -209,22 +214,28 @@ class MockCactiHandler(http.server.BaseHTTPRequestHandler):
         # Col 4: Outbound (Named - yang benar)
         lines.append('"Date","CDEF_In","Inbound","CDEF_Out","Outbound"')
         
-        # Data rows
-        for offset_min, in_bps, out_bps in info["data_points"]:
-            point_ts = start_ts + (offset_min * 60)
-            
-            # Only include points within the requested range
-            if point_ts > end_ts:
-                break
-            
-            point_dt = datetime.fromtimestamp(point_ts)
-            date_str = point_dt.strftime("%Y-%m-%d %H:%M:%S")
-            
-            # CDEF values = slightly different (like real Cacti)
-            cdef_in = in_bps * 1.05   # 5% higher
-            cdef_out = out_bps * 1.05
-            
-            lines.append(f'"{date_str}",{cdef_in:.6e},{in_bps:.6e},{cdef_out:.6e},{out_bps:.6e}')
+        # Data rows (export multi-hari: pola harian diulang per tanggal)
+        day = first_day
+        while int(day.timestamp()) <= end_ts:
+            day_ts = int(day.timestamp())
+            for offset_min, in_bps, out_bps in info["data_points"]:
+                point_ts = day_ts + (offset_min * 60)
+                
+                # Only include points within the requested range
+                if point_ts < start_ts:
+                    continue
+                if point_ts > end_ts:
+                    break
+                
+                point_dt = datetime.fromtimestamp(point_ts)
+                date_str = point_dt.strftime("%Y-%m-%d %H:%M:%S")
+                
+                # CDEF values = slightly different (like real Cacti)
+                cdef_in = in_bps * 1.05   # 5% higher
+                cdef_out = out_bps * 1.05
+                
+                lines.append(f'"{date_str}",{cdef_in:.6e},{in_bps:.6e},{cdef_out:.6e},{out_bps:.6e}')
+            day += timedelta(days=1)
         
         return '\r\n'.join(lines)
 
@@ -5,7 +5,7 @@ Dengan fitur skip baris yang sudah terisi
 """
 
 from datetime import datetime
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from openpyxl import load_workbook, Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 import os
@@ -27,6 +27,8 @@ class ExcelWriter:
         self.file_path = file_path
         self.workbook = None
         self.progress_callback = progress_callback or (lambda msg, pct: None)
+        # Index per sheet: (tanggal, waktu) ternormalisasi -> nomor baris
+        self._row_index: Dict[str, Dict[Tuple[str, str], int]] = {}
     
     def _update_progress(self, message: str, percentage: int = -1):
         """Update progress via callback"""
@@ -34,6 +36,7 @@ class ExcelWriter:
     
     def open_workbook(self):
         """Buka file Excel atau buat baru jika belum ada"""
+        self._row_index = {}
         if os.path.exists(self.file_path):
             self._update_progress(f"Membuka file Excel...", 86)
             try:
@@ -74,6 +77,10 @@ class ExcelWriter:
             config.EXCEL_COL_AVG_IN: "Average (In)",
             config.EXCEL_COL_AVG_OUT: "Average (Out)",
         }
+        if config.PERCENTILE:
+            headers[config.EXCEL_COL_PCT_IN] = f"P{config.PERCENTILE} (In)"
+            headers[config.EXCEL_COL_PCT_OUT] = f"P{config.PERCENTILE} (Out)"
+        headers.pop(None, None)  # Kolom opsional yang tidak dipakai
         
         for col, title in headers.items():
             ws.cell(row=1, column=col, value=title)
@@ -113,26 +120,34 @@ class ExcelWriter:
         cell_value = sheet.cell(row=row, column=config.EXCEL_COL_CURR_IN).value
         return cell_value is not None and str(cell_value).strip() != ""
     
-    def find_row_by_date_time(self, sheet: Worksheet, target_date: datetime, 
-                               target_hour: int, target_minute: int) -> Optional[int]:
-        """Cari baris yang sesuai dengan tanggal dan waktu"""
-        target_date_str = target_date.strftime(config.DATE_FORMAT_EXCEL)
-        
-        # Format waktu untuk perbandingan
-        target_time_compare = f"{target_hour:02d}.{target_minute:02d}"
+    def _time_string(self, hour: int, minute: int) -> str:
+        """Format waktu seperti yang ditulis ke kolom Waktu"""
         if config.TIME_FORMAT_EXCEL:
             # Create dummy datetime to format time correctly
-            dummy_dt = datetime(2000, 1, 1, target_hour, target_minute)
-            target_time_compare = dummy_dt.strftime(config.TIME_FORMAT_EXCEL)
+            return datetime(2000, 1, 1, hour, minute).strftime(config.TIME_FORMAT_EXCEL)
+        return f"{hour:02d}.{minute:02d}"
+    
+    def _get_row_index(self, sheet: Worksheet) -> Dict[Tuple[str, str], int]:
+        """
+        Index (tanggal, waktu) -> baris untuk satu sheet
         
-        last_valid_date_str = ""
+        Dibangun sekali per sheet dengan satu pass iter_rows(values_only=True)
+        hanya di kolom Tanggal & Waktu, lalu dipakai untuk semua record.
+        """
+        index = self._row_index.get(sheet.title)
+        if index is not None:
+            return index
         
-        for row in range(config.EXCEL_DATA_START_ROW, sheet.max_row + 1):
-            date_cell = sheet.cell(row=row, column=config.EXCEL_COL_TANGGAL).value
-            time_cell = sheet.cell(row=row, column=config.EXCEL_COL_WAKTU).value
-            
+        index = {}
+        date_idx = config.EXCEL_COL_TANGGAL - 1
+        time_idx = config.EXCEL_COL_WAKTU - 1
+        last_valid_date_str = ""
+        rows = sheet.iter_rows(min_row=config.EXCEL_DATA_START_ROW, max_row=sheet.max_row,
+                               max_col=max(config.EXCEL_COL_TANGGAL, config.EXCEL_COL_WAKTU),
+                               values_only=True)
+        for row, values in enumerate(rows, start=config.EXCEL_DATA_START_ROW):
             # Konversi nilai cell ke string untuk perbandingan
-            current_date_str = self._cell_to_date_string(date_cell)
+            current_date_str = self._cell_to_date_string(values[date_idx])
             
             # Handle implicit date (merged cells / empty cell means same as above)
             if not current_date_str and last_valid_date_str:
@@ -140,13 +155,18 @@ class ExcelWriter:
             elif current_date_str:
                 last_valid_date_str = current_date_str
             
-            time_str = self._cell_to_time_string(time_cell)
-            
-            # Bandingkan
-            if current_date_str == target_date_str and time_str == target_time_compare:
-                return row
+            # Baris pertama yang cocok menang (sama seperti scan dari atas)
+            index.setdefault((current_date_str, self._cell_to_time_string(values[time_idx])), row)
         
-        return None
+        self._row_index[sheet.title] = index
+        return index
+    
+    def find_row_by_date_time(self, sheet: Worksheet, target_date: datetime, 
+                               target_hour: int, target_minute: int) -> Optional[int]:
+        """Cari baris yang sesuai dengan tanggal dan waktu"""
+        target_date_str = target_date.strftime(config.DATE_FORMAT_EXCEL)
+        target_time_compare = self._time_string(target_hour, target_minute)
+        return self._get_row_index(sheet).get((target_date_str, target_time_compare))
     
     def _cell_to_date_string(self, cell_value) -> str:
         """Konversi cell ke string tanggal"""
@@ -182,11 +202,7 @@ class ExcelWriter:
             # Kita skip saja karena tanggal sudah ada di cell utama merge.
             pass
         
-        time_display = f"{data['time_hour']:02d}.{data['time_minute']:02d}"
-        if config.TIME_FORMAT_EXCEL:
-             dummy_dt = datetime(2000, 1, 1, data['time_hour'], data['time_minute'])
-             time_display = dummy_dt.strftime(config.TIME_FORMAT_EXCEL)
-             
+        time_display = self._time_string(data['time_hour'], data['time_minute'])
         sheet.cell(row=row, column=config.EXCEL_COL_WAKTU, value=time_display)
 
         # Mapping data values
@@ -197,7 +213,10 @@ class ExcelWriter:
             config.EXCEL_COL_MAX_OUT: data.get('max_out'),
             config.EXCEL_COL_AVG_IN: data.get('avg_in'),
             config.EXCEL_COL_AVG_OUT: data.get('avg_out'),
+            config.EXCEL_COL_PCT_IN: data.get('pct_in'),
+            config.EXCEL_COL_PCT_OUT: data.get('pct_out'),
         }
+        column_mapping.pop(None, None)  # Kolom opsional yang tidak dipakai
         
         for col, value in column_mapping.items():
             if value is not None:
@@ -245,6 +264,11 @@ class ExcelWriter:
                 # Append new row
                 new_row = sheet.max_row + 1
                 self.write_data_to_row(sheet, new_row, data)
+                self._get_row_index(sheet).setdefault(
+                    (data['date'].strftime(config.DATE_FORMAT_EXCEL),
+                     self._time_string(data['time_hour'], data['time_minute'])),
+                    new_row
+                )
                 new_rows += 1
                 self._update_progress(f"➕ Baru {sheet_name}: baris {new_row}", 86 + int((i/total)*12))
         
@@ -0,0 +1,275 @@
+"""
+Fetch Planner Module
+Menyusun jendela export graph_xport untuk mode cepat
+
+Strategi:
+- Setiap hari diberi arsip RRA termurah (step terbesar) yang masih
+  menyimpan hari itu dan step-nya <= config.RESOLUTION_TARGET; jika tidak
+  ada yang memenuhi target, arsip terhalus yang masih menyimpannya
+- Hari berurutan dengan arsip yang sama digabung menjadi satu export
+  panjang per graph dengan rra_id dipatok ke arsip itu (maks XPORT_MAX_DAYS
+  hari untuk arsip 5 menit, lebih panjang untuk arsip kasar karena barisnya
+  lebih sedikit)
+- Hari yang sudah lengkap di store lokal selalu diberi arsip 5 menit:
+  scraper membacanya dari SampleStore tanpa request, jadi statistiknya
+  tetap dari sampel 5 menit walau Cacti tinggal punya arsip kasar
+- Step dan retensi arsip tiap graph dipelajari sekali dari Cacti dan
+  disimpan di RRA_PROFILE_FILE (RraProfiles); default config.RRA_ARCHIVES
+- Baris arsip kasar dipecah menjadi sampel 5 menit (regrid_samples),
+  jadi Avg tetap rata-rata berbobot waktu dan slot dihitung sama persis
+  seperti data 5 menit
+"""
+
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime
+from itertools import chain
+from typing import Collection, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import config
+from sample_store import Sample
+
+
+# Step dasar (detik) semua statistik slot: sampel 5 menit
+BASE_STEP = 300
+
+# Arsip RRA: (rra_id, step detik, retensi detik)
+Archive = Tuple[int, int, int]
+
+
+class FetchWindow(NamedTuple):
+    """Satu request graph_xport yang mencakup satu atau beberapa hari"""
+    days: List[datetime]
+    start_ts: int
+    end_ts: int
+    rra_id: int
+    step: int = BASE_STEP
+
+
+def day_window(day: datetime) -> Tuple[int, int]:
+    """
+    Rentang export satu hari: 00:00 sampai slot terakhir + 5 menit buffer
+
+    Returns:
+        (start_ts, end_ts) dalam Unix timestamp
+    """
+    last_hour, last_minute = max(config.TIME_SLOTS)
+    start_ts = int(day.replace(hour=0, minute=0, second=0).timestamp())
+    end_ts = int(day.replace(hour=last_hour, minute=last_minute, second=0).timestamp()) + 300
+    return start_ts, end_ts
+
+
+def finest_archive(archives: Optional[List[Archive]] = None) -> Archive:
+    """RRA dengan step terkecil: (rra_id, step, retensi detik)"""
+    return min(archives or config.RRA_ARCHIVES, key=lambda rra: rra[1])
+
+
+def choose_archive(start_ts: int, now_ts: int, archives: Optional[List[Archive]] = None) -> Archive:
+    """
+    Arsip termurah untuk data sejak start_ts
+
+    Di antara arsip yang retensinya masih mencakup start_ts, pilih step
+    terbesar yang <= config.RESOLUTION_TARGET. Jika tidak ada, pilih step
+    terkecil yang masih tersedia; jika start_ts sudah lebih tua dari semua
+    retensi, arsip dengan retensi terpanjang.
+    """
+    archives = archives or config.RRA_ARCHIVES
+    target = max(BASE_STEP, getattr(config, 'RESOLUTION_TARGET', BASE_STEP))
+    available = [rra for rra in archives if start_ts >= now_ts - rra[2]]
+    if not available:
+        return max(archives, key=lambda rra: rra[2])
+    within_target = [rra for rra in available if rra[1] <= target]
+    if within_target:
+        return max(within_target, key=lambda rra: rra[1])
+    return min(available, key=lambda rra: rra[1])
+
+
+def plan_fetch_windows(days: List[datetime], now_ts: Optional[int] = None,
+                       archives: Optional[List[Archive]] = None,
+                       stored_days: Collection[datetime] = ()) -> List[FetchWindow]:
+    """
+    Kelompokkan hari-hari yang diminta menjadi jendela export
+
+    Args:
+        days: Daftar tanggal (urut naik, weekend sudah difilter)
+        now_ts: Waktu sekarang (default: time.time(), untuk testing)
+        archives: Arsip RRA graph ini (default config.RRA_ARCHIVES)
+        stored_days: Hari yang day_window-nya sudah tercakup di store
+                     lokal (SampleStore). Hari ini diberi arsip terhalus
+                     walau sudah lewat retensinya: datanya dibaca dari
+                     store (rollup/blok), bukan dari arsip kasar Cacti
+
+    Returns:
+        List FetchWindow sesuai urutan tanggal
+    """
+    if now_ts is None:
+        now_ts = int(time.time())
+
+    max_days = max(1, int(config.XPORT_MAX_DAYS))
+
+    windows = []
+    group = []
+    group_archive = None
+
+    def flush():
+        if group:
+            rra_id, step, _ = group_archive
+            start_ts = day_window(group[0])[0]
+            end_ts = day_window(group[-1])[1]
+            if step > BASE_STEP:
+                # Baris kasar bertimestamp di akhir interval: bulatkan ke atas
+                # supaya baris yang memuat slot terakhir ikut terambil
+                end_ts = -(-end_ts // step) * step
+            windows.append(FetchWindow(list(group), start_ts, end_ts, rra_id, step))
+            group.clear()
+
+    for day in days:
+        if day in stored_days:
+            archive = finest_archive(archives)
+        else:
+            archive = choose_archive(day_window(day)[0], now_ts, archives)
+        # Jumlah baris per export dijaga setara XPORT_MAX_DAYS hari data 5 menit
+        group_days = max_days * max(1, archive[1] // BASE_STEP)
+        if group and (archive != group_archive or (day - group[0]).days + 1 > group_days):
+            flush()
+        group.append(day)
+        group_archive = archive
+
+    flush()
+    return windows
+
+
+def regrid_samples(samples: Iterable[Sample], meta: Optional[Dict] = None,
+                   step: Optional[int] = None) -> Iterator[Sample]:
+    """
+    Pecah baris arsip kasar menjadi sampel BASE_STEP (bobot waktu)
+
+    Baris RRA bertimestamp t mewakili interval (t - step, t]. Baris itu
+    diulang sebagai sampel 5 menit di interval tersebut, sehingga Avg slot
+    menjadi rata-rata berbobot waktu dan batas jendela slot berlaku sama
+    seperti data 5 menit. Step dari preamble "Step" selalu dipakai apa
+    adanya. Tanpa preamble dipakai step arsip yang diminta; jika dua baris
+    pertama di kolom Date lebih rapat dari step itu (server tidak memakai
+    arsip yang diminta), selisih itu yang dipakai, dan tanpa keduanya
+    step ditebak dari selisih tersebut.
+    Baris yang jaraknya lebih rapat dari step hanya mewakili selisihnya.
+    Export 5 menit (atau lebih halus) diteruskan apa adanya.
+
+    Args:
+        samples: Sampel urut waktu dari satu export
+        meta: Meta export (iter_samples), 'step' dari preamble "Step" jika ada
+        step: Step arsip yang diminta (FetchWindow.step), dipakai jika
+              preamble tidak punya baris "Step"
+    """
+    samples = iter(samples)
+    first = next(samples, None)
+    if first is None:
+        return
+    # Preamble sudah terbaca saat sampel pertama keluar
+    preamble_step = (meta or {}).get('step')
+    step = preamble_step or step
+    rest = samples
+    if not preamble_step and (step is None or step > BASE_STEP):
+        # Kolom Date lebih rapat dari arsip yang diminta: ikuti kolom Date
+        second = next(samples, None)
+        if second is not None:
+            rest = chain([second], samples)
+            if second[0] > first[0]:
+                step = min(step or second[0] - first[0], second[0] - first[0])
+    step = step or BASE_STEP
+
+    if step <= BASE_STEP:
+        yield first
+        yield from rest
+        return
+
+    yield from _expand(first, step)
+    prev_ts = first[0]
+    for sample in rest:
+        yield from _expand(sample, min(step, sample[0] - prev_ts))
+        prev_ts = sample[0]
+
+
+def _expand(sample: Sample, row_step: int) -> Iterator[Sample]:
+    count = round(row_step / BASE_STEP)
+    if count <= 1:
+        yield sample
+        return
+    ts, in_val, out_val = sample
+    for i in range(count - 1, -1, -1):
+        yield ts - i * BASE_STEP, in_val, out_val
+
+
+def learn_archive(samples: Iterable[Sample], now_ts: int, meta: Optional[Dict] = None) -> Optional[Tuple[int, int]]:
+    """
+    Step dan retensi arsip dari export probe (jendela jauh ke belakang)
+
+    Args:
+        samples: Sampel export probe dengan rra_id dipatok
+        now_ts: Akhir jendela probe
+        meta: Meta export (iter_samples), 'step' dari preamble "Step" jika ada
+
+    Returns:
+        (step, retensi detik) atau None jika export kosong. Retensi dihitung
+        dari baris valid paling lama (data sebelum itu sudah tidak ada).
+    """
+    diffs = Counter()
+    prev_ts = None
+    first_valid = None
+    for ts, in_val, out_val in samples:
+        if prev_ts is not None and ts > prev_ts:
+            diffs[ts - prev_ts] += 1
+        prev_ts = ts
+        if first_valid is None and (in_val is not None or out_val is not None):
+            first_valid = ts
+    step = (meta or {}).get('step')
+    if step is None:
+        if not diffs:
+            return None
+        step = diffs.most_common(1)[0][0]
+    if first_valid is None:
+        return None
+    return step, (now_ts - first_valid) // step * step
+
+
+class RraProfiles:
+    """Arsip RRA per graph hasil probe, disimpan ke file JSON dengan TTL"""
+
+    def __init__(self, path: str, ttl: int):
+        """
+        Args:
+            path: Path file JSON
+            ttl: Umur maksimal profil (detik) sebelum dipelajari ulang
+        """
+        self.path = path
+        self.ttl = ttl
+        self.profiles: Dict[str, Dict] = {}
+        self.cacti_url = ""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            return
+        self.cacti_url = data.get('cacti_url', '')
+        if self.cacti_url == config.CACTI_URL:
+            self.profiles = data.get('graphs', {})
+
+    def get(self, graph_id: str) -> Optional[List[Archive]]:
+        """Arsip graph ini, None jika belum dipelajari atau sudah expired"""
+        profile = self.profiles.get(graph_id)
+        if not profile or time.time() - profile.get('updated', 0) >= self.ttl:
+            return None
+        return [tuple(rra) for rra in profile['archives']]
+
+    def update(self, graph_id: str, archives: List[Archive]):
+        self.profiles[graph_id] = {"updated": int(time.time()), "archives": [list(rra) for rra in archives]}
+        self.cacti_url = config.CACTI_URL
+
+    def save(self):
+        """Simpan profil ke file (atomic replace)"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"cacti_url": self.cacti_url, "graphs": self.profiles}, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,168 @@
+"""
+Flow Control Module
+Batas request paralel adaptif (AIMD) per host Cacti
+
+Server Cacti kantor dipakai bersama, jadi jumlah request in-flight
+dinaikkan pelan-pelan selama latency stabil dan dipotong setengah saat
+respons lambat, status bukan 200, atau redirect ke halaman login.
+
+"Lambat" dibandingkan dengan baseline per kelas request (misal lebar
+jendela export), bukan satu minimum global: request kecil (probe, login)
+tidak membuat export besar tampak lambat.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+
+class AdaptiveLimiter:
+    """Semaphore dengan batas yang diatur AIMD (additive increase, multiplicative decrease)"""
+
+    def __init__(self, initial: int = 2, minimum: int = 1, maximum: int = 8,
+                 slow_factor: float = 3.0, slow_floor: float = 0.25):
+        """
+        Initialize limiter
+
+        Args:
+            initial: Batas awal request in-flight
+            minimum: Batas terendah (tidak pernah di bawah ini)
+            maximum: Batas tertinggi (biasanya config.FETCH_WORKERS)
+            slow_factor: Respons dianggap lambat jika latency > baseline kelasnya x faktor ini
+            slow_floor: Latency minimal (detik) sebelum dianggap lambat, agar
+                        jitter di jaringan yang sangat cepat tidak memicu backoff
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.slow_factor = slow_factor
+        self.slow_floor = slow_floor
+
+        self.in_flight = 0
+        self.latency_ewma = None
+        # Latency terkecil per kelas request (baseline)
+        self.baselines: Dict[str, float] = {}
+        self.requests = 0
+        self.backoffs = 0
+
+        self._cond = threading.Condition()
+        self._last_backoff = 0.0
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Tunggu sampai ada slot kosong
+
+        Args:
+            timeout: Batas waktu tunggu (detik), None = tanpa batas
+
+        Returns:
+            Waktu mulai (untuk release), atau None jika timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            self.in_flight += 1
+        return time.monotonic()
+
+    def release(self, started: float, ok: bool = True, request_class: str = ""):
+        """
+        Kembalikan slot dan update batas
+
+        Args:
+            started: Nilai yang dikembalikan acquire()
+            ok: False jika request gagal (status bukan 200, login redirect, error)
+            request_class: Kelas request dengan ukuran respons sebanding; latency
+                           hanya dibandingkan dengan baseline kelas yang sama
+        """
+        latency = time.monotonic() - started
+
+        with self._cond:
+            self.in_flight -= 1
+            self.requests += 1
+
+            baseline = self.baselines.get(request_class)
+            slow = (baseline is not None
+                    and latency > max(baseline * self.slow_factor, self.slow_floor))
+
+            if ok:
+                self.latency_ewma = latency if self.latency_ewma is None else (
+                    0.8 * self.latency_ewma + 0.2 * latency)
+                if baseline is None or latency < baseline:
+                    self.baselines[request_class] = latency
+
+            if not ok or slow:
+                # Multiplicative decrease, maksimal sekali per request yang
+                # dimulai setelah backoff terakhir (hindari potong berulang)
+                if started >= self._last_backoff:
+                    self.limit = max(float(self.minimum), self.limit / 2)
+                    self._last_backoff = time.monotonic()
+                    self.backoffs += 1
+            else:
+                # Additive increase: +1 setelah satu "putaran" penuh respons bagus
+                self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict:
+        """Statistik untuk tuning: batas terpilih dan latency terukur (detik)"""
+        with self._cond:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "latency_avg": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+                "baselines": {name: round(value, 3) for name, value in self.baselines.items()},
+                "requests": self.requests,
+                "backoffs": self.backoffs,
+            }
+
+
+class LatencyRecorder:
+    """Catatan latency per request (jendela bergulir) untuk threshold hedging"""
+
+    def __init__(self, window: int = 500):
+        """
+        Args:
+            window: Jumlah sampel latency terakhir yang disimpan
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.hedges = 0
+
+    def record(self, latency: float):
+        """Simpan latency satu request (detik)"""
+        with self._lock:
+            self._samples.append(latency)
+
+    def add_hedge(self):
+        """Catat satu request duplikat (hedge) yang dikirim"""
+        with self._lock:
+            self.hedges += 1
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency persentil ke-pct (nearest-rank), None jika belum ada sampel"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(1, int(-(-pct * len(samples) // 100)))  # ceil
+        return samples[min(rank, len(samples)) - 1]
+
+    def snapshot(self) -> Dict:
+        """Ringkasan latency (detik) dan jumlah hedge yang dikirim"""
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        return {
+            "samples": self.count(),
+            "p50": round(p50, 3) if p50 is not None else None,
+            "p95": round(p95, 3) if p95 is not None else None,
+            "hedges": self.hedges,
+        }
@@ -0,0 +1,119 @@
+"""
+Graph Discovery Module
+Index interface -> graph id Cacti, tanpa browser dan tanpa edit config
+
+Halaman tree Cacti (config.CACTI_URL) diambil sekali lewat session
+requests, semua id wrapper_/graph_ dikumpulkan beserta judulnya, lalu
+disimpan ke file index dengan TTL. Judul dicocokkan ke
+config.INTERFACE_TO_SHEET setiap kali index dibaca, jadi perubahan
+mapping tidak perlu discovery ulang.
+"""
+
+import html
+import json
+import os
+import re
+import time
+from typing import Dict, List, Optional
+
+import config
+
+
+# id="wrapper_1730" atau id="graph_1503"
+GRAPH_ID_PATTERN = re.compile(r'id=["\'](?:wrapper|graph)_(\d+)["\']')
+
+# <img ... id='graph_1503' ... alt='Router BGP Ngawi - Traffic - ether4-iForte'>
+# (urutan atribut id/alt bisa terbalik)
+GRAPH_IMG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+IMG_ID_PATTERN = re.compile(r'\bid=["\']graph_(\d+)["\']')
+IMG_TITLE_PATTERN = re.compile(r'\b(?:alt|title)=(["\'])(.*?)\1', re.DOTALL)
+
+
+def extract_graph_ids(page: str) -> List[str]:
+    """Semua graph id unik di halaman tree, urut kemunculan"""
+    return list(dict.fromkeys(GRAPH_ID_PATTERN.findall(page)))
+
+
+def extract_titles(page: str) -> Dict[str, str]:
+    """Judul graph dari atribut alt/title gambar graph di halaman tree"""
+    titles = {}
+    for tag in GRAPH_IMG_PATTERN.findall(page):
+        id_match = IMG_ID_PATTERN.search(tag)
+        title_match = IMG_TITLE_PATTERN.search(tag)
+        if id_match and title_match and title_match.group(2).strip():
+            titles[id_match.group(1)] = html.unescape(title_match.group(2).strip())
+    return titles
+
+
+def match_interface(title: str) -> Optional[str]:
+    """Interface di config.INTERFACE_TO_SHEET yang namanya muncul di judul graph"""
+    for interface_key in config.INTERFACE_TO_SHEET.keys():
+        # Case insensitive check
+        if interface_key.lower() in title.lower():
+            return interface_key
+    return None
+
+
+class GraphIndex:
+    """Index graph id -> judul, disimpan ke file JSON dengan TTL"""
+
+    def __init__(self, path: str, ttl: int):
+        """
+        Args:
+            path: Path file index JSON
+            ttl: Umur maksimal index (detik) sebelum discovery ulang
+        """
+        self.path = path
+        self.ttl = ttl
+        self.cacti_url = ""
+        self.updated = 0
+        self.graphs: Dict[str, str] = {}
+
+    def load(self) -> bool:
+        """
+        Baca index dari file
+
+        Returns:
+            True jika index ada, untuk CACTI_URL yang sama, dan belum expired
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            return False
+
+        self.cacti_url = data.get('cacti_url', '')
+        self.updated = data.get('updated', 0)
+        self.graphs = data.get('graphs', {})
+        return self.is_fresh()
+
+    def is_fresh(self) -> bool:
+        return (bool(self.graphs)
+                and self.cacti_url == config.CACTI_URL
+                and time.time() - self.updated < self.ttl)
+
+    def update(self, graphs: Dict[str, str]):
+        """Ganti isi index dengan hasil discovery terbaru"""
+        self.graphs = dict(graphs)
+        self.cacti_url = config.CACTI_URL
+        self.updated = int(time.time())
+
+    def save(self):
+        """Simpan index ke file (atomic replace)"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "cacti_url": self.cacti_url,
+                "updated": self.updated,
+                "graphs": self.graphs,
+            }, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def interfaces(self) -> Dict[str, str]:
+        """Mapping interface (key INTERFACE_TO_SHEET) -> graph id, urut sesuai config"""
+        matched = {}
+        for graph_id, title in self.graphs.items():
+            interface = match_interface(title)
+            if interface and interface not in matched:
+                matched[interface] = graph_id
+        return {name: matched[name] for name in config.INTERFACE_TO_SHEET if name in matched}
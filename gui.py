@@ -20,6 +20,8 @@ from typing import Optional, Dict, List
 
 import config
 from scraper import run_scraper
+from csv_import import import_csv_directory
+from scrape_results import ScrapeResults
 from excel_writer import write_to_excel
 from languages import LANGUAGES, get_text
 from settings_manager import load_settings, save_settings, update_settings
@@ -56,7 +58,7 @@ class CactiAutoDataGUI:
             self.sheet_vars[sheet_name] = tk.BooleanVar(value=enabled)
         
         # Data storage for preview
-        self.scraped_data: List[Dict] = []
+        self.scraped_data = ScrapeResults()
         
         self.is_running = False
         
@@ -229,6 +231,13 @@ class CactiAutoDataGUI:
         )
         self.stop_btn.pack(side=tk.LEFT, padx=2)
         
+        self.import_btn = ttk.Button(
+            button_frame,
+            text=get_text("btn_import", self.current_lang),
+            command=self._start_import
+        )
+        self.import_btn.pack(side=tk.LEFT, padx=2)
+        
         ttk.Button(
             button_frame,
             text="💾 Export Log",
@@ -496,6 +505,7 @@ class CactiAutoDataGUI:
         self.progress_frame.config(text=get_text("progress_title", lang))
         self.start_btn.config(text=get_text("btn_start", lang))
         self.stop_btn.config(text=get_text("btn_stop", lang))
+        self.import_btn.config(text=get_text("btn_import", lang))
     
     def _copy_debug_cmd(self):
         """Copy debug command to clipboard"""
@@ -587,8 +597,14 @@ class CactiAutoDataGUI:
         
         return True
     
-    def _start_process(self):
-        """Start scraping process"""
+    def _start_import(self):
+        """Impor folder CSV export Cacti (offline, tanpa jaringan)"""
+        csv_dir = filedialog.askdirectory(title=get_text("btn_import", self.current_lang))
+        if csv_dir:
+            self._start_process(csv_dir)
+    
+    def _start_process(self, csv_dir: Optional[str] = None):
+        """Start scraping process (atau impor CSV jika csv_dir diisi)"""
         if not self._validate_inputs():
             return
         
@@ -600,6 +616,7 @@ class CactiAutoDataGUI:
         
         self.is_running = True
         self.start_btn.configure(state=tk.DISABLED)
+        self.import_btn.configure(state=tk.DISABLED)
         self.stop_btn.configure(state=tk.NORMAL)
         self.progress_var.set(0)
         
@@ -629,7 +646,7 @@ class CactiAutoDataGUI:
         
         thread = threading.Thread(
             target=self._run_scraping_thread,
-            args=(start_date, end_date, excel_path)
+            args=(start_date, end_date, excel_path, csv_dir)
         )
         thread.daemon = True
         thread.start()
@@ -655,8 +672,9 @@ class CactiAutoDataGUI:
         selected = {k: v for k, v in self.mapping_vars.items() if self.sheet_vars.get(v.get(), tk.BooleanVar(value=True)).get()}
         config.INTERFACE_TO_SHEET = {k: v.get() for k, v in self.mapping_vars.items()}
     
-    def _run_scraping_thread(self, start_date: datetime, end_date: datetime, excel_path: str):
-        """Thread for running scraping"""
+    def _run_scraping_thread(self, start_date: datetime, end_date: datetime, excel_path: str,
+                             csv_dir: Optional[str] = None):
+        """Thread for running scraping (atau impor CSV offline)"""
         lang = self.current_lang
         is_dry_run = self.dry_run_var.get()
         
@@ -669,7 +687,10 @@ class CactiAutoDataGUI:
             
             # Scrape data with attach option
             attach_existing = self.attach_existing_var.get()
-            data = run_scraper(start_date, end_date, self._update_progress, attach_to_existing=attach_existing)
+            if csv_dir:
+                data = import_csv_directory(csv_dir, start_date, end_date, self._update_progress)
+            else:
+                data = run_scraper(start_date, end_date, self._update_progress, attach_to_existing=attach_existing)
             
             # Filter by selected sheets (if any selected)
             if selected_sheets and data:
@@ -713,6 +734,7 @@ class CactiAutoDataGUI:
         finally:
             self.is_running = False
             self.root.after(0, lambda: self.start_btn.configure(state=tk.NORMAL))
+            self.root.after(0, lambda: self.import_btn.configure(state=tk.NORMAL))
             self.root.after(0, lambda: self.stop_btn.configure(state=tk.DISABLED))
     
     def _populate_preview(self, data: List[Dict], excel_path: str = ""):
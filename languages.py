@@ -36,6 +36,7 @@ LANGUAGES = {
         # Buttons
         "btn_start": "🚀 Mulai Rekap",
         "btn_stop": "⏹️ Berhenti",
+        "btn_import": "📂 Impor CSV",
         "btn_help": "❓ Help",
         "btn_exit": "❌ Keluar",
         
@@ -112,6 +113,7 @@ LANGUAGES = {
         # Buttons
         "btn_start": "🚀 Start Recording",
         "btn_stop": "⏹️ Stop",
+        "btn_import": "📂 Import CSV",
         "btn_help": "❓ Help",
         "btn_exit": "❌ Exit",
         
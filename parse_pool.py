@@ -0,0 +1,93 @@
+"""
+Parse Pool Module
+Decode CSV graph_xport dan hitung statistik di proses terpisah
+
+Thread fetch hanya mengunduh bytes respons; decode, parse dan statistik
+(bagian yang butuh CPU) dikerjakan ProcessPoolExecutor sehingga bisa
+memakai semua core, tidak dibatasi GIL. Pool dibuat sekali dan tetap
+hangat sepanjang run.
+
+Proses worker tidak berbagi memori dengan proses utama, jadi setting
+yang mempengaruhi hasil (TIME_SLOTS, NAN_POLICY, ...) dikirim bersama
+setiap tugas, bukan dibaca dari config.py di worker.
+"""
+
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import config
+from csv_stream import SchemaCache, iter_bytes_lines, iter_samples
+from day_files import DayFiles, day_writer
+from fetch_planner import FetchWindow, regrid_samples
+from response_cache import SETTLE_SECONDS
+from traffic_stats import day_slot_stats
+
+
+# Setting config yang dipakai worker
+SETTINGS = ("TIME_SLOTS", "NAN_POLICY", "PERCENTILE", "PERCENTILE_ACCURACY", "SLOT_WINDOW_MINUTES",
+            "EXCEL_COL_PCT_IN", "EXCEL_COL_PCT_OUT")
+
+# Schema header per graph di proses worker (parser cepat untuk export berikutnya)
+_schemas = SchemaCache()
+
+
+def _warm_up(_):
+    """Tugas kosong: memaksa proses worker start dan import modul lebih awal"""
+    return os.getpid()
+
+
+def window_slot_stats(data: bytes, encoding: Optional[str], graph_id: str, window: FetchWindow,
+                      day_dir: Optional[str], settings: Dict) -> Tuple[Dict, Dict]:
+    """
+    Statistik per hari & slot dari isi respons graph_xport (dijalankan di worker)
+
+    Args:
+        data: Isi respons mentah
+        encoding: Encoding respons (None = UTF-8)
+        graph_id: Local graph id (kunci cache schema)
+        window: Jendela export (hari yang dicakup, step arsip yang diminta)
+        day_dir: Folder DayFiles untuk menyimpan sampel per hari, None = tidak disimpan
+        settings: Nilai config SETTINGS dari proses utama
+
+    Returns:
+        ({tanggal: {(jam, menit): nilai STAT_KEYS}}, meta CSV: title/header/step,
+        plus 'warnings' jika day file gagal ditulis)
+    """
+    for name, value in settings.items():
+        setattr(config, name, value)
+    meta = {}
+    samples = iter_samples(iter_bytes_lines(data, encoding), meta, _schemas, graph_id)
+    on_day = None
+    if day_dir:
+        on_day = day_writer(DayFiles(day_dir), graph_id, window.end_ts,
+                            int(time.time()) - SETTLE_SECONDS, window.step,
+                            meta.setdefault('warnings', []).append)
+    # Baris arsip kasar -> sampel 5 menit berbobot waktu
+    result = day_slot_stats(regrid_samples(samples, meta, window.step), window.days, config.TIME_SLOTS,
+                            raw=True, on_day=on_day)
+    return result, meta
+
+
+class ParsePool:
+    """ProcessPoolExecutor untuk window_slot_stats, hangat sepanjang run"""
+
+    def __init__(self, processes: int):
+        """
+        Args:
+            processes: Jumlah proses worker
+        """
+        self.processes = processes
+        self._executor = ProcessPoolExecutor(max_workers=processes)
+        # Start semua worker sekarang, bukan saat respons pertama datang
+        list(self._executor.map(_warm_up, range(processes)))
+
+    def submit(self, data: bytes, encoding: Optional[str], graph_id: str,
+               window: FetchWindow, day_dir: Optional[str] = None) -> Future:
+        """Kirim satu respons ke worker; Future berisi (hasil, meta)"""
+        settings = {name: getattr(config, name) for name in SETTINGS}
+        return self._executor.submit(window_slot_stats, data, encoding, graph_id, window, day_dir, settings)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,143 @@
+"""
+Quantile Sketch Module
+Persentil (misal p95 untuk burstable billing) tanpa menyimpan seluruh seri
+
+- Sampai EXACT_LIMIT nilai, sketch menyimpan nilai asli (hasil persis)
+- Setelah itu nilai dipindah ke bucket logaritmik (seperti DDSketch):
+  error relatif hasil <= relative_accuracy, jumlah bucket terbatas
+- Dua sketch bisa digabung (merge), misal harian -> bulanan
+- Persentil memakai metode nearest-rank: urutkan, buang (100 - q)% teratas,
+  ambil nilai tertinggi yang tersisa
+"""
+
+import json
+import math
+from typing import Dict, List, Optional
+
+
+# Jumlah nilai yang disimpan apa adanya (~1 minggu sampel 5 menit)
+EXACT_LIMIT = 2048
+
+# Nilai di bawah ini (termasuk 0 dan negatif) masuk bucket nol
+MIN_VALUE = 1e-9
+
+
+def nearest_rank(count: int, q: float) -> int:
+    """Rank (1-based) persentil q dari count nilai"""
+    return min(count, max(1, math.ceil(q / 100.0 * count)))
+
+
+class QuantileSketch:
+    """Sketch kuantil mergeable dengan error relatif terbatas"""
+
+    __slots__ = ('relative_accuracy', 'count', '_values', '_bins', '_zero', '_log_gamma')
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Args:
+            relative_accuracy: Batas error relatif setelah nilai dipindah ke bucket
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy harus di antara 0 dan 1")
+        self.relative_accuracy = relative_accuracy
+        self.count = 0
+        self._values: Optional[List[float]] = []
+        self._bins: Dict[int, int] = {}
+        self._zero = 0
+        self._log_gamma = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+
+    def _bin_add(self, val: float, n: int = 1):
+        if val < MIN_VALUE:
+            self._zero += n
+        else:
+            key = math.ceil(math.log(val) / self._log_gamma)
+            self._bins[key] = self._bins.get(key, 0) + n
+
+    def _collapse(self):
+        """Pindahkan nilai asli ke bucket (mode terbatas)"""
+        for val in self._values:
+            self._bin_add(val)
+        self._values = None
+
+    def add(self, val: float):
+        """Tambah satu nilai (bukan NaN)"""
+        self.count += 1
+        if self._values is not None:
+            self._values.append(val)
+            if len(self._values) > EXACT_LIMIT:
+                self._collapse()
+        else:
+            self._bin_add(val)
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Gabungkan sketch lain ke sketch ini"""
+        if other._log_gamma != self._log_gamma:
+            raise ValueError("relative_accuracy sketch berbeda, tidak bisa digabung")
+        self.count += other.count
+        if self._values is not None and other._values is not None \
+                and len(self._values) + len(other._values) <= EXACT_LIMIT:
+            self._values.extend(other._values)
+            return self
+        if self._values is not None:
+            self._collapse()
+        if other._values is not None:
+            for val in other._values:
+                self._bin_add(val)
+        else:
+            self._zero += other._zero
+            for key, n in other._bins.items():
+                self._bins[key] = self._bins.get(key, 0) + n
+        return self
+
+    def copy(self) -> 'QuantileSketch':
+        clone = QuantileSketch(self.relative_accuracy)
+        return clone.merge(self)
+
+    def to_json(self) -> str:
+        """Serialisasi ringkas (untuk disimpan di database)"""
+        return json.dumps({
+            "a": self.relative_accuracy,
+            "n": self.count,
+            "v": self._values,
+            "b": self._bins,
+            "z": self._zero,
+        }, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> 'QuantileSketch':
+        data = json.loads(text)
+        sketch = cls(data["a"])
+        sketch.count = data["n"]
+        sketch._values = data["v"]
+        sketch._bins = {int(key): n for key, n in data["b"].items()}
+        sketch._zero = data["z"]
+        return sketch
+
+    @property
+    def exact(self) -> bool:
+        """True jika hasil masih persis (belum dipindah ke bucket)"""
+        return self._values is not None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Persentil q (0-100), None jika sketch kosong
+
+        Persis selama count <= EXACT_LIMIT; setelah itu error relatif
+        <= relative_accuracy.
+        """
+        if not self.count:
+            return None
+        rank = nearest_rank(self.count, q)
+        if self._values is not None:
+            return sorted(self._values)[rank - 1]
+
+        seen = self._zero
+        if rank <= seen:
+            return 0.0
+        gamma = math.exp(self._log_gamma)
+        for key in sorted(self._bins):
+            seen += self._bins[key]
+            if rank <= seen:
+                # Titik tengah bucket (gamma^(k-1), gamma^k]: error relatif <= relative_accuracy
+                return 2 * gamma ** key / (gamma + 1)
+        return None
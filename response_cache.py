@@ -0,0 +1,155 @@
+"""
+Response Cache Module
+Cache di disk untuk respons CSV graph_xport
+
+- Jendela yang sudah lewat (data RRD sudah terkonsolidasi) disimpan tanpa batas waktu
+- Jendela yang menyentuh "sekarang" hanya disimpan sebentar (TTL pendek)
+- Total ukuran dibatasi; entri yang paling lama tidak dipakai (LRU) dibuang duluan
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+
+# Data RRD dianggap final jika jendela berakhir lebih dari ini (detik) yang lalu
+SETTLE_SECONDS = 600
+
+
+class ResponseCache:
+    """Cache respons graph_xport di disk dengan TTL dan batas ukuran LRU"""
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: str, max_bytes: int, recent_ttl: int = 300):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Folder penyimpanan cache
+            max_bytes: Batas total ukuran file cache (byte)
+            recent_ttl: TTL (detik) untuk jendela yang menyentuh waktu sekarang
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.recent_ttl = recent_ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = {}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(host: str, graph_id: str, start_ts: int, end_ts: int, rra_id: int) -> str:
+        """Kunci cache: host + graph id + rentang waktu + rra"""
+        return f"{host}|{graph_id}|{start_ts}|{end_ts}|{rra_id}"
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.cache_dir, filename)
+
+    def _load_index(self):
+        """Baca index dari disk, buang entri yang filenya sudah hilang"""
+        try:
+            with open(self._path(self.INDEX_FILE), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (IOError, ValueError):
+            index = {}
+
+        self._index = {
+            key: entry for key, entry in index.items()
+            if os.path.exists(self._path(entry['file']))
+        }
+
+    def save(self):
+        """Simpan index ke disk (atomic replace)"""
+        with self._lock:
+            data = json.dumps(self._index)
+        tmp_path = self._path(self.INDEX_FILE + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(self.INDEX_FILE))
+
+    def get_path(self, key: str) -> Optional[str]:
+        """Path file cache untuk key (untuk dibaca streaming), None jika miss/expired"""
+        with self._lock:
+            entry = self._index.get(key)
+            if entry and entry['expires'] and entry['expires'] < time.time():
+                self._remove(key)
+                entry = None
+            if not entry or not os.path.exists(self._path(entry['file'])):
+                self._index.pop(key, None)
+                self.misses += 1
+                return None
+            entry['used'] = time.time()
+            self.hits += 1
+            return self._path(entry['file'])
+
+    def temp_path(self) -> str:
+        """Path file sementara di folder cache (untuk ditulis lalu put_file)"""
+        return self._path(f"{uuid.uuid4().hex}.tmp")
+
+    def put(self, key: str, content: str, end_ts: int):
+        """
+        Simpan isi CSV ke cache
+
+        Args:
+            key: Kunci dari make_key()
+            content: Isi CSV (tanpa BOM)
+            end_ts: Akhir jendela export, menentukan TTL
+        """
+        tmp_path = self.temp_path()
+        try:
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(content)
+            self.put_file(key, tmp_path, end_ts)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put_file(self, key: str, tmp_path: str, end_ts: int):
+        """
+        Pindahkan file sementara (UTF-8, tanpa BOM) menjadi entri cache
+
+        Args:
+            key: Kunci dari make_key()
+            tmp_path: File dari temp_path() yang sudah selesai ditulis
+            end_ts: Akhir jendela export, menentukan TTL
+        """
+        now = time.time()
+        expires = 0 if end_ts < now - SETTLE_SECONDS else now + self.recent_ttl
+
+        filename = hashlib.sha1(key.encode('utf-8')).hexdigest() + ".csv"
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, self._path(filename))
+
+        with self._lock:
+            self._index[key] = {"file": filename, "size": size, "expires": expires, "used": now}
+            self._evict()
+
+    def _remove(self, key: str):
+        """Hapus satu entri (lock harus sudah dipegang)"""
+        entry = self._index.pop(key, None)
+        if entry:
+            try:
+                os.remove(self._path(entry['file']))
+            except OSError:
+                pass
+
+    def _evict(self):
+        """Buang entri LRU sampai total ukuran <= max_bytes (lock harus sudah dipegang)"""
+        total = sum(entry['size'] for entry in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self._index, key=lambda k: self._index[k]['used']):
+            if total <= self.max_bytes:
+                break
+            total -= self._index[key]['size']
+            self._remove(key)
@@ -0,0 +1,178 @@
+"""
+Rollups Module
+Agregat sampel per jam / hari / bulan untuk laporan jangka panjang
+
+Setiap bucket menyimpan jumlah sampel dan, per arah (In/Out): count nilai
+valid, sum (eksak), max, nilai valid terakhir beserta timestamp-nya, dan
+QuantileSketch opsional. Semuanya bisa digabung dengan urutan bebas, jadi
+bucket diperbarui sedikit demi sedikit saat sampel baru masuk dan jendela
+panjang cukup menggabungkan beberapa baris rollup.
+
+Nilai NaN tidak dimasukkan; kebijakan NAN_POLICY diterapkan saat dibaca
+(traffic_stats.stats_from_bucket), jadi rollup tidak bergantung config.
+"""
+
+from datetime import datetime
+from typing import Optional, Tuple
+
+from quantile_sketch import QuantileSketch
+
+
+# Level dari yang paling halus
+LEVELS = ("hour", "day", "month")
+
+
+def bucket_start(level: str, ts: int) -> int:
+    """Awal bucket (waktu lokal, sama seperti kolom Date Cacti) yang memuat ts"""
+    dt = datetime.fromtimestamp(ts)
+    if level == "hour":
+        dt = dt.replace(minute=0, second=0, microsecond=0)
+    elif level == "day":
+        dt = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    elif level == "month":
+        dt = dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    else:
+        raise ValueError(f"Level rollup tidak dikenal: {level!r}")
+    return int(dt.timestamp())
+
+
+def bucket_end(level: str, start_ts: int) -> int:
+    """Akhir bucket (eksklusif) yang dimulai pada start_ts"""
+    if level == "hour":
+        return bucket_start("hour", start_ts + 3600)
+    if level == "day":
+        # Hari lokal 23-25 jam (DST): +36 jam pasti jatuh di hari berikutnya
+        return bucket_start("day", start_ts + 36 * 3600)
+    dt = datetime.fromtimestamp(start_ts)
+    if dt.month == 12:
+        return int(dt.replace(year=dt.year + 1, month=1).timestamp())
+    return int(dt.replace(month=dt.month + 1).timestamp())
+
+
+class DirectionRollup:
+    """Agregat satu arah traffic: count, sum eksak, max, last (+ sketch)"""
+
+    __slots__ = ('count', 'sum_num', 'sum_shift', 'peak', 'last', 'last_ts', 'sketch')
+
+    def __init__(self, sketch_accuracy: Optional[float] = None):
+        self.count = 0
+        # sum = sum_num / 2^sum_shift (tanpa pembulatan)
+        self.sum_num = 0
+        self.sum_shift = 0
+        self.peak: Optional[float] = None
+        self.last: Optional[float] = None
+        self.last_ts: Optional[int] = None
+        self.sketch = QuantileSketch(sketch_accuracy) if sketch_accuracy else None
+
+    def _add_exact(self, num: int, shift: int):
+        if shift > self.sum_shift:
+            self.sum_num <<= shift - self.sum_shift
+            self.sum_shift = shift
+        self.sum_num += num << (self.sum_shift - shift)
+
+    def add(self, ts: int, val: float):
+        """Tambah satu nilai valid (bukan NaN)"""
+        self.count += 1
+        num, den = val.as_integer_ratio()
+        self._add_exact(num, den.bit_length() - 1)
+        if self.peak is None or val > self.peak:
+            self.peak = val
+        if self.last_ts is None or ts >= self.last_ts:
+            self.last, self.last_ts = val, ts
+        if self.sketch is not None:
+            self.sketch.add(val)
+
+    def merge(self, other: 'DirectionRollup'):
+        if not other.count:
+            return
+        self.count += other.count
+        self._add_exact(other.sum_num, other.sum_shift)
+        if self.peak is None or other.peak > self.peak:
+            self.peak = other.peak
+        if self.last_ts is None or other.last_ts >= self.last_ts:
+            self.last, self.last_ts = other.last, other.last_ts
+        if self.sketch is not None:
+            if other.sketch is None:
+                raise ValueError("Rollup tanpa sketch tidak bisa digabung ke rollup dengan sketch")
+            self.sketch.merge(other.sketch)
+
+    def mean(self, divisor: int) -> float:
+        """sum / divisor, dibulatkan sekali (pembagian integer eksak)"""
+        return self.sum_num / (divisor << self.sum_shift)
+
+    def to_row(self) -> Tuple:
+        return (self.count, str(self.sum_num), self.sum_shift, self.peak, self.last, self.last_ts,
+                self.sketch.to_json() if self.sketch is not None else None)
+
+    @classmethod
+    def from_row(cls, row: Tuple) -> 'DirectionRollup':
+        rollup = cls()
+        (rollup.count, sum_num, rollup.sum_shift, rollup.peak,
+         rollup.last, rollup.last_ts, sketch) = row
+        rollup.sum_num = int(sum_num)
+        rollup.sketch = QuantileSketch.from_json(sketch) if sketch else None
+        return rollup
+
+
+class RollupBucket:
+    """Agregat sampel satu bucket (atau gabungan beberapa bucket)"""
+
+    __slots__ = ('samples', 'last_ts', 'inbound', 'outbound')
+
+    # Kolom tabel rollups setelah (graph_id, level, bucket_ts)
+    COLUMNS = ("samples", "last_ts",
+               "in_count", "in_sum", "in_shift", "in_max", "in_last", "in_last_ts", "in_sketch",
+               "out_count", "out_sum", "out_shift", "out_max", "out_last", "out_last_ts", "out_sketch")
+
+    def __init__(self, sketch_accuracy: Optional[float] = None):
+        """
+        Args:
+            sketch_accuracy: Error relatif QuantileSketch, None = tanpa sketch
+        """
+        self.samples = 0
+        self.last_ts: Optional[int] = None
+        self.inbound = DirectionRollup(sketch_accuracy)
+        self.outbound = DirectionRollup(sketch_accuracy)
+
+    @property
+    def has_sketch(self) -> bool:
+        return self.inbound.sketch is not None
+
+    def drop_sketch(self):
+        """Buang sketch (untuk menggabung bucket dengan konfigurasi persentil berbeda)"""
+        self.inbound.sketch = None
+        self.outbound.sketch = None
+
+    def add(self, ts: int, in_val: Optional[float], out_val: Optional[float]):
+        """Tambah satu sampel (None / NaN = tidak ada data)"""
+        self.samples += 1
+        if self.last_ts is None or ts > self.last_ts:
+            self.last_ts = ts
+        if in_val is not None and in_val == in_val:
+            self.inbound.add(ts, in_val)
+        if out_val is not None and out_val == out_val:
+            self.outbound.add(ts, out_val)
+
+    def merge(self, other: 'RollupBucket') -> 'RollupBucket':
+        """Gabungkan bucket lain (urutan waktu bebas, sampelnya tidak boleh tumpang tindih)"""
+        if not other.samples:
+            return self
+        self.samples += other.samples
+        if self.last_ts is None or other.last_ts > self.last_ts:
+            self.last_ts = other.last_ts
+        self.inbound.merge(other.inbound)
+        self.outbound.merge(other.outbound)
+        return self
+
+    def to_row(self) -> Tuple:
+        """Nilai kolom sesuai COLUMNS"""
+        return (self.samples, self.last_ts) + self.inbound.to_row() + self.outbound.to_row()
+
+    @classmethod
+    def from_row(cls, row: Tuple) -> 'RollupBucket':
+        """Bucket dari nilai kolom sesuai COLUMNS"""
+        bucket = cls()
+        bucket.samples, bucket.last_ts = row[0], row[1]
+        bucket.inbound = DirectionRollup.from_row(row[2:9])
+        bucket.outbound = DirectionRollup.from_row(row[9:16])
+        return bucket
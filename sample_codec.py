@@ -0,0 +1,219 @@
+"""
+Sample Codec Module
+Encoding kolumnar terkompresi untuk arsip sampel (satu blok per graph per hari)
+
+Format satu blok:
+- varint jumlah sampel
+- timestamp: delta-of-delta (varint zigzag). Sampel 5 menit yang rapi
+  hanya butuh 1 byte per timestamp (dod = 0)
+- nilai In lalu Out: kompresi float XOR ala Gorilla (Facebook TSDB),
+  masing-masing diawali panjang byte (varint). Nilai sama dengan
+  sebelumnya = 1 bit; selain itu hanya bit bermakna dari XOR yang ditulis.
+  NaN (None) disimpan sebagai bit pattern NaN kanonik
+
+Header blok (BlockHeader: count/min/max/sum/last per arah) disimpan
+terpisah dari isi blok, jadi statistik satu hari utuh bisa dibaca tanpa
+decode. Sum disimpan eksak (seperti rollups), sehingga header bisa
+digabung dengan rollup dan sampel mentah tanpa mengubah hasil.
+"""
+
+import math
+import struct
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from rollups import DirectionRollup
+
+
+# Sama dengan sample_store.Sample (modul ini tidak mengimpor sample_store)
+Sample = Tuple[int, Optional[float], Optional[float]]
+
+# Bit pattern NaN kanonik (pengganti None)
+NAN_BITS = 0x7FF8000000000000
+
+
+class DirectionHeader(NamedTuple):
+    """Ringkasan satu arah di header blok (nilai valid saja)"""
+    count: int
+    min: Optional[float]
+    max: Optional[float]
+    # sum = sum_num / 2^sum_shift (eksak, lihat rollups.DirectionRollup)
+    sum_num: int
+    sum_shift: int
+    last: Optional[float]
+    last_ts: Optional[int]
+
+
+class BlockHeader(NamedTuple):
+    """Ringkasan satu blok: dipakai untuk statistik tanpa decode"""
+    samples: int
+    first_ts: int
+    last_ts: int
+    inbound: DirectionHeader
+    outbound: DirectionHeader
+
+
+def _zigzag(n: int) -> int:
+    return n << 1 if n >= 0 else ((-n) << 1) - 1
+
+
+def _unzigzag(n: int) -> int:
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+
+def _put_varint(out: bytearray, n: int):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _float_bits(values: Sequence[Optional[float]]) -> Tuple[int, ...]:
+    raw = struct.pack(f">{len(values)}d", *(math.nan if v is None else v for v in values))
+    bits = struct.unpack(f">{len(values)}Q", raw)
+    # Semua NaN disamakan ke pola kanonik
+    return tuple(NAN_BITS if (b >> 52) & 0x7FF == 0x7FF and b & 0xFFFFFFFFFFFFF else b for b in bits)
+
+
+def _encode_values(values: Sequence[Optional[float]]) -> bytes:
+    """Kompresi XOR Gorilla untuk satu kolom nilai"""
+    bits = _float_bits(values)
+    out = bytearray()
+    acc = 0        # bit yang belum jadi byte
+    acc_bits = 0
+
+    def write(value: int, width: int):
+        nonlocal acc, acc_bits
+        acc = (acc << width) | value
+        acc_bits += width
+        while acc_bits >= 8:
+            acc_bits -= 8
+            out.append((acc >> acc_bits) & 0xFF)
+        acc &= (1 << acc_bits) - 1
+
+    prev = bits[0]
+    write(prev, 64)
+    prev_lead = prev_trail = -1
+    for cur in bits[1:]:
+        xor = cur ^ prev
+        prev = cur
+        if not xor:
+            write(0, 1)
+            continue
+        lead = min(64 - xor.bit_length(), 31)
+        trail = (xor & -xor).bit_length() - 1
+        if prev_lead >= 0 and lead >= prev_lead and trail >= prev_trail:
+            # Bit bermakna muat di jendela sebelumnya
+            write(0b10, 2)
+            write(xor >> prev_trail, 64 - prev_lead - prev_trail)
+        else:
+            meaningful = 64 - lead - trail
+            write(0b11, 2)
+            write(lead, 5)
+            write(meaningful & 63, 6)  # 64 ditulis sebagai 0
+            write(xor >> trail, meaningful)
+            prev_lead, prev_trail = lead, trail
+    if acc_bits:
+        out.append((acc << (8 - acc_bits)) & 0xFF)
+    return bytes(out)
+
+
+def _decode_values(data: bytes, count: int) -> List[Optional[float]]:
+    """Kebalikan _encode_values"""
+    big = int.from_bytes(data, 'big')
+    total = len(data) * 8
+    pos = 0
+
+    def read(width: int) -> int:
+        nonlocal pos
+        pos += width
+        return (big >> (total - pos)) & ((1 << width) - 1)
+
+    prev = read(64)
+    bits = [prev]
+    lead = trail = 0
+    for _ in range(count - 1):
+        if read(1):
+            if read(1):
+                lead = read(5)
+                meaningful = read(6) or 64
+                trail = 64 - lead - meaningful
+            prev ^= read(64 - lead - trail) << trail
+        bits.append(prev)
+    floats = struct.unpack(f">{count}d", struct.pack(f">{count}Q", *bits))
+    return [None if v != v else v for v in floats]
+
+
+def _direction_header(timestamps: Sequence[int], values: Sequence[Optional[float]]) -> DirectionHeader:
+    rollup = DirectionRollup()
+    low = None
+    for ts, val in zip(timestamps, values):
+        if val is not None:
+            rollup.add(ts, val)
+            if low is None or val < low:
+                low = val
+    return DirectionHeader(rollup.count, low, rollup.peak, rollup.sum_num, rollup.sum_shift,
+                           rollup.last, rollup.last_ts)
+
+
+def encode_block(samples: Sequence[Sample]) -> Tuple[BlockHeader, bytes]:
+    """
+    Encode sampel satu graph-hari (urut waktu, tanpa timestamp ganda)
+
+    Returns:
+        (header, isi blok)
+    """
+    if not samples:
+        raise ValueError("Blok tidak boleh kosong")
+    timestamps = [s[0] for s in samples]
+    in_values = [s[1] for s in samples]
+    out_values = [s[2] for s in samples]
+
+    out = bytearray()
+    _put_varint(out, len(samples))
+    _put_varint(out, _zigzag(timestamps[0]))
+    prev_ts = timestamps[0]
+    prev_delta = 0
+    for ts in timestamps[1:]:
+        delta = ts - prev_ts
+        _put_varint(out, _zigzag(delta - prev_delta))
+        prev_ts, prev_delta = ts, delta
+    for values in (in_values, out_values):
+        encoded = _encode_values(values)
+        _put_varint(out, len(encoded))
+        out += encoded
+
+    header = BlockHeader(len(samples), timestamps[0], timestamps[-1],
+                         _direction_header(timestamps, in_values), _direction_header(timestamps, out_values))
+    return header, bytes(out)
+
+
+def decode_block(data: bytes) -> List[Sample]:
+    """Sampel (ts, in, out) dari isi blok encode_block"""
+    count, pos = _get_varint(data, 0)
+    first, pos = _get_varint(data, pos)
+    ts = _unzigzag(first)
+    timestamps = [ts]
+    delta = 0
+    for _ in range(count - 1):
+        dod, pos = _get_varint(data, pos)
+        delta += _unzigzag(dod)
+        ts += delta
+        timestamps.append(ts)
+    columns = []
+    for _ in range(2):
+        length, pos = _get_varint(data, pos)
+        columns.append(_decode_values(data[pos:pos + length], count))
+        pos += length
+    return list(zip(timestamps, columns[0], columns[1]))
@@ -0,0 +1,427 @@
+"""
+Sample Store Module
+Penyimpanan lokal (SQLite) untuk sampel 5 menit per graph
+
+- Tabel samples: (graph_id, ts) -> nilai inbound/outbound (NULL = NaN)
+- Tabel coverage: interval waktu yang sudah pernah diambil dari Cacti,
+  sehingga scraper hanya perlu meminta bagian yang belum ada (gap)
+- Tabel rollups: agregat per jam/hari/bulan (lihat rollups.py), diperbarui
+  setiap kali interval baru ditandai tercakup
+- Tabel blocks: arsip terkompresi satu blok per graph per hari (lihat
+  sample_codec.py). compact() memindahkan hari lama dari tabel samples
+  ke blok; pembacaan sampel menggabungkan keduanya, dan window_bucket
+  memakai header blok untuk hari utuh tanpa decode
+"""
+
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Satu sampel: (timestamp, inbound, outbound), None = NaN/tidak ada data
+Sample = Tuple[int, Optional[float], Optional[float]]
+
+# Import setelah Sample: rollups tidak bergantung pada modul ini
+from rollups import LEVELS, RollupBucket, bucket_end, bucket_start  # noqa: E402
+from sample_codec import BlockHeader, DirectionHeader, decode_block, encode_block  # noqa: E402
+
+# Kolom header tabel blocks setelah (graph_id, day_ts), lihat BlockHeader
+BLOCK_COLUMNS = ("samples", "first_ts", "last_ts",
+                 "in_count", "in_min", "in_max", "in_sum", "in_shift", "in_last", "in_last_ts",
+                 "out_count", "out_min", "out_max", "out_sum", "out_shift", "out_last", "out_last_ts")
+
+
+def _header_row(direction: DirectionHeader) -> Tuple:
+    """Nilai kolom satu arah header (sum sebagai teks: bisa melebihi INTEGER SQLite)"""
+    return direction[:3] + (str(direction.sum_num),) + direction[4:]
+
+
+def _header_bucket(header: BlockHeader) -> RollupBucket:
+    """RollupBucket (tanpa sketch) dari header blok, sama dengan menambah semua sampel blok"""
+    bucket = RollupBucket()
+    bucket.samples, bucket.last_ts = header.samples, header.last_ts
+    for rollup, direction in ((bucket.inbound, header.inbound), (bucket.outbound, header.outbound)):
+        rollup.count = direction.count
+        rollup.sum_num, rollup.sum_shift = direction.sum_num, direction.sum_shift
+        rollup.peak, rollup.last, rollup.last_ts = direction.max, direction.last, direction.last_ts
+    return bucket
+
+
+class SampleStore:
+    """Store sampel per graph + index interval yang sudah tercakup"""
+
+    def __init__(self, db_path: str, sketch_accuracy: Optional[float] = None):
+        """
+        Initialize store
+
+        Args:
+            db_path: Path file SQLite (dibuat jika belum ada)
+            sketch_accuracy: Error relatif QuantileSketch di rollup, None = tanpa sketch
+        """
+        self.db_path = db_path
+        self.sketch_accuracy = sketch_accuracy
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        has_rollups = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollups'"
+        ).fetchone() is not None
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS samples (
+                graph_id TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                in_val REAL,
+                out_val REAL,
+                PRIMARY KEY (graph_id, ts)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS coverage (
+                graph_id TEXT NOT NULL,
+                start_ts INTEGER NOT NULL,
+                end_ts INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS coverage_graph ON coverage (graph_id, start_ts);
+        """)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blocks (graph_id TEXT NOT NULL, day_ts INTEGER NOT NULL, "
+            + ", ".join(BLOCK_COLUMNS) + ", data BLOB NOT NULL, "
+            "PRIMARY KEY (graph_id, day_ts)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rollups (graph_id TEXT NOT NULL, level TEXT NOT NULL, "
+            "bucket_ts INTEGER NOT NULL, " + ", ".join(RollupBucket.COLUMNS) + ", "
+            "PRIMARY KEY (graph_id, level, bucket_ts)) WITHOUT ROWID"
+        )
+        if not has_rollups:
+            # Database lama: bangun rollup sekali dari sampel yang sudah tercakup
+            for graph_id, start_ts, end_ts in self._conn.execute(
+                    "SELECT graph_id, start_ts, end_ts FROM coverage").fetchall():
+                self._update_rollups(graph_id, [(start_ts, end_ts)])
+        self._conn.commit()
+
+    def close(self):
+        """Tutup koneksi database"""
+        with self._lock:
+            self._conn.close()
+
+    def missing_ranges(self, graph_id: str, start_ts: int, end_ts: int) -> List[Tuple[int, int]]:
+        """
+        Bagian dari [start_ts, end_ts] yang belum tercakup
+
+        Returns:
+            List (start_ts, end_ts) yang perlu diambil dari Cacti
+        """
+        with self._lock:
+            intervals = self._conn.execute(
+                "SELECT start_ts, end_ts FROM coverage "
+                "WHERE graph_id = ? AND end_ts >= ? AND start_ts <= ? ORDER BY start_ts",
+                (graph_id, start_ts, end_ts),
+            ).fetchall()
+
+        gaps = []
+        cursor = start_ts
+        for covered_start, covered_end in intervals:
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end_ts:
+            gaps.append((cursor, end_ts))
+        return gaps
+
+    def add_samples(self, graph_id: str, samples: Iterable[Sample],
+                    covered_start: int, covered_end: int):
+        """
+        Simpan sampel dan tandai [covered_start, covered_end] sebagai tercakup
+
+        samples dibaca habis sebelum lock diambil: stream dari respons HTTP
+        yang lambat tidak menahan thread lain yang memakai store. Jika
+        stream gagal di tengah jalan, tidak ada yang disimpan.
+
+        Args:
+            graph_id: Local graph id Cacti
+            samples: Sampel hasil export
+            covered_start: Awal interval yang sudah final
+            covered_end: Akhir interval yang sudah final (<= covered_start = tidak ditandai)
+        """
+        rows = [(graph_id, ts, in_val, out_val) for ts, in_val, out_val in samples]
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO samples (graph_id, ts, in_val, out_val) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+
+                if covered_end > covered_start:
+                    # Gabungkan dengan interval yang overlap/bersebelahan
+                    overlapping = self._conn.execute(
+                        "SELECT rowid, start_ts, end_ts FROM coverage "
+                        "WHERE graph_id = ? AND end_ts >= ? AND start_ts <= ? ORDER BY start_ts",
+                        (graph_id, covered_start, covered_end),
+                    ).fetchall()
+
+                    # Rollup hanya menerima sampel dari bagian yang baru tercakup
+                    fresh = []
+                    cursor = covered_start
+                    for _, start_ts, end_ts in overlapping:
+                        if start_ts > cursor:
+                            fresh.append((cursor, start_ts - 1))
+                        cursor = max(cursor, end_ts + 1)
+                    if cursor <= covered_end:
+                        fresh.append((cursor, covered_end))
+                    self._update_rollups(graph_id, fresh)
+
+                    for rowid, start_ts, end_ts in overlapping:
+                        covered_start = min(covered_start, start_ts)
+                        covered_end = max(covered_end, end_ts)
+                        self._conn.execute("DELETE FROM coverage WHERE rowid = ?", (rowid,))
+                    self._conn.execute(
+                        "INSERT INTO coverage (graph_id, start_ts, end_ts) VALUES (?, ?, ?)",
+                        (graph_id, covered_start, covered_end),
+                    )
+
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def _update_rollups(self, graph_id: str, ranges: List[Tuple[int, int]]):
+        """Tambahkan sampel di ranges (inklusif) ke bucket jam/hari/bulan (lock sudah dipegang)"""
+        buckets: Dict[Tuple[str, int], RollupBucket] = {}
+        hour_bucket = None
+        hour_end = None
+        for start_ts, end_ts in ranges:
+            for ts, in_val, out_val in self._read_samples(graph_id, start_ts, end_ts):
+                if hour_end is None or not hour_bucket <= ts < hour_end:
+                    hour_bucket = bucket_start("hour", ts)
+                    hour_end = bucket_end("hour", hour_bucket)
+                key = ("hour", hour_bucket)
+                if key not in buckets:
+                    buckets[key] = RollupBucket(self.sketch_accuracy)
+                buckets[key].add(ts, in_val, out_val)
+
+        # Hari dan bulan dibangun dari bucket jam
+        for (_, hour_ts), bucket in list(buckets.items()):
+            for level in ("day", "month"):
+                key = (level, bucket_start(level, hour_ts))
+                if key not in buckets:
+                    buckets[key] = RollupBucket(self.sketch_accuracy)
+                buckets[key].merge(bucket)
+
+        placeholders = ", ".join("?" * (3 + len(RollupBucket.COLUMNS)))
+        for (level, bucket_ts), bucket in buckets.items():
+            row = self._conn.execute(
+                "SELECT " + ", ".join(RollupBucket.COLUMNS) + " FROM rollups "
+                "WHERE graph_id = ? AND level = ? AND bucket_ts = ?",
+                (graph_id, level, bucket_ts),
+            ).fetchone()
+            if row is not None:
+                stored = RollupBucket.from_row(row)
+                if stored.has_sketch != bucket.has_sketch:
+                    # Konfigurasi persentil berubah: simpan tanpa sketch
+                    stored.drop_sketch()
+                    bucket.drop_sketch()
+                bucket = stored.merge(bucket)
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO rollups VALUES ({placeholders})",
+                (graph_id, level, bucket_ts) + bucket.to_row(),
+            )
+
+    def get_samples(self, graph_id: str, start_ts: int, end_ts: int) -> List[Sample]:
+        """Sampel dengan timestamp di dalam [start_ts, end_ts], urut waktu"""
+        with self._lock:
+            return list(self._read_samples(graph_id, start_ts, end_ts))
+
+    def _read_samples(self, graph_id: str, start_ts: int, end_ts: int) -> Iterable[Sample]:
+        """Sampel [start_ts, end_ts] dari tabel samples + blok arsip (lock sudah dipegang)"""
+        rows = self._conn.execute(
+            "SELECT ts, in_val, out_val FROM samples "
+            "WHERE graph_id = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+            (graph_id, start_ts, end_ts),
+        )
+        blocks = self._conn.execute(
+            "SELECT data FROM blocks WHERE graph_id = ? AND last_ts >= ? AND first_ts <= ? ORDER BY day_ts",
+            (graph_id, start_ts, end_ts),
+        ).fetchall()
+        if not blocks:
+            return rows
+        merged = {}
+        for (data,) in blocks:
+            for sample in decode_block(data):
+                if start_ts <= sample[0] <= end_ts:
+                    merged[sample[0]] = sample
+        # Baris tabel samples lebih baru dari blok
+        for sample in rows:
+            merged[sample[0]] = sample
+        return [merged[ts] for ts in sorted(merged)]
+
+    def compact(self, before_ts: int) -> int:
+        """
+        Pindahkan sampel hari yang berakhir sebelum before_ts dari tabel
+        samples ke blok terkompresi (satu blok per graph per hari)
+
+        Returns:
+            Jumlah blok graph-hari yang ditulis
+        """
+        written = 0
+        with self._lock:
+            try:
+                for graph_id, cursor in self._conn.execute(
+                        "SELECT graph_id, MIN(ts) FROM samples WHERE ts < ? GROUP BY graph_id",
+                        (before_ts,)).fetchall():
+                    while True:
+                        # Lompat ke hari berikutnya yang masih punya baris di tabel samples
+                        (first_ts,) = self._conn.execute(
+                            "SELECT MIN(ts) FROM samples WHERE graph_id = ? AND ts >= ? AND ts < ?",
+                            (graph_id, cursor, before_ts),
+                        ).fetchone()
+                        if first_ts is None:
+                            break
+                        day_ts = bucket_start("day", first_ts)
+                        day_end = bucket_end("day", day_ts)
+                        if day_end > before_ts:
+                            break
+                        self._compact_day(graph_id, day_ts, day_end - 1)
+                        written += 1
+                        cursor = day_end
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return written
+
+    def _compact_day(self, graph_id: str, day_ts: int, day_last: int):
+        """Encode sampel satu graph-hari ke tabel blocks (lock sudah dipegang)"""
+        rows = self._conn.execute(
+            "SELECT ts, in_val, out_val FROM samples "
+            "WHERE graph_id = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+            (graph_id, day_ts, day_last),
+        ).fetchall()
+        existing = self._conn.execute(
+            "SELECT data FROM blocks WHERE graph_id = ? AND day_ts = ?", (graph_id, day_ts)
+        ).fetchone()
+        if existing is not None:
+            merged = {sample[0]: sample for sample in decode_block(existing[0])}
+            merged.update((sample[0], sample) for sample in rows)
+            rows = [merged[ts] for ts in sorted(merged)]
+
+        header, data = encode_block(rows)
+        placeholders = ", ".join("?" * (3 + len(BLOCK_COLUMNS)))
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO blocks VALUES ({placeholders})",
+            (graph_id, day_ts, header.samples, header.first_ts, header.last_ts)
+            + _header_row(header.inbound) + _header_row(header.outbound) + (data,),
+        )
+        self._conn.execute(
+            "DELETE FROM samples WHERE graph_id = ? AND ts BETWEEN ? AND ?",
+            (graph_id, day_ts, day_last),
+        )
+
+    def get_rollups(self, graph_id: str, level: str,
+                    start_ts: int, end_ts: int) -> List[Tuple[int, RollupBucket]]:
+        """
+        Baris rollup satu level dengan awal bucket di dalam [start_ts, end_ts]
+
+        Returns:
+            List (bucket_ts, RollupBucket), urut waktu
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT bucket_ts, " + ", ".join(RollupBucket.COLUMNS) + " FROM rollups "
+                "WHERE graph_id = ? AND level = ? AND bucket_ts BETWEEN ? AND ? ORDER BY bucket_ts",
+                (graph_id, level, start_ts, end_ts),
+            ).fetchall()
+        return [(row[0], RollupBucket.from_row(row[1:])) for row in rows]
+
+    def window_bucket(self, graph_id: str, start_ts: int, end_ts: int) -> RollupBucket:
+        """
+        Agregat semua sampel di [start_ts, end_ts]
+
+        Bagian jendela yang berupa bulan/hari/jam utuh dan sudah tercakup
+        dibaca dari tabel rollups (beberapa baris saja). Hari utuh yang
+        sudah dipindah ke blok dibaca dari header blok (jika tidak perlu
+        sketch). Sisanya (ujung jendela yang tidak pas batas jam, atau
+        bagian belum tercakup) dari sampel mentah.
+        """
+        with self._lock:
+            intervals = self._conn.execute(
+                "SELECT start_ts, end_ts FROM coverage "
+                "WHERE graph_id = ? AND end_ts >= ? AND start_ts <= ?",
+                (graph_id, start_ts, end_ts),
+            ).fetchall()
+            rows = {level: {} for level in LEVELS}
+            for level, bucket_ts, *columns in self._conn.execute(
+                    "SELECT level, bucket_ts, " + ", ".join(RollupBucket.COLUMNS) + " FROM rollups "
+                    "WHERE graph_id = ? AND bucket_ts BETWEEN ? AND ?",
+                    (graph_id, start_ts, end_ts)):
+                rows[level][bucket_ts] = columns
+            headers = self._block_headers(graph_id, start_ts, end_ts)
+
+            result = RollupBucket(self.sketch_accuracy)
+            raw_from = None
+            cursor = start_ts
+            while cursor <= end_ts:
+                piece_end = None
+                for level in reversed(LEVELS):
+                    if bucket_start(level, cursor) != cursor:
+                        continue
+                    next_ts = bucket_end(level, cursor)
+                    if next_ts - 1 > end_ts or not any(
+                            s <= cursor and next_ts - 1 <= e for s, e in intervals):
+                        continue
+                    row = rows[level].get(cursor)
+                    if row is not None:
+                        bucket = RollupBucket.from_row(row)
+                        if bucket.has_sketch != result.has_sketch:
+                            continue
+                        piece_end = next_ts
+                        if raw_from is not None:
+                            self._fold_samples(result, graph_id, raw_from, cursor - 1)
+                            raw_from = None
+                        result.merge(bucket)
+                    else:
+                        # Tercakup tapi tanpa baris rollup = tidak ada sampel
+                        piece_end = next_ts
+                    break
+
+                header = headers.get(cursor)
+                if piece_end is None and header is not None and not result.has_sketch:
+                    day_end = bucket_end("day", cursor)
+                    # Baris tabel samples di hari itu lebih baru dari blok: header tidak berlaku
+                    if day_end - 1 <= end_ts and self._conn.execute(
+                            "SELECT 1 FROM samples WHERE graph_id = ? AND ts BETWEEN ? AND ? LIMIT 1",
+                            (graph_id, cursor, day_end - 1)).fetchone() is None:
+                        piece_end = day_end
+                        if raw_from is not None:
+                            self._fold_samples(result, graph_id, raw_from, cursor - 1)
+                            raw_from = None
+                        result.merge(_header_bucket(header))
+
+                if piece_end is None:
+                    if raw_from is None:
+                        raw_from = cursor
+                    piece_end = min(bucket_end("hour", bucket_start("hour", cursor)), end_ts + 1)
+                cursor = piece_end
+
+            if raw_from is not None:
+                self._fold_samples(result, graph_id, raw_from, end_ts)
+        return result
+
+    def _block_headers(self, graph_id: str, start_ts: int, end_ts: int) -> Dict[int, BlockHeader]:
+        """Header blok dengan awal hari di dalam [start_ts, end_ts] (lock sudah dipegang)"""
+        headers = {}
+        for row in self._conn.execute(
+                "SELECT day_ts, " + ", ".join(BLOCK_COLUMNS) + " FROM blocks "
+                "WHERE graph_id = ? AND day_ts BETWEEN ? AND ?",
+                (graph_id, start_ts, end_ts)):
+            inbound, outbound = row[4:11], row[11:18]
+            headers[row[0]] = BlockHeader(
+                row[1], row[2], row[3],
+                DirectionHeader(*inbound[:3], int(inbound[3]), *inbound[4:]),
+                DirectionHeader(*outbound[:3], int(outbound[3]), *outbound[4:]),
+            )
+        return headers
+
+    def _fold_samples(self, bucket: RollupBucket, graph_id: str, start_ts: int, end_ts: int):
+        """Tambahkan sampel mentah [start_ts, end_ts] ke bucket (lock sudah dipegang)"""
+        for ts, in_val, out_val in self._read_samples(graph_id, start_ts, end_ts):
+            bucket.add(ts, in_val, out_val)
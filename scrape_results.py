@@ -0,0 +1,185 @@
+"""
+Scrape Results Module
+Penampung hasil scraping yang ringkas untuk backfill panjang
+
+Hasil tidak disimpan sebagai list dict (8 key string, datetime, dan 6-8
+string terformat per baris), melainkan array paralel:
+- hari: epoch day (hari sejak 1970-01-01), array 'l'
+- slot: index ke tabel (jam, menit), array 'H'
+- interface: index ke tabel nama interface (+ sheet), array 'H'
+- statistik: 8 float64 per baris sesuai traffic_stats.STAT_KEYS, array 'd'
+
+String terformat (fmt) baru dibuat saat sink membaca key statistik.
+ScrapeRecord adalah view dict-compatible satu baris ([], get, keys,
+items), jadi ExcelWriter.write_all_data dan preview GUI tetap bekerja
+tanpa perubahan.
+"""
+
+from array import array
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import config
+from traffic_stats import STAT_KEYS, active_percentile, fmt
+
+
+# ordinal 1970-01-01 (datetime.toordinal), basis epoch day
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+STAT_COUNT = len(STAT_KEYS)
+_STAT_INDEX = {key: i for i, key in enumerate(STAT_KEYS)}
+
+# Key non-statistik setiap baris (urutan sama seperti dict lama)
+META_KEYS = ("date", "time_hour", "time_minute", "interface", "sheet")
+
+
+class ScrapeRecord(Mapping):
+    """View dict-compatible (Mapping read-only) untuk satu baris ScrapeResults"""
+
+    __slots__ = ('_results', '_index')
+
+    def __init__(self, results: 'ScrapeResults', index: int):
+        self._results = results
+        self._index = index
+
+    def value(self, key: str) -> Optional[float]:
+        """Nilai statistik mentah (float), None jika tidak ada"""
+        val = self._results._stats[self._index * STAT_COUNT + _STAT_INDEX[key]]
+        return None if val != val else val
+
+    def __getitem__(self, key: str):
+        results = self._results
+        i = self._index
+        if key in _STAT_INDEX:
+            if key not in results.stat_keys:
+                raise KeyError(key)
+            return fmt(self.value(key))
+        if key == "date":
+            return datetime.fromordinal(EPOCH_ORDINAL + results._days[i])
+        if key == "time_hour":
+            return results._slot_table[results._slots[i]][0]
+        if key == "time_minute":
+            return results._slot_table[results._slots[i]][1]
+        if key == "interface":
+            return results._interfaces[results._interface_ids[i]]
+        if key == "sheet":
+            return results._sheets[results._interface_ids[i]]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(META_KEYS + self._results.stat_keys)
+
+    def __len__(self) -> int:
+        return len(META_KEYS) + len(self._results.stat_keys)
+
+    def to_dict(self) -> Dict:
+        """Salinan dict biasa (format lama)"""
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"ScrapeRecord({self.to_dict()!r})"
+
+
+class ScrapeResults:
+    """
+    Hasil scraping sebagai array paralel (lihat docstring modul)
+
+    Bisa dipakai seperti list dict: len(), iterasi, results[i], sort(key).
+    """
+
+    def __init__(self, percentile: Optional[bool] = None):
+        """
+        Args:
+            percentile: Sertakan pct_in/pct_out, default sesuai active_percentile()
+        """
+        if percentile is None:
+            percentile = bool(active_percentile())
+        self.stat_keys = tuple(key for key in STAT_KEYS if percentile or not key.startswith("pct_"))
+        self._days = array('l')
+        self._slots = array('H')
+        self._interface_ids = array('H')
+        self._stats = array('d')
+        self._slot_table: List[Tuple[int, int]] = []
+        self._slot_ids: Dict[Tuple[int, int], int] = {}
+        self._interfaces: List[str] = []
+        self._sheets: List[Optional[str]] = []
+        self._interface_index: Dict[str, int] = {}
+        # Label export (tanggal - interface) yang gagal/dibatalkan: barisnya tidak ada di hasil
+        self.failed: List[str] = []
+
+    def _slot_id(self, hour: int, minute: int) -> int:
+        slot = (hour, minute)
+        slot_id = self._slot_ids.get(slot)
+        if slot_id is None:
+            slot_id = self._slot_ids[slot] = len(self._slot_table)
+            self._slot_table.append(slot)
+        return slot_id
+
+    def _interface_id(self, interface: str) -> int:
+        interface_id = self._interface_index.get(interface)
+        if interface_id is None:
+            interface_id = self._interface_index[interface] = len(self._interfaces)
+            self._interfaces.append(interface)
+            self._sheets.append(config.INTERFACE_TO_SHEET.get(interface))
+        return interface_id
+
+    def append(self, date: datetime, hour: int, minute: int, interface: str,
+               values: Sequence[float]):
+        """
+        Tambah satu baris
+
+        Args:
+            date: Tanggal data
+            hour, minute: Slot waktu
+            interface: Nama interface (sheet dari config.INTERFACE_TO_SHEET)
+            values: Nilai statistik mentah sesuai STAT_KEYS (raw=True di traffic_stats)
+        """
+        if len(values) != STAT_COUNT:
+            raise ValueError(f"Butuh {STAT_COUNT} nilai statistik, dapat {len(values)}")
+        self._days.append(date.toordinal() - EPOCH_ORDINAL)
+        self._slots.append(self._slot_id(hour, minute))
+        self._interface_ids.append(self._interface_id(interface))
+        self._stats.extend(values)
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def __getitem__(self, index: int) -> ScrapeRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("index ScrapeResults di luar jangkauan")
+        return ScrapeRecord(self, index)
+
+    def __iter__(self) -> Iterator[ScrapeRecord]:
+        for i in range(len(self)):
+            yield ScrapeRecord(self, i)
+
+    def __eq__(self, other):
+        if not isinstance(other, (ScrapeResults, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def sort(self, key: Optional[Callable] = None, reverse: bool = False):
+        """
+        Urutkan baris di tempat (stabil, seperti list.sort)
+
+        Args:
+            key: Fungsi key untuk ScrapeRecord, default (tanggal, jam, menit)
+            reverse: Urutan turun
+        """
+        if key is None:
+            slot_table = self._slot_table
+            order = sorted(range(len(self)), reverse=reverse,
+                           key=lambda i: (self._days[i], slot_table[self._slots[i]]))
+        else:
+            order = sorted(range(len(self)), reverse=reverse,
+                           key=lambda i: key(ScrapeRecord(self, i)))
+        self._days = array('l', (self._days[i] for i in order))
+        self._slots = array('H', (self._slots[i] for i in order))
+        self._interface_ids = array('H', (self._interface_ids[i] for i in order))
+        stats = self._stats
+        self._stats = array('d')
+        for i in order:
+            self._stats.extend(stats[i * STAT_COUNT:(i + 1) * STAT_COUNT])
@@ -7,13 +7,15 @@ Features:
 - Fallback: Selenium jika diperlukan
 """
 
-import re
 import os
 import json
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable
+from typing import Dict, Iterator, List, Optional, Callable
 from io import StringIO
+from itertools import chain
 import csv as csv_mod
 
 try:
@@ -27,6 +29,21 @@ except ImportError:
     HAS_SELENIUM = False
 
 import config
+from fetch_planner import (BASE_STEP, RraProfiles, day_window, finest_archive, learn_archive,
+                           plan_fetch_windows, regrid_samples)
+from flow_control import AdaptiveLimiter, LatencyRecorder
+from response_cache import ResponseCache, SETTLE_SECONDS
+from sample_store import SampleStore, Sample
+from graph_discovery import (GraphIndex, extract_graph_ids, extract_titles,
+                             match_interface)
+from cacti_auth import SharedLogin
+from day_files import DayFiles, day_writer
+from parse_pool import ParsePool
+from scrape_results import ScrapeResults
+from traffic_stats import (active_percentile, day_slot_stats, slot_window, stats_from_bucket,
+                           stats_from_samples)
+from csv_stream import (DECODE_ERRORS, SchemaCache, iter_file_lines, iter_response_lines,
+                        iter_samples)
 
 
 class CactiScraper:
@@ -42,6 +59,35 @@ class CactiScraper:
         self.driver = None
         self.progress_callback = progress_callback or (lambda msg, pct: None)
         self.attached_to_existing = False
+        
+        # Flow control adaptif per host Cacti (mode cepat)
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._limiters_lock = threading.Lock()
+        
+        # Deadline run (time.monotonic) & latency per request untuk hedging
+        self._run_deadline: Optional[float] = None
+        self._latency = LatencyRecorder()
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Cache disk respons graph_xport (dibuat saat pertama dipakai)
+        self._response_cache: Optional[ResponseCache] = None
+        
+        # Store sampel lokal (SQLite) untuk fetch gap-only
+        self._sample_store: Optional[SampleStore] = None
+        self.store_gap_fetches = 0
+        
+        # File sampel harian (mmap) untuk hari yang sudah pernah diambil
+        self._day_files: Optional[DayFiles] = None
+        self.day_file_hits = 0
+        
+        # Schema header CSV per graph (untuk parser posisi tetap)
+        self._schemas = SchemaCache()
+        
+        # Proses worker parse & statistik (config.PARSE_PROCESSES, per run)
+        self._parse_pool: Optional[ParsePool] = None
+        
+        # Login ulang otomatis tanpa browser (dibuat di _setup_requests_session)
+        self._auth: Optional[SharedLogin] = None
     
     def _update_progress(self, message: str, percentage: int = -1):
         """Update progress via callback"""
@@ -281,10 +327,15 @@ class CactiScraper:
             
             # 2. Cari semua graph ID (wrapper_1234 atau graph_1234)
             page_source = self.driver.page_source
-            # Pattern: id="wrapper_1730" atau id="graph_1503"
-            graph_ids = re.findall(r'id=["\'](?:wrapper|graph)_(\d+)["\']', page_source)
-            # Filter duplicates
-            unique_graph_ids = list(set(graph_ids))
+            unique_graph_ids = extract_graph_ids(page_source)
+            
+            # Jika index discovery masih berlaku, cukup ambil graph target
+            # (tidak perlu download CSV graph lain hanya untuk cek judul)
+            index = self._load_graph_index()
+            if index is not None:
+                target_ids = set(index.interfaces().values())
+                if target_ids & set(unique_graph_ids):
+                    unique_graph_ids = [gid for gid in unique_graph_ids if gid in target_ids]
             
             # Quiet log
             # self._update_progress(f"Found {len(unique_graph_ids)} graphs: {unique_graph_ids}", -1)
@@ -310,30 +361,37 @@ class CactiScraper:
                 if graph_id in processed_ids:
                     continue
                 
-                # Pass timestamp ke fungsi get_csv
-                csv_data = self._get_csv_data(session, graph_id, start_ts, end_ts)
-                if not csv_data:
+                # Pass timestamp ke stream CSV
+                meta = {}
+                stream = self._open_sample_stream(session, graph_id, start_ts, end_ts, 0, meta)
+                if stream is None:
+                    continue
+                
+                # Baca preamble (+ sampel pertama) dulu untuk mendapatkan Title
+                try:
+                    first = next(stream, None)
+                except Exception as e:
+                    self._update_progress(f"Error parsing CSV ID {graph_id}: {str(e)}", -1)
                     continue
                 
                 # Cek Title untuk mapping ke interface name
                 # Contoh Title: "Router BGP Ngawi - Traffic - ether2-LocalNet"
-                title = csv_data.get("title", "")
+                title = meta.get("title", "")
                 
-                matched_interface = None
-                for interface_key in config.INTERFACE_TO_SHEET.keys():
-                    # Case insensitive check
-                    if interface_key.lower() in title.lower():
-                        matched_interface = interface_key
-                        break
+                matched_interface = match_interface(title)
                 
                 if matched_interface:
-                    stats = self._calculate_stats_from_csv(csv_data['rows'], csv_data['header'])
+                    try:
+                        stats = stats_from_samples(stream if first is None else chain([first], stream))
+                    except Exception as e:
+                        self._update_progress(f"Error parsing CSV ID {graph_id}: {str(e)}", -1)
+                        continue
                     result[matched_interface] = stats
                     self._update_progress(f"✓ Data {matched_interface} berhasil diambil")
                     processed_ids.add(graph_id)
                 else:
                     # Graph ini bukan target kita (misal CPU usage, dll)
-                    pass
+                    stream.close()
 
             # Isi None untuk interface yang tidak ditemukan
             for interface_name in config.INTERFACE_TO_SHEET.keys():
@@ -348,10 +406,175 @@ class CactiScraper:
         
         return result
 
-    def _get_csv_data(self, session, graph_id: str, start_ts: int = 0, end_ts: int = 0) -> Optional[Dict]:
-        """Download dan parse CSV dari Cacti"""
-        import csv
-        from io import StringIO
+    def _get_limiter(self, host: str) -> AdaptiveLimiter:
+        """Ambil (atau buat) limiter untuk host Cacti"""
+        with self._limiters_lock:
+            if host not in self._limiters:
+                self._limiters[host] = AdaptiveLimiter(
+                    initial=config.FETCH_WORKERS_INITIAL,
+                    maximum=int(config.FETCH_WORKERS),
+                    slow_factor=config.SLOW_RESPONSE_FACTOR,
+                )
+            return self._limiters[host]
+
+    def _deadline_remaining(self) -> Optional[float]:
+        """Sisa waktu sebelum deadline run (detik), None jika tanpa deadline"""
+        if self._run_deadline is None:
+            return None
+        return self._run_deadline - time.monotonic()
+
+    def _request_timeout(self):
+        """Timeout (connect, read) untuk satu request, dipotong oleh deadline run"""
+        connect = config.REQUEST_CONNECT_TIMEOUT
+        read = config.REQUEST_READ_TIMEOUT
+        remaining = self._deadline_remaining()
+        if remaining is not None:
+            if remaining <= 0:
+                raise TimeoutError("Batas waktu run terlampaui (RUN_DEADLINE)")
+            connect = min(connect, remaining)
+            read = min(read, remaining)
+        return (connect, read)
+
+    def _limited_get(self, session, url: str, stream: bool = False):
+        """
+        session.get dengan timeout, flow control adaptif, hedging (jika aktif),
+        dan login ulang otomatis jika diarahkan ke halaman login
+
+        Args:
+            stream: True = body dibaca belakangan (iter_content), caller wajib close()
+        """
+        generation = self._auth.generation if self._auth else 0
+        resp = self._send_get(session, url, stream)
+        
+        # Session expired di tengah run: satu login ulang untuk semua worker, lalu ulangi
+        if self._auth and self._is_login_response(resp) and self._auth.available():
+            resp.close()
+            if self._auth.relogin(session, generation):
+                resp = self._send_get(session, url, stream)
+        return resp
+
+    def _send_get(self, session, url: str, stream: bool = False):
+        """Satu GET (dengan hedging jika aktif), timeout dihitung ulang dari deadline"""
+        timeout = self._request_timeout()
+        if config.HEDGE_REQUESTS:
+            return self._hedged_get(session, url, timeout, stream)
+        return self._timed_get(session, url, timeout, stream)
+
+    def _timed_get(self, session, url: str, timeout, stream: bool = False):
+        """
+        Satu percobaan GET: lewat limiter per host dan catat latency-nya.
+        Untuk stream=True, latency & slot limiter dihitung sampai header
+        diterima (Cacti sudah selesai menjalankan rrdtool xport).
+        """
+        from urllib.parse import urlparse
+        
+        limiter = None
+        if config.ADAPTIVE_CONCURRENCY:
+            limiter = self._get_limiter(urlparse(url).netloc)
+            started = limiter.acquire(timeout=self._deadline_remaining())
+            if started is None:
+                raise TimeoutError("Batas waktu run terlampaui saat menunggu slot request")
+        else:
+            started = time.monotonic()
+        
+        ok = False
+        try:
+            resp = session.get(url, verify=False, timeout=timeout, stream=stream)
+            ok = resp.status_code == 200 and 'auth_login.php' not in resp.url
+            self._latency.record(time.monotonic() - started)
+            return resp
+        finally:
+            if limiter:
+                limiter.release(started, ok, self._request_class(url))
+
+    @staticmethod
+    def _request_class(url: str) -> str:
+        """
+        Kelas request untuk baseline latency limiter: nama halaman, plus
+        lebar jendela (hari) dan rra_id untuk export graph_xport
+        """
+        from urllib.parse import parse_qs, urlparse
+        
+        parsed = urlparse(url)
+        page = parsed.path.rsplit('/', 1)[-1]
+        query = parse_qs(parsed.query)
+        try:
+            span = int(query['graph_end'][0]) - int(query['graph_start'][0])
+        except (KeyError, ValueError):
+            return page
+        days = -(-span // 86400)
+        return f"{page}:{days}d:rra{query.get('rra_id', ['0'])[0]}"
+
+    def _hedged_get(self, session, url: str, timeout, stream: bool = False):
+        """
+        GET dengan hedging: jika request melewati latency persentil
+        config.HEDGE_PERCENTILE, kirim duplikat dan pakai yang selesai duluan
+        """
+        with self._limiters_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=2 * max(1, int(config.FETCH_WORKERS)))
+            pool = self._hedge_pool
+        
+        primary = pool.submit(self._timed_get, session, url, timeout, stream)
+        
+        threshold = None
+        if self._latency.count() >= config.HEDGE_MIN_SAMPLES:
+            threshold = self._latency.percentile(config.HEDGE_PERCENTILE)
+        if threshold is None:
+            return primary.result()
+        
+        done, _ = wait([primary], timeout=threshold)
+        if done:
+            return primary.result()
+        
+        self._latency.add_hedge()
+        pending = {primary, pool.submit(self._timed_get, session, url, timeout, stream)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    resp = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                # Respons yang kalah tetap ditutup agar koneksi kembali ke pool
+                for loser in pending:
+                    loser.add_done_callback(self._close_response)
+                return resp
+        raise error
+
+    @staticmethod
+    def _close_response(future):
+        """Callback: tutup respons hasil request hedge yang tidak dipakai"""
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def fetch_stats(self) -> Dict[str, Dict]:
+        """Statistik flow control per host: batas in-flight terpilih & latency"""
+        with self._limiters_lock:
+            return {host: limiter.snapshot() for host, limiter in self._limiters.items()}
+
+    def latency_stats(self) -> Dict:
+        """Latency per request yang tercatat (p50/p95) dan jumlah hedge"""
+        return self._latency.snapshot()
+
+    def _get_response_cache(self) -> Optional[ResponseCache]:
+        """Cache disk respons graph_xport (None jika dimatikan di config)"""
+        if not config.RESPONSE_CACHE:
+            return None
+        with self._limiters_lock:
+            if self._response_cache is None:
+                cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.RESPONSE_CACHE_DIR)
+                self._response_cache = ResponseCache(
+                    cache_dir,
+                    max_bytes=int(config.RESPONSE_CACHE_MAX_MB * 1024 * 1024),
+                    recent_ttl=config.RESPONSE_CACHE_RECENT_TTL,
+                )
+            return self._response_cache
+
+    def _xport_url(self, graph_id: str, start_ts: int = 0, end_ts: int = 0, rra_id: int = 0) -> str:
+        """URL graph_xport.php untuk graph & rentang waktu tertentu"""
         from urllib.parse import urlparse
         
         # Parse Base URL untuk membuang query params yang ada di config.CACTI_URL
@@ -363,63 +586,141 @@ class CactiScraper:
         
         # Construct clean URL
         # rra_id=0 = auto-select (Cacti pilih resolusi terbaik sesuai time range)
-        url = f"{xport_url}?local_graph_id={graph_id}&rra_id=0&view_type=tree"
+        url = f"{xport_url}?local_graph_id={graph_id}&rra_id={rra_id}&view_type=tree"
         
         # Append specific time range if provided
         if start_ts > 0 and end_ts > 0:
             url += f"&graph_start={start_ts}&graph_end={end_ts}"
         
-        # self._update_progress(f"    [DEBUG] URL: {url}", -1)
+        return url
+
+    def _check_response(self, resp, graph_id: str) -> bool:
+        """Cek respons graph_xport: status 200 dan bukan redirect ke halaman login"""
+        if resp.status_code != 200:
+            self._update_progress(f"Gagal download CSV ID {graph_id}: Status {resp.status_code}", -1)
+            return False
+        if 'auth_login.php' in resp.url:
+            self._update_progress(f"Gagal download CSV ID {graph_id}: Cookie expired (redirect ke login)", -1)
+            self._invalidate_session_check()
+            return False
+        return True
+
+    def _open_sample_stream(self, session, graph_id: str, start_ts: int, end_ts: int,
+                            rra_id: int, meta: Dict) -> Optional[Iterator[Sample]]:
+        """
+        Buka export graph_xport sebagai stream sampel (ts, in, out)
+
+        Respons dibaca per chunk dan langsung diparse, jadi memori tetap
+        walau jendelanya panjang. Jika cache aktif, baris respons ikut
+        ditulis ke file cache selama streaming.
+
+        Args:
+            meta: Diisi 'title' dan 'header' saat preamble CSV terbaca
+
+        Returns:
+            Iterator sampel, atau None jika request gagal
+        """
+        import requests as req
+        from urllib.parse import urlparse
+        
+        url = self._xport_url(graph_id, start_ts, end_ts, rra_id)
+        # Cache hanya untuk jendela waktu eksplisit
+        cache = self._get_response_cache() if start_ts > 0 and end_ts > 0 else None
+        cache_key = ResponseCache.make_key(urlparse(url).netloc, graph_id, start_ts, end_ts, rra_id)
+        
+        cached_path = cache.get_path(cache_key) if cache else None
+        if cached_path:
+            try:
+                f = open(cached_path, 'r', encoding='utf-8')
+            except IOError:
+                cached_path = None
+            else:
+                return self._iter_cached_samples(f, meta, graph_id)
         
         try:
-            resp = session.get(url, verify=False)
-            if resp.status_code != 200:
-                self._update_progress(f"Gagal download CSV ID {graph_id}: Status {resp.status_code}", -1)
-                return None
-            
-            # Parse CSV Content
-            content = resp.text
-            # Strip BOM (Byte Order Mark) jika ada
-            if content.startswith('\ufeff'):
-                content = content[1:]
-            
-            f = StringIO(content)
-            reader = csv.reader(f)
-            
-            metadata = {}
-            rows = []
-            
-            reading_data = False
-            header_row = None
-            
-            for row in reader:
-                if not row:
-                    continue
-                
-                # Handle "Title" with potential BOM
-                if len(row) >= 2 and "Title" in row[0]:
-                    metadata['title'] = row[1]
-                
-                if row[0] == "Date":
-                    reading_data = True
-                    header_row = row
-                    continue
-                
-                if reading_data:
-                    rows.append(row)
-            
-            return {
-                "title": metadata.get('title', ''),
-                "header": header_row,
-                "rows": rows
-            }
-            
-        except Exception as e:
-            self._update_progress(f"Error parsing CSV ID {graph_id}: {str(e)}", -1)
+            resp = self._limited_get(session, url, stream=True)
+        except (TimeoutError, req.Timeout) as e:
+            self._update_progress(f"Timeout download CSV ID {graph_id}: {str(e)}", -1)
+            return None
+        except req.RequestException as e:
+            # Koneksi putus / error HTTP: lewati graph ini saja
+            self._update_progress(f"Gagal download CSV ID {graph_id}: {str(e)}", -1)
+            return None
+        
+        if not self._check_response(resp, graph_id):
+            resp.close()
             return None
+        
+        return self._iter_response_samples(resp, meta, graph_id, cache, cache_key, end_ts)
+
+    def _iter_cached_samples(self, f, meta: Dict, graph_id: str) -> Iterator[Sample]:
+        """Sampel dari file cache (file ditutup setelah selesai)"""
+        with f:
+            yield from iter_samples(iter_file_lines(f), meta, self._schemas, graph_id)
+
+    def _iter_response_samples(self, resp, meta: Dict, graph_id: str, cache: Optional[ResponseCache],
+                               cache_key: str, end_ts: int) -> Iterator[Sample]:
+        """
+        Sampel dari respons HTTP streaming, sekaligus ditulis ke cache (jika aktif)
+
+        Cache hanya optimasi: jika file cache tidak bisa ditulis (disk penuh,
+        izin), peringatan dicatat dan respons tetap diparse tanpa cache.
+        """
+        lines = iter_response_lines(resp, config.STREAM_CHUNK_SIZE)
+        tmp_path = tmp_file = None
+        if cache:
+            try:
+                tmp_path = cache.temp_path()
+                tmp_file = open(tmp_path, 'w', encoding='utf-8', newline='')
+            except OSError as e:
+                self._cache_write_failed(graph_id, e)
+        
+        def tee(lines):
+            nonlocal tmp_file
+            for line in lines:
+                if tmp_file is not None:
+                    try:
+                        tmp_file.write(line + '\r\n')
+                    except OSError as e:
+                        self._cache_write_failed(graph_id, e)
+                        self._discard_temp(tmp_file, tmp_path)
+                        tmp_file = None
+                yield line
+        
+        completed = False
+        try:
+            yield from iter_samples(tee(lines) if tmp_file else lines, meta, self._schemas, graph_id)
+            completed = True
+        finally:
+            resp.close()
+            if tmp_file is not None:
+                # Simpan ke cache hanya jika stream selesai dan benar-benar CSV export
+                if completed and meta.get('header'):
+                    try:
+                        tmp_file.close()
+                        cache.put_file(cache_key, tmp_path, end_ts)
+                    except OSError as e:
+                        self._cache_write_failed(graph_id, e)
+                        self._discard_temp(tmp_file, tmp_path)
+                else:
+                    self._discard_temp(tmp_file, tmp_path)
+
+    def _cache_write_failed(self, graph_id: str, error: OSError):
+        """Catat cache respons yang gagal ditulis (fetch tetap lanjut tanpa cache)"""
+        self._update_progress(f"⚠ Cache respons graph {graph_id} tidak bisa ditulis: {error}", -1)
+
+    @staticmethod
+    def _discard_temp(tmp_file, tmp_path: str):
+        """Tutup & hapus file cache sementara; error diabaikan"""
+        try:
+            tmp_file.close()
+        except OSError:
+            pass
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
 
-    # (old duplicate _calculate_stats_from_csv removed - active version is below)
-    
     def scrape_date_range(self, start_date: datetime, end_date: datetime) -> List[Dict]:
         """
         Scrape data untuk range tanggal
@@ -464,12 +765,10 @@ class CactiScraper:
                 # Cacti butuh Unix timestamp
                 # Strategi: 00:00 sampai jam target (per-slot)
                 # 09:00 slot → 00:00-09:05, 16:00 slot → 00:00-16:05
+                # (atau SLOT_WINDOW_MINUTES sebelum jam target, jika diisi)
+                # +5 menit buffer agar data jam target masuk
                 # Nilai Current/Average/Maximum dihitung sesuai range slot
-                from_dt = current_date.replace(hour=0, minute=0, second=0)
-                to_dt = current_date.replace(hour=hour, minute=minute, second=0)
-                
-                start_ts = int(from_dt.timestamp())
-                end_ts = int(to_dt.timestamp()) + 300  # +5 menit buffer agar data jam target masuk
+                start_ts, end_ts = slot_window(current_date, hour, minute)
                 
                 time.sleep(config.ACTION_DELAY)
                 
@@ -493,96 +792,336 @@ class CactiScraper:
         self._update_progress(f"Selesai mengambil {len(all_data)} data!", 85)
         return all_data
 
-    def _calculate_stats_from_csv(self, rows: List[List[str]], header: List[str]) -> Dict:
+    def _store_slot_stats(self, store: SampleStore, graph_id: str, date: datetime) -> Dict:
         """
-        Hitung statistik (Current/Avg/Max) dari data mentah CSV
-        
+        Hitung statistik setiap TIME_SLOT untuk satu tanggal dari store lokal
+
+        Jam-jam utuh di jendela slot dibaca dari rollup per jam/hari/bulan,
+        hanya ujung jendela yang dihitung dari sampel mentah.
+
         Args:
-           rows: List of data rows
-           header: Header row (untuk deteksi kolom)
-        """
-        if not rows or not header:
-             return None
-
-        # 1. Deteksi Kolom In/Out
-        idx_in = -1
-        idx_out = -1
-        
-        # Cari kolom dengan kata kunci (biasanya "Traffic - In" atau "Inbound")
-        for i, col in enumerate(header):
-            col_lower = col.lower()
-            if "traffic_in" in col_lower or "inbound" in col_lower:
-                idx_in = i
-            elif "traffic_out" in col_lower or "outbound" in col_lower:
-                idx_out = i
-        
-        # Fallback jika tidak menemukan nama spesifik (Cacti standard: 1=In, 2=Out, atau 1=In, 3=Out)
-        # Ingat kolom 0 adalah Date
-        if idx_in == -1 and len(header) > 1: idx_in = 1
-        if idx_out == -1 and len(header) > 2: 
-            # Jika kolom 2 sepertinya bukan duplicate dari In (kadang format In, In_d, Out...)
-            idx_out = 2 if len(header) == 3 else 3
-            if idx_out >= len(header): idx_out = -1
-
-        in_values = []
-        out_values = []
-        
-        for row in rows:
+            store: Store sampel lokal (sudah tersinkron untuk tanggal ini)
+            graph_id: Local graph id Cacti
+            date: Tanggal data
+
+        Returns:
+            Dictionary {(jam, menit): nilai STAT_KEYS}
+        """
+        result = {}
+        for hour, minute in config.TIME_SLOTS:
+            stats = stats_from_bucket(store.window_bucket(graph_id, *slot_window(date, hour, minute)),
+                                      raw=True)
+            if stats:
+                result[(hour, minute)] = stats
+        return result
+
+    def _stream_slot_stats(self, session, graph_id: str, window) -> Optional[Dict]:
+        """
+        Export satu jendela (bisa multi-hari) secara streaming dan hitung
+        statistik per hari & slot. Sampel langsung masuk akumulator, tidak
+        ada list sampel yang ditahan di memori.
+
+        Returns:
+            Dictionary {tanggal: {(jam, menit): nilai STAT_KEYS}}, None jika gagal
+        """
+        import requests as req
+        
+        meta = {}
+        stream = self._open_sample_stream(session, graph_id, window.start_ts, window.end_ts,
+                                          window.rra_id, meta)
+        if stream is None:
+            return None
+        # Baris arsip kasar -> sampel 5 menit berbobot waktu
+        stream = regrid_samples(stream, meta, window.step)
+        
+        day_files = self._get_day_files()
+        on_day = None
+        if day_files is not None:
+            on_day = day_writer(day_files, graph_id, window.end_ts,
+                                int(time.time()) - SETTLE_SECONDS, window.step,
+                                lambda msg: self._update_progress(msg, -1))
+        try:
+            return day_slot_stats(stream, window.days, config.TIME_SLOTS, raw=True, on_day=on_day)
+        except (req.RequestException,) + DECODE_ERRORS as e:
+            # Koneksi putus / isi rusak di tengah stream: graph ini saja yang gagal
+            self._update_progress(f"Error parsing CSV ID {graph_id}: {str(e)}", -1)
+            return None
+
+    def _pool_slot_stats(self, session, graph_id: str, window) -> Optional[Dict]:
+        """
+        Seperti _stream_slot_stats, tapi decode & statistik di ParsePool
+
+        Thread ini hanya mengunduh isi respons (atau membaca cache) lalu
+        menunggu hasil dari proses worker. Isi satu export ditahan utuh di
+        memori selama diproses.
+
+        Returns:
+            Dictionary {tanggal: {(jam, menit): nilai STAT_KEYS}}, None jika gagal
+        """
+        import requests as req
+        from urllib.parse import urlparse
+        
+        url = self._xport_url(graph_id, window.start_ts, window.end_ts, window.rra_id)
+        cache = self._get_response_cache()
+        cache_key = ResponseCache.make_key(urlparse(url).netloc, graph_id, window.start_ts,
+                                           window.end_ts, window.rra_id)
+        
+        data = None
+        encoding = 'utf-8'
+        cached_path = cache.get_path(cache_key) if cache else None
+        if cached_path:
             try:
-                # Parse In
-                if idx_in != -1 and idx_in < len(row):
-                    val = row[idx_in]
-                    if val and val != 'NaN':
-                        # Cacti CSV exports bits/sec in this setup (confirmed by user data magnitude)
-                        in_values.append(float(val)) 
-                    elif val == 'NaN':
-                        in_values.append(0.0) 
-                
-                # Parse Out
-                if idx_out != -1 and idx_out < len(row):
-                    val = row[idx_out]
-                    if val and val != 'NaN':
-                        out_values.append(float(val))
-                    elif val == 'NaN':
-                        out_values.append(0.0)
-                    val = row[idx_out]
-                    if val and val != 'NaN':
-                        out_values.append(float(val))
-            except ValueError:
-                continue
-                
-        # Helper format
-        def fmt(val):
-            if val is None: return "0.00"
-            abs_val = abs(val)
-            if abs_val >= 1e9:   return f"{val/1e9:.2f} G"
-            elif abs_val >= 1e6: return f"{val/1e6:.2f} M"
-            elif abs_val >= 1e3: return f"{val/1e3:.2f} K"
-            else:                return f"{val:.2f}"
-
-        # Calculate Stats (Current = Last, Avg = Mean, Max = Peak)
-        curr_in = in_values[-1] if in_values else 0
-        curr_out = out_values[-1] if out_values else 0
-        
-        avg_in = sum(in_values) / len(in_values) if in_values else 0
-        avg_out = sum(out_values) / len(out_values) if out_values else 0
-        
-        max_in = max(in_values) if in_values else 0
-        max_out = max(out_values) if out_values else 0
-        
-        return {
-            "curr_in": fmt(curr_in),
-            "avg_in": fmt(avg_in),
-            "max_in": fmt(max_in),
-            "curr_out": fmt(curr_out),
-            "avg_out": fmt(avg_out),
-            "max_out": fmt(max_out),
-        }
+                with open(cached_path, 'rb') as f:
+                    data = f.read()
+            except IOError:
+                data = None
+        
+        fresh = data is None
+        if fresh:
+            try:
+                resp = self._limited_get(session, url, stream=True)
+            except (TimeoutError, req.Timeout) as e:
+                self._update_progress(f"Timeout download CSV ID {graph_id}: {str(e)}", -1)
+                return None
+            except req.RequestException as e:
+                self._update_progress(f"Gagal download CSV ID {graph_id}: {str(e)}", -1)
+                return None
+            if not self._check_response(resp, graph_id):
+                resp.close()
+                return None
+            try:
+                data = b''.join(resp.iter_content(config.STREAM_CHUNK_SIZE))
+            except req.RequestException as e:
+                # Koneksi putus di tengah respons (ChunkedEncodingError, dll)
+                self._update_progress(f"Gagal download CSV ID {graph_id}: {str(e)}", -1)
+                return None
+            finally:
+                resp.close()
+            encoding = resp.encoding
+        
+        day_files = self._get_day_files()
+        try:
+            result, meta = self._parse_pool.submit(
+                data, encoding, graph_id, window, day_files.directory if day_files else None
+            ).result()
+        except DECODE_ERRORS as e:
+            self._update_progress(f"Error parsing CSV ID {graph_id}: {str(e)}", -1)
+            return None
+        for warning in meta.get('warnings', ()):
+            self._update_progress(warning, -1)
+        
+        # Simpan ke cache hanya jika benar-benar CSV export
+        if fresh and cache and meta.get('header'):
+            text = data.decode(encoding or 'utf-8', errors='replace')
+            try:
+                cache.put(cache_key, text[1:] if text.startswith('\ufeff') else text, window.end_ts)
+            except OSError as e:
+                self._cache_write_failed(graph_id, e)
+        return result
+
+    def _start_parse_pool(self) -> Optional[ParsePool]:
+        """ParsePool sesuai config.PARSE_PROCESSES (None = parse di thread fetch)"""
+        processes = int(config.PARSE_PROCESSES or 0)
+        if processes <= 0:
+            return None
+        try:
+            pool = ParsePool(processes)
+        except (OSError, NotImplementedError) as e:
+            self._update_progress(f"⚠ Proses worker tidak bisa dibuat, parse di thread: {str(e)}", -1)
+            return None
+        self._update_progress(f"⚙ {processes} proses worker untuk parse & statistik", -1)
+        return pool
+
+    def _rra_profiles(self, session, graph_ids: Dict[str, str], dates: List[datetime]) -> Dict[str, List]:
+        """
+        Arsip RRA (rra_id, step, retensi) per graph untuk planner
+
+        Hanya dipelajari jika ada tanggal di luar retensi arsip terhalus
+        (config.RRA_ARCHIVES); hasil probe disimpan di RRA_PROFILE_FILE
+        sehingga setiap graph cukup di-probe sekali per RRA_PROFILE_TTL.
+
+        Returns:
+            Dictionary {graph_id: arsip}, graph yang tidak ada memakai config
+        """
+        now_ts = int(time.time())
+        if not config.RRA_LEARN or not dates:
+            return {}
+        if day_window(dates[0])[0] >= now_ts - finest_archive()[2]:
+            return {}
+        
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.RRA_PROFILE_FILE)
+        profiles = RraProfiles(path, config.RRA_PROFILE_TTL)
+        result = {}
+        learned = False
+        for interface_name, graph_id in graph_ids.items():
+            archives = profiles.get(graph_id)
+            if archives is None:
+                self._update_progress(f"📐 Mempelajari arsip RRA {interface_name} (sekali)...", -1)
+                archives = self._learn_rra_profile(session, graph_id, now_ts)
+                profiles.update(graph_id, archives)
+                learned = True
+            result[graph_id] = archives
+        if learned:
+            try:
+                profiles.save()
+            except IOError as e:
+                self._update_progress(f"⚠ Gagal menyimpan profil RRA: {str(e)}", -1)
+        return result
+
+    def _learn_rra_profile(self, session, graph_id: str, now_ts: int) -> List:
+        """
+        Probe setiap arsip config.RRA_ARCHIVES dengan jendela 2x retensinya
+
+        Step dibaca dari export (preamble "Step" atau kolom Date), retensi
+        dari baris valid paling lama. Arsip yang gagal di-probe memakai
+        nilai config.
+        """
+        archives = []
+        for rra_id, step, retention in config.RRA_ARCHIVES:
+            meta = {}
+            stream = self._open_sample_stream(session, graph_id, now_ts - 2 * retention, now_ts,
+                                              rra_id, meta)
+            learned = None
+            if stream is not None:
+                try:
+                    learned = learn_archive(stream, now_ts, meta)
+                except Exception as e:
+                    self._update_progress(f"⚠ Probe arsip RRA {rra_id} graph {graph_id} gagal: {str(e)}", -1)
+            archives.append((rra_id, *learned) if learned else (rra_id, step, retention))
+        return archives
+
+    def _get_day_files(self) -> Optional[DayFiles]:
+        """File sampel harian per server Cacti (None jika dimatikan di config)"""
+        from urllib.parse import urlparse
+        
+        if not config.DAY_FILES:
+            return None
+        with self._limiters_lock:
+            if self._day_files is None:
+                host = urlparse(config.CACTI_URL).netloc.replace(':', '_')
+                self._day_files = DayFiles(os.path.join(
+                    os.path.dirname(os.path.abspath(__file__)), config.DAY_FILES_DIR, host))
+            return self._day_files
+
+    def _get_sample_store(self) -> Optional[SampleStore]:
+        """Store sampel lokal (None jika dimatikan di config)"""
+        if not config.SAMPLE_STORE:
+            return None
+        with self._limiters_lock:
+            if self._sample_store is None:
+                db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.SAMPLE_STORE_FILE)
+                sketch_accuracy = config.PERCENTILE_ACCURACY if active_percentile() else None
+                self._sample_store = SampleStore(db_path, sketch_accuracy)
+            return self._sample_store
+
+    def _sync_store(self, session, store: SampleStore, graph_id: str, window) -> bool:
+        """
+        Ambil dari Cacti hanya bagian jendela yang belum ada di store
+
+        Returns:
+            True jika semua gap berhasil diambil (atau tidak ada gap)
+        """
+        # Data dekat waktu sekarang belum final: simpan sampelnya, tapi
+        # jangan tandai tercakup agar run berikutnya mengambil ulang
+        import requests as req
+        
+        settled_ts = int(time.time()) - SETTLE_SECONDS
+        
+        for gap_start, gap_end in store.missing_ranges(graph_id, window.start_ts, window.end_ts):
+            # Mundur satu step agar sampel tepat di batas gap ikut terambil
+            meta = {}
+            stream = self._open_sample_stream(session, graph_id, gap_start - 300, gap_end,
+                                              window.rra_id, meta)
+            if stream is None:
+                return False
+            # Gap diparse di luar lock store, lalu disimpan dalam satu transaksi
+            try:
+                store.add_samples(graph_id, stream, gap_start, min(gap_end, settled_ts))
+            except (req.RequestException,) + DECODE_ERRORS as e:
+                # Belum ada yang disimpan, gap diambil ulang run berikutnya
+                self._update_progress(f"Error parsing CSV ID {graph_id}: {str(e)}", -1)
+                return False
+            if not meta.get('header'):
+                return False
+            with self._limiters_lock:
+                self.store_gap_fetches += 1
+        return True
 
     # ================================================================
     # MODE CEPAT: Requests only (tanpa Selenium)
     # ================================================================
     
+    def _load_graph_index(self) -> Optional[GraphIndex]:
+        """Index discovery graph yang masih berlaku (None jika tidak ada/expired/dimatikan)"""
+        if not config.GRAPH_DISCOVERY:
+            return None
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.GRAPH_INDEX_FILE)
+        index = GraphIndex(path, config.GRAPH_INDEX_TTL)
+        return index if index.load() else None
+
+    def _discover_graphs(self, session) -> GraphIndex:
+        """
+        Discovery graph: ambil halaman tree Cacti sekali, kumpulkan semua
+        id wrapper_/graph_ beserta judulnya, lalu simpan index-nya
+        """
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.GRAPH_INDEX_FILE)
+        index = GraphIndex(path, config.GRAPH_INDEX_TTL)
+        
+        self._update_progress("🔎 Discovery graph dari halaman tree Cacti...", 12)
+        resp = self._limited_get(session, config.CACTI_URL)
+        if resp.status_code != 200 or 'auth_login.php' in resp.url:
+            raise ConnectionError(f"Halaman tree Cacti tidak bisa dibuka (status {resp.status_code})")
+        
+        graph_ids = extract_graph_ids(resp.text)
+        titles = extract_titles(resp.text)
+        
+        # Judul yang tidak ada di halaman: ambil dari baris Title CSV (jendela kecil)
+        missing = [gid for gid in graph_ids if gid not in titles]
+        if missing:
+            end_ts = int(time.time())
+            
+            def fetch_title(graph_id):
+                meta = {}
+                stream = self._open_sample_stream(session, graph_id, end_ts - 600, end_ts, 0, meta)
+                if stream is not None:
+                    for _ in stream:
+                        pass
+                return meta.get('title')
+            
+            for graph_id, title in zip(missing, self._fetch_parallel(
+                    missing, fetch_title, lambda gid: f"Judul graph {gid}", 12, 3)):
+                if title:
+                    titles[graph_id] = title
+        
+        index.update({gid: titles[gid] for gid in graph_ids if gid in titles})
+        index.save()
+        self._update_progress(
+            f"🔎 Discovery: {len(index.graphs)} graph, {len(index.interfaces())} interface cocok", -1
+        )
+        return index
+
+    def _resolve_graph_ids(self, session) -> Dict[str, str]:
+        """
+        Mapping interface -> graph id untuk mode cepat
+
+        Index discovery (dibuat ulang jika expired) dipakai untuk semua
+        interface di INTERFACE_TO_SHEET; config.GRAPH_IDS tetap menang
+        sebagai override manual.
+        """
+        graph_ids = {}
+        if config.GRAPH_DISCOVERY:
+            index = self._load_graph_index()
+            if index is None:
+                try:
+                    index = self._discover_graphs(session)
+                except Exception as e:
+                    self._update_progress(f"⚠ Discovery graph gagal, pakai GRAPH_IDS: {str(e)}", -1)
+            if index is not None:
+                graph_ids = index.interfaces()
+        
+        graph_ids.update(config.GRAPH_IDS)
+        return graph_ids
+
     def _setup_requests_session(self):
         """Setup requests session dari cookies file (tanpa Selenium)"""
         import requests as req
@@ -592,16 +1131,25 @@ class CactiScraper:
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
         cookies_file = os.path.join(os.path.dirname(__file__), "cacti_cookies.json")
-        if not os.path.exists(cookies_file):
+        self._auth = SharedLogin(cookies_file, self.progress_callback)
+        
+        if os.path.exists(cookies_file):
+            with open(cookies_file) as f:
+                cookies = json.load(f)
+        elif self._auth.available():
+            cookies = []  # Login otomatis di bawah
+        else:
             raise FileNotFoundError(
                 "cacti_cookies.json tidak ditemukan! "
                 "Jalankan setup_session.py dulu untuk login ke Cacti."
             )
         
-        with open(cookies_file) as f:
-            cookies = json.load(f)
-        
         session = req.Session()
+        # Pool koneksi cukup besar untuk semua worker paralel (keep-alive dipakai ulang)
+        pool_size = max(1, int(config.FETCH_WORKERS))
+        adapter = req.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
         for c in cookies:
             session.cookies.set(c['name'], c['value'], domain=c.get('domain'))
         
@@ -610,104 +1158,349 @@ class CactiScraper:
             'Referer': config.CACTI_URL,
         })
         
-        # Test koneksi
+        # Test koneksi: pakai hasil cek sebelumnya jika masih dalam TTL
         from urllib.parse import urlparse
         parsed = urlparse(config.CACTI_URL)
-        test_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        
+        check_key = self._session_check_key(cookies)
+        if cookies and self._session_check_valid(check_key):
+            self._update_progress("✓ Session Cacti masih valid (cek terakhir di-cache, mode cepat)")
+            return session
         
         try:
-            resp = session.get(test_url, verify=False, timeout=10)
-            if resp.status_code != 200 or 'login' in resp.url.lower():
-                raise ConnectionError(
-                    "Cookie expired! Jalankan setup_session.py untuk login ulang."
-                )
-        except req.ConnectionError:
+            valid = bool(cookies) and self._probe_session(session)
+            if not valid and self._auth.relogin(session, self._auth.generation):
+                valid = self._probe_session(session)
+        except (req.ConnectionError, req.Timeout):
             raise ConnectionError(
                 f"Tidak bisa terhubung ke {parsed.netloc}. Pastikan VPN/jaringan kantor aktif."
             )
+        if not valid:
+            raise ConnectionError(
+                "Cookie expired! Jalankan setup_session.py untuk login ulang."
+            )
         
+        if self._auth.generation:
+            # Cookies baru dari login otomatis
+            with open(cookies_file) as f:
+                check_key = self._session_check_key(json.load(f))
+        self._save_session_check(check_key)
         self._update_progress("✓ Koneksi ke Cacti berhasil (mode cepat, tanpa browser)")
         return session
 
-    def scrape_date_range_fast(self, start_date: datetime, end_date: datetime) -> List[Dict]:
+    @staticmethod
+    def _is_login_response(resp) -> bool:
+        """True jika respons adalah (redirect ke) halaman login Cacti"""
+        return 'login' in resp.url.lower()
+
+    def _probe_session(self, session) -> bool:
+        """
+        Cek session dengan request ringan
+
+        Halaman graph_view.php merender seluruh tree dan berat untuk
+        server, jadi yang dipakai adalah export graph_xport 5 menit dari
+        graph yang sudah diketahui. Tetap diarahkan ke login jika cookie
+        tidak valid. graph_view.php hanya dipakai jika belum ada graph id.
+
+        Returns:
+            True jika session valid, False jika cookie expired
+        """
+        from urllib.parse import urlparse
+        
+        timeout = (config.REQUEST_CONNECT_TIMEOUT, 10)
+        
+        probe_id = next(iter(config.GRAPH_IDS.values()), None)
+        if probe_id is None:
+            index = self._load_graph_index()
+            probe_id = next(iter(index.graphs), None) if index else None
+        
+        if probe_id is not None:
+            now = int(time.time())
+            resp = session.get(self._xport_url(probe_id, now - 300, now), verify=False, timeout=timeout)
+            if self._is_login_response(resp):
+                return False
+            if resp.status_code == 200 and 'Date' in resp.text:
+                return True
+            # Graph id sudah tidak ada / respons aneh: cek ulang lewat halaman utama
+        
+        parsed = urlparse(config.CACTI_URL)
+        test_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        resp = session.get(test_url, verify=False, timeout=timeout)
+        return resp.status_code == 200 and not self._is_login_response(resp)
+
+    @staticmethod
+    def _session_check_key(cookies: List[Dict]) -> str:
+        """Kunci hasil cek session: URL Cacti + isi cookies"""
+        import hashlib
+        raw = config.CACTI_URL + json.dumps(cookies, sort_keys=True)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _session_check_path(self) -> str:
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)), config.SESSION_CHECK_FILE)
+
+    def _session_check_valid(self, key: str) -> bool:
+        """True jika session dengan key ini sudah dicek valid dalam SESSION_CHECK_TTL"""
+        if not config.SESSION_CHECK_TTL:
+            return False
+        try:
+            with open(self._session_check_path(), 'r', encoding='utf-8') as f:
+                check = json.load(f)
+        except (IOError, ValueError):
+            return False
+        return check.get('key') == key and time.time() - check.get('checked', 0) < config.SESSION_CHECK_TTL
+
+    def _save_session_check(self, key: str):
+        """Simpan hasil cek session yang valid"""
+        if not config.SESSION_CHECK_TTL:
+            return
+        try:
+            with open(self._session_check_path(), 'w', encoding='utf-8') as f:
+                json.dump({"key": key, "checked": int(time.time())}, f)
+        except IOError:
+            pass
+
+    def _invalidate_session_check(self):
+        """Hapus hasil cek session (misal saat terdeteksi redirect ke login)"""
+        try:
+            os.remove(self._session_check_path())
+        except OSError:
+            pass
+
+    def _fetch_parallel(self, tasks: List, fetch_fn: Callable, describe: Callable,
+                        progress_start: int = 15, progress_span: int = 70) -> List:
+        """
+        Jalankan fetch_fn untuk setiap task secara paralel (thread pool)
+
+        Args:
+            tasks: Daftar task (urutan ini yang dipertahankan di hasil)
+            fetch_fn: Fungsi fetch_fn(task) -> hasil (None = gagal)
+            describe: Fungsi describe(task) -> label untuk log progress
+            progress_start: Persentase progress awal
+            progress_span: Rentang persentase yang dipakai
+
+        Returns:
+            List hasil dengan urutan sama seperti tasks
+        """
+        results = [None] * len(tasks)
+        if not tasks:
+            return results
+
+        workers = max(1, min(int(config.FETCH_WORKERS), len(tasks)))
+        done = 0
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(fetch_fn, task): i for i, task in enumerate(tasks)}
+            for future in as_completed(futures):
+                i = futures[future]
+                done += 1
+                
+                remaining = self._deadline_remaining()
+                if remaining is not None and remaining <= 0:
+                    cancelled = sum(1 for f in futures if not f.cancelled() and f.cancel())
+                    if cancelled:
+                        self._update_progress(f"⏱ Batas waktu run habis, {cancelled} request dibatalkan", -1)
+                
+                if future.cancelled():
+                    self._update_progress(f"  ✗ {describe(tasks[i])}: dibatalkan (RUN_DEADLINE)", -1)
+                    continue
+                progress = progress_start + int((done / len(tasks)) * progress_span)
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    self._update_progress(f"  ✗ {describe(tasks[i])}: {str(e)}", progress)
+                    continue
+
+                if results[i]:
+                    self._update_progress(f"  ✓ {describe(tasks[i])}: OK", progress)
+                else:
+                    self._update_progress(f"  ✗ {describe(tasks[i])}: gagal ambil data", progress)
+
+        return results
+
+    def scrape_date_range_fast(self, start_date: datetime, end_date: datetime) -> ScrapeResults:
         """
         Scrape data menggunakan requests langsung (tanpa Selenium).
         Jauh lebih cepat dan stabil.
+
+        Request graph_xport dikirim paralel (maks config.FETCH_WORKERS)
+        lewat satu session bersama. Urutan hasil tetap
+        (tanggal, slot, interface) seperti mode serial.
+
+        Setiap graph cukup di-export sekali per jendela (beberapa hari
+        sekaligus jika masih di RRA 5 menit, lihat fetch_planner);
+        statistik semua hari & TIME_SLOTS dihitung lokal dari deret
+        data yang sama.
+
+        Hasil berupa ScrapeResults (array ringkas, view dict per baris);
+        string terformat baru dibuat saat dibaca sink.
         """
-        all_data = []
+        all_data = ScrapeResults()
         
         # Setup session
         session = self._setup_requests_session()
         
-        # Hitung total iterasi untuk progress
-        days = (end_date - start_date).days + 1
-        total_iterations = days * len(config.TIME_SLOTS) * len(config.GRAPH_IDS)
-        current_iteration = 0
+        # Deadline keseluruhan run (0 = tanpa batas)
+        if config.RUN_DEADLINE:
+            self._run_deadline = time.monotonic() + config.RUN_DEADLINE
         
-        self._update_progress(f"Mulai scraping {days} hari x {len(config.TIME_SLOTS)} slot x {len(config.GRAPH_IDS)} interface...", 15)
+        graph_ids = self._resolve_graph_ids(session)
+        
+        days = (end_date - start_date).days + 1
+        self._update_progress(f"Mulai scraping {days} hari x {len(config.TIME_SLOTS)} slot x {len(graph_ids)} interface...", 15)
         
+        # 1. Kumpulkan tanggal yang akan diambil
+        dates = []
         current_date = start_date
         while current_date <= end_date:
             # Skip weekend if configured
             if config.SKIP_WEEKENDS and current_date.weekday() >= 5: # 5=Sat, 6=Sun
-                # Update progress for skipped days
-                skipped_iterations = len(config.TIME_SLOTS) * len(config.GRAPH_IDS)
-                current_iteration += skipped_iterations
-                
                 self._update_progress(f"📅 {current_date.strftime('%d/%m/%Y')} adalah Weekend (Skip)", -1)
-                
-                current_date += timedelta(days=1)
-                continue
-
+            else:
+                dates.append(current_date)
+            current_date += timedelta(days=1)
+        
+        # 2. Rencanakan export per graph: setiap hari diberi arsip RRA termurah
+        # yang memenuhi RESOLUTION_TARGET, hari berurutan dengan arsip sama
+        # digabung jadi satu export panjang (rra_id dipatok). Semua slot mulai
+        # 00:00, jadi cukup ambil sampai slot terakhir (+5 menit buffer) lalu
+        # potong per hari/slot secara lokal.
+        # Hari yang sudah lengkap di store lokal tetap memakai arsip 5 menit
+        # (dibaca dari rollup/blok store), walau Cacti tinggal punya arsip kasar.
+        profiles = self._rra_profiles(session, graph_ids, dates)
+        store = self._get_sample_store()
+        plans = {}
+        jobs = []
+        stored = 0
+        for interface_name, graph_id in graph_ids.items():
+            archives = profiles.get(graph_id)
+            stored_days = frozenset()
+            if store is not None:
+                stored_days = frozenset(date for date in dates
+                                        if not store.missing_ranges(graph_id, *day_window(date)))
+                stored += len(stored_days)
+            key = (tuple(archives) if archives else None, stored_days)
+            if key not in plans:
+                plans[key] = plan_fetch_windows(dates, archives=archives, stored_days=stored_days)
+            for window in plans[key]:
+                jobs.append((window, interface_name, graph_id))
+        
+        windows = max((len(plan) for plan in plans.values()), default=0)
+        self._update_progress(f"📦 {len(dates)} hari → {windows} export per interface", -1)
+        if stored:
+            self._update_progress(f"🗄 {stored} graph-hari sudah lengkap di store lokal", -1)
+        
+        # 3. Ambil CSV secara paralel, hitung statistik tiap hari & slot dari CSV yang sama
+        self.store_gap_fetches = 0
+        
+        def uses_store(window):
+            # Jendela arsip 5 menit (termasuk hari yang sudah ada di store):
+            # pakai store lokal, ambil gap saja
+            return store is not None and window.rra_id and window.step <= BASE_STEP
+        
+        day_files = self._get_day_files()
+        self.day_file_hits = 0
+        
+        def fetch(job):
+            window, _, graph_id = job
+            if day_files is not None:
+                # Hari yang sudah ada di file harian: hitung dari mmap, tanpa request
+                local = day_files.slot_stats(graph_id, window.days, config.TIME_SLOTS, window.step, raw=True)
+                if local is not None:
+                    with self._limiters_lock:
+                        self.day_file_hits += 1
+                    return local
+            if uses_store(window):
+                if not self._sync_store(session, store, graph_id, window):
+                    return None
+                return {date: self._store_slot_stats(store, graph_id, date) for date in window.days}
+            
+            if self._parse_pool is not None:
+                return self._pool_slot_stats(session, graph_id, window)
+            return self._stream_slot_stats(session, graph_id, window)
+        
+        def describe(job):
+            window, interface_name = job[:2]
+            first = window.days[0].strftime(config.DATE_FORMAT_EXCEL)
+            if len(window.days) == 1:
+                return f"{first} - {interface_name}"
+            last = window.days[-1].strftime(config.DATE_FORMAT_EXCEL)
+            return f"{first}-{last} - {interface_name}"
+        
+        try:
+            if not all(uses_store(window) for window, _, _ in jobs):
+                self._parse_pool = self._start_parse_pool()
+            results = self._fetch_parallel(jobs, fetch, describe)
+            if store is not None and config.SAMPLE_ARCHIVE_DAYS:
+                # Hari lama yang sudah lengkap -> blok terkompresi
+                archived = store.compact(int(time.time()) - config.SAMPLE_ARCHIVE_DAYS * 86400)
+                if archived:
+                    self._update_progress(f"🗜 Arsip: {archived} graph-hari dikompresi", -1)
+        finally:
+            self._run_deadline = None
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
+            if self._hedge_pool is not None:
+                self._hedge_pool.shutdown(wait=False)
+                self._hedge_pool = None
+            if self._response_cache is not None:
+                self._response_cache.save()
+            if self._sample_store is not None:
+                self._sample_store.close()
+                self._sample_store = None
+        
+        # Export gagal/dibatalkan dicatat di hasil agar tidak dikira lengkap
+        all_data.failed = [describe(job) for job, day_stats in zip(jobs, results) if day_stats is None]
+        
+        # 4. Gabungkan hasil dengan urutan deterministik (tanggal, slot, interface)
+        per_day = {date: [] for date in dates}
+        for job, day_stats in zip(jobs, results):
+            window, interface_name = job[:2]
+            for date in window.days:
+                per_day[date].append((interface_name, (day_stats or {}).get(date, {})))
+        
+        for date, interfaces in per_day.items():
             for hour, minute in config.TIME_SLOTS:
-                time_str = f"{hour:02d}:{minute:02d}"
-                date_str = current_date.strftime(config.DATE_FORMAT_EXCEL)
-                
-                # Hitung timestamp
-                from_dt = current_date.replace(hour=0, minute=0, second=0)
-                to_dt = current_date.replace(hour=hour, minute=minute, second=0)
-                
-                start_ts = int(from_dt.timestamp())
-                end_ts = int(to_dt.timestamp()) + 300  # +5 menit buffer
-                
-                # Ambil CSV untuk setiap interface
-                for interface_name, graph_id in config.GRAPH_IDS.items():
-                    current_iteration += 1
-                    progress = 15 + int((current_iteration / total_iterations) * 70)
-                    
-                    self._update_progress(
-                        f"📊 {date_str} {time_str} - {interface_name}...",
-                        progress
-                    )
-                    
-                    csv_data = self._get_csv_data(session, graph_id, start_ts, end_ts)
-                    if not csv_data:
-                        self._update_progress(f"  ✗ {interface_name}: gagal ambil data")
+                for interface_name, slot_stats in interfaces:
+                    stats = slot_stats.get((hour, minute))
+                    if not stats:
                         continue
-                    
-                    stats = self._calculate_stats_from_csv(csv_data['rows'], csv_data['header'])
-                    if stats:
-                        all_data.append({
-                            "date": current_date,
-                            "time_hour": hour,
-                            "time_minute": minute,
-                            "interface": interface_name,
-                            "sheet": config.INTERFACE_TO_SHEET.get(interface_name),
-                            **stats
-                        })
-                        self._update_progress(f"  ✓ {interface_name}: OK")
-                    else:
-                        self._update_progress(f"  ✗ {interface_name}: tidak ada data")
-            
-            current_date += timedelta(days=1)
+                    all_data.append(date, hour, minute, interface_name, stats)
         
-        self._update_progress(f"Selesai mengambil {len(all_data)} data!", 85)
+        for host, stats in self.fetch_stats().items():
+            self._update_progress(
+                f"⚙ Flow control {host}: limit={stats['limit']}, "
+                f"latency avg={stats['latency_avg']}s, baseline {len(stats['baselines'])} kelas request, "
+                f"backoff={stats['backoffs']}x", -1
+            )
+        if store:
+            self._update_progress(f"🗄 Store lokal: {self.store_gap_fetches} gap diambil dari Cacti", -1)
+        if self.day_file_hits:
+            self._update_progress(f"📂 File harian: {self.day_file_hits} export tidak perlu diambil", -1)
+        if self._response_cache is not None:
+            self._update_progress(
+                f"💾 Cache: {self._response_cache.hits} hit, {self._response_cache.misses} download", -1
+            )
+        latency = self.latency_stats()
+        if latency['samples']:
+            self._update_progress(
+                f"⏱ Latency {latency['samples']} request: p50={latency['p50']}s "
+                f"p95={latency['p95']}s, hedge={latency['hedges']}x", -1
+            )
+        
+        if all_data.failed:
+            shown = ", ".join(all_data.failed[:5]) + (", ..." if len(all_data.failed) > 5 else "")
+            self._update_progress(f"⚠ {len(all_data.failed)} export gagal/dibatalkan, datanya tidak ada: {shown}", -1)
+            self._update_progress(
+                f"Selesai mengambil {len(all_data)} data ({len(all_data.failed)} export gagal)!", 85)
+        else:
+            self._update_progress(f"Selesai mengambil {len(all_data)} data!", 85)
         return all_data
 
 
 def run_scraper(start_date: datetime, end_date: datetime, 
                 progress_callback: Optional[Callable] = None,
-                attach_to_existing: bool = False) -> List[Dict]:
+                attach_to_existing: bool = False) -> ScrapeResults:
     """
     Fungsi utama untuk menjalankan scraper.
     
@@ -721,7 +1514,7 @@ def run_scraper(start_date: datetime, end_date: datetime,
         attach_to_existing: Tidak dipakai di mode cepat
         
     Returns:
-        List data yang di-scrape
+        Data yang di-scrape (ScrapeResults, bisa dipakai seperti list dict)
     """
     scraper = CactiScraper(progress_callback)
     
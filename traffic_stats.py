@@ -0,0 +1,573 @@
+"""
+Traffic Stats Module
+Hitung Current/Average/Maximum traffic In/Out
+
+- stats_from_columns: hasil langsung dari kolom float64 In/Out (file
+  mmap day_files). Dengan NumPy last/mean/max dihitung vektor, tanpa
+  NumPy fallback Python murni dengan hasil yang sama
+- stats_from_samples: export yang diparse (csv_stream.iter_samples)
+  dikumpulkan sekali jalan ke kolom float64, lalu stats_from_columns
+- StatsAccumulator: versi streaming (memori tetap), sampel masuk satu
+  per satu dan hasil parsial bisa digabung (merge); dipakai
+  stats_from_samples tanpa NumPy
+- SlotStats / day_slot_stats: sampel per hari disimpan sebagai kolom
+  float64, setiap slot dihitung dari potongan kolomnya lewat
+  stats_from_columns
+- WindowIndex: prefix sum + sparse table per seri (graph-hari), untuk
+  query jendela waktu apa pun tanpa scan ulang; membangunnya jauh lebih
+  mahal dari satu scan, jadi hanya dipakai tanpa NumPy untuk banyak slot
+- stats_from_bucket: hasil dari RollupBucket (agregat jam/hari/bulan
+  di SampleStore), kebijakan NaN diterapkan saat dibaca
+- raw=True: hasil berupa tuple float STAT_KEYS (stat_values), string
+  terformat baru dibuat oleh sink (lihat scrape_results)
+- Persentil config.PERCENTILE (misal p95, nearest-rank) ikut dihitung
+  sebagai pct_in/pct_out jika kolom Excel persentil diisi
+  (active_percentile); versi streaming memakai QuantileSketch
+- Penanganan NaN diatur config.NAN_POLICY:
+  "zero" = NaN dihitung sebagai 0 (perilaku lama), "skip" = NaN diabaikan
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from itertools import accumulate, compress
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+import config
+from quantile_sketch import QuantileSketch, nearest_rank
+from rollups import DirectionRollup, RollupBucket
+from sample_store import Sample
+
+
+NAN_ZERO = "zero"
+NAN_SKIP = "skip"
+
+NEG_INF = float('-inf')
+NAN = float('nan')
+
+# Tanpa NumPy, SlotStats membangun WindowIndex mulai jumlah slot ini;
+# dengan slot lebih sedikit scan ulang per slot lebih murah
+INDEX_MIN_SLOTS = 64
+
+# Urutan nilai statistik mentah (raw=True / ScrapeResults)
+STAT_KEYS = ("curr_in", "avg_in", "max_in", "pct_in", "curr_out", "avg_out", "max_out", "pct_out")
+
+
+def fmt(val) -> str:
+    """Format nilai bps dengan satuan K/M/G (2 desimal)"""
+    if val is None: return "0.00"
+    abs_val = abs(val)
+    if abs_val >= 1e9:   return f"{val/1e9:.2f} G"
+    elif abs_val >= 1e6: return f"{val/1e6:.2f} M"
+    elif abs_val >= 1e3: return f"{val/1e3:.2f} K"
+    else:                return f"{val:.2f}"
+
+
+def _nan_policy(nan_policy: Optional[str]) -> str:
+    policy = nan_policy or getattr(config, 'NAN_POLICY', NAN_ZERO)
+    if policy not in (NAN_ZERO, NAN_SKIP):
+        raise ValueError(f"NAN_POLICY tidak dikenal: {policy!r} (pilih 'zero' atau 'skip')")
+    return policy
+
+
+def active_percentile() -> float:
+    """
+    Persentil yang dihitung: config.PERCENTILE, atau 0 (tidak dihitung)
+    jika tidak ada kolom Excel persentil (EXCEL_COL_PCT_IN/OUT) yang diisi
+    """
+    if getattr(config, 'EXCEL_COL_PCT_IN', None) is None and getattr(config, 'EXCEL_COL_PCT_OUT', None) is None:
+        return 0
+    return getattr(config, 'PERCENTILE', 0) or 0
+
+
+def _pick_rank(sorted_values, q: float) -> float:
+    """Nilai persentil nearest-rank dari nilai yang sudah urut"""
+    return float(sorted_values[nearest_rank(len(sorted_values), q) - 1])
+
+
+def _summary_np(arr, policy: str):
+    """(last, mean, max, persentil) dari array float64"""
+    nan_mask = np.isnan(arr)
+    if nan_mask.any():
+        arr = np.where(nan_mask, 0.0, arr) if policy == NAN_ZERO else arr[~nan_mask]
+    if not arr.size:
+        return 0, 0, 0, 0
+    q = active_percentile()
+    pct = _pick_rank(np.sort(arr), q) if q else None
+    return float(arr[-1]), float(arr.mean()), float(arr.max()), pct
+
+
+def _summary_py(values: List[float], policy: str):
+    """(last, mean, max, persentil) dari list float (fallback tanpa NumPy)"""
+    if policy == NAN_ZERO:
+        values = [0.0 if v != v else v for v in values]
+    else:
+        values = [v for v in values if v == v]
+    if not values:
+        return 0, 0, 0, 0
+    q = active_percentile()
+    pct = _pick_rank(sorted(values), q) if q else None
+    return values[-1], sum(values) / len(values), max(values), pct
+
+
+def _format(summary_in, summary_out) -> Dict:
+    curr_in, avg_in, max_in, pct_in = summary_in
+    curr_out, avg_out, max_out, pct_out = summary_out
+    stats = {
+        "curr_in": fmt(curr_in),
+        "avg_in": fmt(avg_in),
+        "max_in": fmt(max_in),
+        "curr_out": fmt(curr_out),
+        "avg_out": fmt(avg_out),
+        "max_out": fmt(max_out),
+    }
+    if active_percentile():
+        stats["pct_in"] = fmt(pct_in)
+        stats["pct_out"] = fmt(pct_out)
+    return stats
+
+
+def stat_values(summary_in, summary_out) -> Tuple[float, ...]:
+    """Nilai mentah sesuai STAT_KEYS (float, NaN = tidak ada nilai)"""
+    return tuple(float('nan') if val is None else float(val) for val in summary_in + summary_out)
+
+
+def _result(summary_in, summary_out, raw: bool):
+    if raw:
+        return stat_values(summary_in, summary_out)
+    return _format(summary_in, summary_out)
+
+
+def stats_from_columns(in_values, out_values, nan_policy: Optional[str] = None,
+                       raw: bool = False) -> Optional[Dict]:
+    """
+    Statistik dari kolom float64 In/Out (NaN = tidak ada data)
+
+    Kolom bisa berupa array NumPy (misal view di atas file mmap, lihat
+    day_files) atau sequence float biasa / memoryview 'd'.
+
+    Returns:
+        Dictionary curr/avg/max In/Out terformat (raw=True: tuple float
+        sesuai STAT_KEYS), None jika kolom kosong
+    """
+    if not len(in_values):
+        return None
+    policy = _nan_policy(nan_policy)
+    if HAS_NUMPY and isinstance(in_values, np.ndarray):
+        return _result(_summary_np(in_values, policy), _summary_np(out_values, policy), raw)
+    return _result(_summary_py(list(in_values), policy), _summary_py(list(out_values), policy), raw)
+
+
+def stats_from_samples(samples: Iterable[Sample], nan_policy: Optional[str] = None,
+                       raw: bool = False) -> Optional[Dict]:
+    """
+    Statistik aliran sampel (ts, in, out) satu export, None = NaN
+
+    Dengan NumPy sampel dikumpulkan sekali jalan ke kolom float64 In/Out
+    (array 'd', 8 byte per nilai) lalu dihitung vektor lewat
+    stats_from_columns. Tanpa NumPy dipakai StatsAccumulator (memori
+    tetap, hasil sama).
+
+    Returns:
+        Seperti stats_from_columns, None jika tidak ada sampel
+    """
+    if not HAS_NUMPY:
+        acc = StatsAccumulator(nan_policy)
+        for sample in samples:
+            acc.add_sample(sample)
+        return acc.result(raw)
+    inbound = array('d')
+    outbound = array('d')
+    for _, in_val, out_val in samples:
+        inbound.append(NAN if in_val is None else in_val)
+        outbound.append(NAN if out_val is None else out_val)
+    return stats_from_columns(np.frombuffer(inbound, dtype=np.float64),
+                              np.frombuffer(outbound, dtype=np.float64), nan_policy, raw)
+
+
+class DirectionStats:
+    """count/sum/max/last (+ sketch persentil) satu arah traffic (In atau Out)"""
+
+    __slots__ = ('count', 'total', 'peak', 'last', 'sketch')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.peak = None
+        self.last = None
+        self.sketch = QuantileSketch(config.PERCENTILE_ACCURACY) if active_percentile() else None
+
+    def add(self, val: float):
+        self.count += 1
+        self.total += val
+        if self.peak is None or val > self.peak:
+            self.peak = val
+        self.last = val
+        if self.sketch is not None:
+            self.sketch.add(val)
+
+    def merge(self, later: 'DirectionStats'):
+        """Gabungkan hasil parsial yang datanya lebih baru (sesudah data ini)"""
+        if not later.count:
+            return
+        self.count += later.count
+        self.total += later.total
+        if self.peak is None or later.peak > self.peak:
+            self.peak = later.peak
+        self.last = later.last
+        if self.sketch is not None and later.sketch is not None:
+            self.sketch.merge(later.sketch)
+
+    def summary(self):
+        """(last, mean, max, persentil), sama seperti _summary_py"""
+        if not self.count:
+            return 0, 0, 0, 0
+        pct = self.sketch.quantile(active_percentile()) if self.sketch is not None else None
+        return self.last, self.total / self.count, self.peak, pct
+
+
+class StatsAccumulator:
+    """
+    Statistik Current/Avg/Max dengan memori tetap
+
+    Sampel dimasukkan satu per satu (urut waktu); hanya count, sum, max
+    dan nilai terakhir per arah yang disimpan, plus QuantileSketch jika
+    config.PERCENTILE aktif (persis sampai EXACT_LIMIT sampel, setelah itu
+    error relatif <= PERCENTILE_ACCURACY). Dua akumulator dari potongan
+    data yang berurutan bisa digabung dengan merge().
+    """
+
+    __slots__ = ('samples', 'inbound', 'outbound', 'nan_policy')
+
+    def __init__(self, nan_policy: Optional[str] = None):
+        self.samples = 0
+        self.inbound = DirectionStats()
+        self.outbound = DirectionStats()
+        self.nan_policy = _nan_policy(nan_policy)
+
+    def _add_value(self, direction: DirectionStats, val: Optional[float]):
+        if val is None or val != val:
+            if self.nan_policy == NAN_SKIP:
+                return
+            val = 0.0
+        direction.add(val)
+
+    def add(self, in_val: Optional[float], out_val: Optional[float]):
+        """Tambah satu sampel (None / NaN = tidak ada data)"""
+        self.samples += 1
+        self._add_value(self.inbound, in_val)
+        self._add_value(self.outbound, out_val)
+
+    def add_sample(self, sample: Sample):
+        self.add(sample[1], sample[2])
+
+    def merge(self, later: 'StatsAccumulator') -> 'StatsAccumulator':
+        """Gabungkan akumulator potongan data berikutnya (urutan waktu: self lalu later)"""
+        self.samples += later.samples
+        self.inbound.merge(later.inbound)
+        self.outbound.merge(later.outbound)
+        return self
+
+    def copy(self) -> 'StatsAccumulator':
+        clone = StatsAccumulator(self.nan_policy)
+        clone.merge(self)
+        return clone
+
+    def result(self, raw: bool = False) -> Optional[Dict]:
+        """
+        Dictionary curr/avg/max In/Out terformat, None jika belum ada sampel
+
+        raw=True: tuple float sesuai STAT_KEYS
+        """
+        if not self.samples:
+            return None
+        return _result(self.inbound.summary(), self.outbound.summary(), raw)
+
+
+def _summary_rollup(direction: DirectionRollup, samples: int, last_ts: int, policy: str):
+    """(last, mean, max, persentil) satu arah rollup, NaN sesuai policy"""
+    q = active_percentile()
+    if policy == NAN_SKIP:
+        if not direction.count:
+            return 0, 0, 0, 0
+        pct = direction.sketch.quantile(q) if q and direction.sketch is not None else None
+        return direction.last, direction.mean(direction.count), direction.peak, pct
+
+    # NaN = 0: sampel yang bukan nilai valid dihitung sebagai 0
+    missing = samples - direction.count
+    last = direction.last if direction.last_ts == last_ts else 0.0
+    peak = direction.peak if direction.count else 0.0
+    if missing and peak < 0.0:
+        peak = 0.0
+    pct = None
+    if q and direction.sketch is not None:
+        sketch = direction.sketch
+        if missing:
+            sketch = sketch.copy()
+            for _ in range(missing):
+                sketch.add(0.0)
+        pct = sketch.quantile(q)
+    return last, direction.mean(samples), peak, pct
+
+
+def stats_from_bucket(bucket: RollupBucket, nan_policy: Optional[str] = None,
+                      raw: bool = False) -> Optional[Dict]:
+    """
+    Statistik dari RollupBucket (misal SampleStore.window_bucket)
+
+    Returns:
+        Dictionary curr/avg/max In/Out terformat (raw=True: tuple float
+        sesuai STAT_KEYS), None jika tidak ada sampel
+    """
+    if not bucket.samples:
+        return None
+    policy = _nan_policy(nan_policy)
+    return _result(_summary_rollup(bucket.inbound, bucket.samples, bucket.last_ts, policy),
+                   _summary_rollup(bucket.outbound, bucket.samples, bucket.last_ts, policy), raw)
+
+
+class _DirectionIndex:
+    """Prefix sum, prefix count, nilai valid terakhir & sparse table max satu arah"""
+
+    __slots__ = ('values', 'valid', 'scale', 'prefix_sum', 'prefix_count', 'last_valid', 'table')
+
+    def __init__(self, values: List[Optional[float]], policy: str):
+        n = len(values)
+        skip = policy == NAN_SKIP
+        valid = [val is not None and val == val for val in values]
+        vals = array('d', (val if ok else 0.0 for val, ok in zip(values, valid)))
+        if not skip:
+            valid = [True] * n
+
+        self.values = vals
+        self.valid = bytes(valid)
+        # Prefix sum eksak: setiap float = pembilang / 2^k, jadi dikali 2^(k terbesar)
+        # semuanya integer. Selisih dua prefix tidak kehilangan presisi seperti float.
+        ratios = [val.as_integer_ratio() if ok else (0, 1) for val, ok in zip(vals, valid)]
+        shift = max((den.bit_length() - 1 for _, den in ratios), default=0)
+        self.scale = 1 << shift
+        self.prefix_sum = [0]
+        self.prefix_sum.extend(accumulate(
+            num << (shift - den.bit_length() + 1) for num, den in ratios))
+        self.prefix_count = array('l', [0])
+        self.prefix_count.extend(accumulate(valid))
+        self.last_valid = array('l', accumulate(
+            (i if ok else -1 for i, ok in enumerate(valid)), max))
+
+        # Sparse table: table[k][i] = max values[i : i + 2^k] (-inf = tidak ada data)
+        level = array('d', (val if ok else NEG_INF for val, ok in zip(vals, valid)))
+        self.table = [level]
+        width = 1
+        while 2 * width <= n:
+            level = array('d', map(max, level[:n - 2 * width + 1], level[width:n - width + 1]))
+            self.table.append(level)
+            width *= 2
+
+    def summary(self, lo: int, hi: int):
+        """(last, mean, max, persentil) untuk index [lo, hi), sama seperti _summary_py"""
+        count = self.prefix_count[hi] - self.prefix_count[lo]
+        if not count:
+            return 0, 0, 0, 0
+        k = (hi - lo).bit_length() - 1
+        level = self.table[k]
+        peak = max(level[lo], level[hi - (1 << k)])
+        last = self.values[self.last_valid[hi - 1]]
+        mean = (self.prefix_sum[hi] - self.prefix_sum[lo]) / (count * self.scale)
+        pct = None
+        q = active_percentile()
+        if q:
+            # Persentil tidak bisa dari prefix: urutkan nilai jendela ini saja
+            pct = _pick_rank(sorted(compress(self.values[lo:hi], self.valid[lo:hi])), q)
+        return last, mean, peak, pct
+
+
+class WindowIndex:
+    """
+    Index satu seri sampel (misal satu graph, satu hari)
+
+    Dibangun sekali; setelah itu Current/Avg/Max jendela [start_ts, end_ts]
+    mana pun dihitung tanpa scan ulang: index sampel dicari dengan bisect,
+    Avg dari selisih prefix sum, Max dari sparse table (O(1)). Persentil
+    (jika aktif) diurutkan dari nilai di dalam jendela saja.
+    """
+
+    def __init__(self, samples: Iterable[Sample], nan_policy: Optional[str] = None):
+        """
+        Args:
+            samples: Sampel (ts, in, out); diurutkan berdasarkan waktu jika belum
+            nan_policy: "zero" / "skip", default config.NAN_POLICY
+        """
+        samples = list(samples)
+        if any(samples[i][0] > samples[i + 1][0] for i in range(len(samples) - 1)):
+            samples.sort(key=lambda s: s[0])
+        policy = _nan_policy(nan_policy)
+        self.timestamps = array('q', (s[0] for s in samples))
+        self.inbound = _DirectionIndex([s[1] for s in samples], policy)
+        self.outbound = _DirectionIndex([s[2] for s in samples], policy)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def query(self, start_ts: int, end_ts: int, raw: bool = False) -> Optional[Dict]:
+        """
+        Statistik sampel dengan start_ts <= ts <= end_ts
+
+        Returns:
+            Dictionary curr/avg/max In/Out terformat (raw=True: tuple float
+            sesuai STAT_KEYS), None jika tidak ada sampel
+        """
+        lo = bisect_left(self.timestamps, start_ts)
+        hi = bisect_right(self.timestamps, end_ts)
+        if lo >= hi:
+            return None
+        return _result(self.inbound.summary(lo, hi), self.outbound.summary(lo, hi), raw)
+
+
+def slot_window(date: datetime, hour: int, minute: int, window_minutes: Optional[int] = None):
+    """
+    Jendela (start_ts, end_ts) satu slot
+
+    Default 00:00 sampai jam slot + 5 menit. Dengan window_minutes > 0:
+    window_minutes sebelum jam slot sampai jam slot + 5 menit (tidak
+    melewati 00:00 tanggal itu).
+    """
+    if window_minutes is None:
+        window_minutes = getattr(config, 'SLOT_WINDOW_MINUTES', 0)
+    day_start = int(date.replace(hour=0, minute=0, second=0).timestamp())
+    slot_ts = int(date.replace(hour=hour, minute=minute, second=0).timestamp())
+    start_ts = max(day_start, slot_ts - window_minutes * 60) if window_minutes else day_start
+    return start_ts, slot_ts + 300
+
+
+class SlotStats:
+    """
+    Statistik setiap slot untuk satu tanggal
+
+    Sampel hari itu disimpan sebagai kolom (timestamp 'q', In/Out
+    float64 'd', NaN = tidak ada data). finish() menghitung setiap slot
+    dari potongan kolom jendelanya dengan stats_from_columns (vektor
+    NumPy jika ada), seperti DayFile.query. Tanpa NumPy dan dengan slot
+    sebanyak INDEX_MIN_SLOTS atau lebih, WindowIndex dibangun sekali
+    dan semua slot dijawab dari index.
+    """
+
+    def __init__(self, date: datetime, slots: Iterable[Tuple[int, int]],
+                 nan_policy: Optional[str] = None):
+        """
+        Args:
+            date: Tanggal data
+            slots: (jam, menit); jendela slot dari slot_window()
+            nan_policy: "zero" / "skip", default config.NAN_POLICY
+        """
+        self.date = date
+        self.slots = list(slots)
+        self.nan_policy = nan_policy
+        self.start_ts = int(date.replace(hour=0, minute=0, second=0).timestamp())
+        self.timestamps = array('q')
+        self.inbound = array('d')
+        self.outbound = array('d')
+        self._sorted = True
+
+    def add(self, sample: Sample):
+        ts, in_val, out_val = sample
+        if ts < self.start_ts:
+            return
+        if self.timestamps and ts < self.timestamps[-1]:
+            self._sorted = False
+        self.timestamps.append(ts)
+        self.inbound.append(NAN if in_val is None else in_val)
+        self.outbound.append(NAN if out_val is None else out_val)
+
+    def _sort(self):
+        """Urutkan kolom berdasarkan waktu (stabil) jika sampel masuk tidak urut"""
+        if self._sorted:
+            return
+        order = sorted(range(len(self.timestamps)), key=self.timestamps.__getitem__)
+        for name in ('timestamps', 'inbound', 'outbound'):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, (column[i] for i in order)))
+        self._sorted = True
+
+    def finish(self, raw: bool = False) -> Dict[Tuple[int, int], Dict]:
+        """
+        Hasil semua slot: {(jam, menit): stats} (raw: lihat stats_from_columns)
+
+        Setelah finish() kolom timestamps/inbound/outbound sudah urut waktu.
+        """
+        self._sort()
+        if not self.timestamps:
+            return {}
+        policy = _nan_policy(self.nan_policy)
+        timestamps = self.timestamps
+        if HAS_NUMPY:
+            in_values = np.frombuffer(self.inbound, dtype=np.float64)
+            out_values = np.frombuffer(self.outbound, dtype=np.float64)
+        else:
+            in_values, out_values = self.inbound, self.outbound
+        index = None
+        if not HAS_NUMPY and len(self.slots) >= INDEX_MIN_SLOTS:
+            index = WindowIndex(zip(timestamps, in_values, out_values), policy)
+
+        result = {}
+        for hour, minute in self.slots:
+            start_ts, end_ts = slot_window(self.date, hour, minute)
+            if index is not None:
+                stats = index.query(start_ts, end_ts, raw=raw)
+            else:
+                lo = bisect_left(timestamps, start_ts)
+                hi = bisect_right(timestamps, end_ts)
+                stats = stats_from_columns(in_values[lo:hi], out_values[lo:hi], policy, raw)
+            if stats:
+                result[(hour, minute)] = stats
+        return result
+
+
+def day_slot_stats(samples: Iterable[Sample], days: Optional[Sequence[datetime]],
+                   slots: Iterable[Tuple[int, int]], nan_policy: Optional[str] = None,
+                   raw: bool = False,
+                   on_day: Optional[Callable[[datetime, array, array, array], None]] = None) -> Dict:
+    """
+    Statistik per hari & slot dari satu seri sampel (bisa multi-hari)
+
+    Sampel dibagi per tanggal saat mengalir masuk; sampel di luar days
+    dilewati (days None = setiap tanggal yang punya sampel). raw=True: stats berupa tuple float sesuai STAT_KEYS.
+    on_day(tanggal, timestamps, inbound, outbound) dipanggil setiap satu
+    hari selesai dengan kolom SlotStats yang sudah urut waktu (misal untuk
+    menyimpan file day_files).
+
+    Returns:
+        Dictionary {tanggal: {(jam, menit): stats}}
+    """
+    slots = list(slots)
+    by_day = None if days is None else {date.date(): date for date in days}
+    result = {} if days is None else {date: {} for date in days}
+    current_day = None
+    day_stats = None
+
+    def finish():
+        result[day_stats.date] = day_stats.finish(raw)
+        if on_day is not None:
+            on_day(day_stats.date, day_stats.timestamps, day_stats.inbound, day_stats.outbound)
+
+    for sample in samples:
+        day = datetime.fromtimestamp(sample[0]).date()
+        if day != current_day:
+            if day_stats is not None:
+                finish()
+            current_day = day
+            if by_day is None:
+                day_stats = SlotStats(datetime.combine(day, datetime.min.time()), slots, nan_policy)
+            else:
+                day_stats = SlotStats(by_day[day], slots, nan_policy) if day in by_day else None
+        if day_stats is not None:
+            day_stats.add(sample)
+    if day_stats is not None:
+        finish()
+
+    return result
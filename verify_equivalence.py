@@ -0,0 +1,452 @@
+"""
+VERIFIKASI EKUIVALENSI: engine statistik & parser vs referensi
+==============================================================
+Ribuan seri acak (seed tetap) dengan NaN, gap, timestamp duplikat dan
+nilai di batas pembulatan K/M/G (misal 999.995 -> "1000.00" atau
+"1.00 K") dihitung dengan setiap jalur cepat, lalu dibandingkan dengan
+implementasi referensi sederhana di file ini:
+
+- Current = nilai terakhir, Avg = rata-rata eksak (Fraction, dibulatkan
+  sekali), Max = nilai terbesar, persentil nearest-rank dari nilai urut
+- NAN_POLICY "zero" (NaN = 0) dan "skip" (NaN diabaikan)
+
+Jalur yang dicek:
+1. stats_from_columns dan stats_from_samples (Python murni & NumPy)
+2. StatsAccumulator (dipotong acak lalu merge)
+3. WindowIndex (jendela acak), SlotStats (scan per slot Python & NumPy,
+   WindowIndex) dan DayFile (mmap, Python & NumPy)
+4. SampleStore.window_bucket + stats_from_bucket (rollup, sebagian seri;
+   sebagian store dikompres ke blok arsip lebih dulu; tanpa sketch hari
+   utuh di blok dibaca dari header blok)
+5. csv_stream.iter_samples (parser umum & parser cepat, respons per chunk)
+6. fetch_planner.regrid_samples (export 5 menit harus lolos apa adanya)
+7. sample_codec encode_block/decode_block (bolak-balik tanpa kehilangan)
+
+Setiap engine baru wajib lolos skrip ini sebelum dipakai di produksi.
+
+Jalankan: python verify_equivalence.py [jumlah_seri] [seed]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+from fractions import Fraction
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+import config
+import traffic_stats
+import day_files
+from csv_stream import SchemaCache, iter_file_lines, iter_response_lines, iter_samples
+from fetch_planner import regrid_samples
+from quantile_sketch import EXACT_LIMIT, nearest_rank
+from sample_codec import decode_block, encode_block
+from sample_store import SampleStore
+from traffic_stats import (HAS_NUMPY, INDEX_MIN_SLOTS, NAN_SKIP, NAN_ZERO, SlotStats,
+                           StatsAccumulator, WindowIndex, fmt, slot_window, stats_from_bucket,
+                           stats_from_columns, stats_from_samples)
+
+
+HEADER = ["Date", "CDEF_In", "Inbound", "CDEF_Out", "Outbound"]
+PERCENTILE = 95
+DAY = datetime(2026, 1, 23)
+DAY_TS = int(DAY.timestamp())
+
+# Nilai di sekitar batas pembulatan/satuan fmt()
+BOUNDARY_VALUES = [
+    0.0, 0.004, 0.005, 0.995, 999.99, 999.994, 999.995, 999.9949999999, 999.996, 1000.0,
+    1004.995, 999994.99, 999995.0, 999995.01, 1e6, 1e6 - 0.004, 999_994_999.0,
+    999_995_000.0, 999_995_000.1, 1e9, 1e9 + 5e6, 5e9, 12_345_678.905,
+]
+
+
+# ============================================================
+# REFERENSI
+# ============================================================
+
+def ref_direction(values, policy):
+    """(last, mean, max, persentil) dengan aritmetika eksak"""
+    if policy == NAN_ZERO:
+        values = [0.0 if v is None else v for v in values]
+    else:
+        values = [v for v in values if v is not None]
+    if not values:
+        return 0, 0, 0, 0
+    mean = float(sum(map(Fraction, values)) / len(values))
+    ordered = sorted(values)
+    return values[-1], mean, max(values), ordered[nearest_rank(len(ordered), PERCENTILE) - 1]
+
+
+def without_pct(stats):
+    """Hasil statistik tanpa kunci pct_* (bucket tanpa sketch)"""
+    return stats and {k: v for k, v in stats.items() if not k.startswith("pct_")}
+
+
+def ref_stats(samples, policy):
+    """Dictionary terformat seperti traffic_stats._format"""
+    if not samples:
+        return None
+    result = {}
+    for name, idx in (("in", 1), ("out", 2)):
+        last, mean, peak, pct = ref_direction([s[idx] for s in samples], policy)
+        result[f"curr_{name}"] = fmt(last)
+        result[f"avg_{name}"] = fmt(mean)
+        result[f"max_{name}"] = fmt(peak)
+        result[f"pct_{name}"] = fmt(pct)
+    return result
+
+
+def ref_pct_values(samples, policy):
+    """Nilai persentil mentah (untuk toleransi sketch)"""
+    return [ref_direction([s[idx] for s in samples], policy)[3] for idx in (1, 2)]
+
+
+def dedup_last(samples):
+    """Semantik SampleStore: satu sampel per timestamp, yang terakhir menang"""
+    by_ts = {}
+    for sample in samples:
+        by_ts[sample[0]] = sample
+    return [by_ts[ts] for ts in sorted(by_ts)]
+
+
+# ============================================================
+# GENERATOR DATA
+# ============================================================
+
+def random_value(rng, pool, nan_ratio):
+    if rng.random() < nan_ratio:
+        return None
+    roll = rng.random()
+    if roll < 0.35:
+        return rng.choice(pool)
+    if roll < 0.55:
+        return rng.choice(BOUNDARY_VALUES)
+    if roll < 0.60:
+        return -rng.uniform(0, 1e3)
+    return rng.uniform(0, 10 ** rng.randint(0, 10))
+
+
+def random_series(rng):
+    """Seri sampel (ts, in, out) urut waktu: NaN, gap, duplikat, nilai batas"""
+    if rng.random() < 0.05:
+        length = rng.randint(EXACT_LIMIT + 1, EXACT_LIMIT + 800)
+    else:
+        length = rng.randint(1, 300)
+    nan_ratio = rng.choice([0.0, 0.0, 0.05, 0.3, 0.9, 1.0])
+    # Seri dengan sedikit nilai berbeda membuat rata-rata sering tepat di batas
+    pool = [rng.choice(BOUNDARY_VALUES) for _ in range(rng.randint(1, 3))]
+    dup_ratio = rng.choice([0.0, 0.0, 0.05])
+    gap_ratio = rng.choice([0.0, 0.1, 0.4])
+
+    samples = []
+    ts = DAY_TS
+    while len(samples) < length:
+        ts += 300 * (1 + (rng.randint(1, 12) if rng.random() < gap_ratio else 0))
+        samples.append((ts, random_value(rng, pool, nan_ratio), random_value(rng, pool, nan_ratio)))
+        if rng.random() < dup_ratio:
+            samples.append((ts, random_value(rng, pool, nan_ratio), random_value(rng, pool, nan_ratio)))
+    return samples
+
+
+def format_cell(rng, val):
+    """Teks sel CSV dengan variasi format Cacti/RRDtool"""
+    if val is None:
+        return rng.choice(["NaN", "NaN", "nan", '"NaN"'])
+    text = rng.choice([f"{val:.6e}", repr(val), f"{val:.10e}"])
+    return f'"{text}"' if rng.random() < 0.1 else text
+
+
+def to_csv_text(rng, samples):
+    """Respons graph_xport lengkap (preamble, header, baris data)"""
+    lines = ['"Title","Router - Traffic - ether1-Ünïcode"', '"Vertical Label","bits per second"', '']
+    lines.append(",".join(f'"{col}"' for col in HEADER))
+    for ts, in_val, out_val in samples:
+        date = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+        cells = [f'"{date}"', format_cell(rng, in_val), format_cell(rng, in_val),
+                 format_cell(rng, out_val), format_cell(rng, out_val)]
+        if rng.random() < 0.01:
+            cells[2] = rng.choice(["", '""', "n/a"])  # sel kosong / rusak -> baris dilewati
+        lines.append(",".join(cells))
+    text = "\r\n".join(lines) if rng.random() < 0.5 else "\n".join(lines)
+    return ("\ufeff" + text) if rng.random() < 0.3 else text
+
+
+def ref_parse(text):
+    """Referensi parser: csv module + float(), NaN = None, sel kosong/rusak = baris dilewati"""
+    import csv
+    rows = list(csv.reader(text.lstrip("\ufeff").splitlines()))
+    start = next(i for i, row in enumerate(rows) if row and row[0] == "Date") + 1
+    samples = []
+    for row in rows[start:]:
+        if not row:
+            continue
+        ts = int(datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S").timestamp())
+        try:
+            values = [float(row[idx]) for idx in (2, 4)]
+        except (ValueError, IndexError):
+            continue
+        samples.append((ts, *(None if val != val else val for val in values)))
+    return samples
+
+
+class FakeResponse:
+    """Respons requests palsu: isi dikirim per chunk acak (uji decoder)"""
+
+    def __init__(self, data, rng):
+        self.data = data
+        self.rng = rng
+        self.encoding = 'utf-8'
+
+    def iter_content(self, chunk_size):
+        pos = 0
+        while pos < len(self.data):
+            size = self.rng.randint(1, 64)
+            yield self.data[pos:pos + size]
+            pos += size
+
+
+# ============================================================
+# PEMBANDING
+# ============================================================
+
+class Checker:
+    def __init__(self):
+        self.counts = {}
+        self.failures = {}
+
+    def check(self, engine, got, expected, context, pct_expected=None):
+        self.counts[engine] = self.counts.get(engine, 0) + 1
+        if got == expected:
+            return
+        if got and expected and pct_expected is not None:
+            # Di atas EXACT_LIMIT sketch boleh meleset <= PERCENTILE_ACCURACY
+            got_rest = {k: v for k, v in got.items() if not k.startswith("pct_")}
+            exp_rest = {k: v for k, v in expected.items() if not k.startswith("pct_")}
+            if got_rest == exp_rest and all(
+                    within_accuracy(got[f"pct_{name}"], value)
+                    for name, value in zip(("in", "out"), pct_expected)):
+                return
+        failures = self.failures.setdefault(engine, [])
+        failures.append((context, got, expected))
+
+    def report(self):
+        print(f"\n  {'Engine':<36} {'Cek':>8} {'Gagal':>8}")
+        for engine, count in self.counts.items():
+            failed = len(self.failures.get(engine, []))
+            print(f"  {engine:<36} {count:>8} {failed:>8}  {'❌' if failed else '✅'}")
+        for engine, failures in self.failures.items():
+            print(f"\n  ❌ {engine}: contoh selisih")
+            for context, got, expected in failures[:3]:
+                print(f"     {context}")
+                diff = {k for k in set(got or {}) | set(expected or {})
+                        if (got or {}).get(k) != (expected or {}).get(k)}
+                for key in sorted(diff):
+                    print(f"       {key}: got={(got or {}).get(key)} expected={(expected or {}).get(key)}")
+        return not self.failures
+
+
+def parse_fmt(text):
+    number, _, unit = text.partition(" ")
+    return float(number) * {"": 1, "K": 1e3, "M": 1e6, "G": 1e9}[unit]
+
+
+def within_accuracy(text, expected):
+    tolerance = config.PERCENTILE_ACCURACY * abs(expected) + 0.005 * max(1.0, abs(expected) / 1e3)
+    return abs(parse_fmt(text) - expected) <= tolerance * 1.01
+
+
+# ============================================================
+# JALUR YANG DICEK
+# ============================================================
+
+def check_series(checker, rng, samples, series_no, store_dir):
+    engines = [("Python", False)] + ([("NumPy", True)] if traffic_stats.HAS_NUMPY else [])
+    nan = float('nan')
+    in_values = [nan if s[1] is None else s[1] for s in samples]
+    out_values = [nan if s[2] is None else s[2] for s in samples]
+
+    for policy in (NAN_ZERO, NAN_SKIP):
+        ctx = f"seri #{series_no}, {len(samples)} sampel, policy={policy}"
+        expected = ref_stats(samples, policy)
+        pct_expected = ref_pct_values(samples, policy)
+
+        checker.check("stats_from_columns (Python)",
+                      stats_from_columns(in_values, out_values, policy), expected, ctx)
+        if traffic_stats.HAS_NUMPY:
+            checker.check("stats_from_columns (NumPy)",
+                          stats_from_columns(traffic_stats.np.array(in_values),
+                                             traffic_stats.np.array(out_values), policy), expected, ctx)
+
+        # Sampel export: kolom float64 (NumPy) / StatsAccumulator (tanpa NumPy)
+        for label, use_numpy in engines:
+            traffic_stats.HAS_NUMPY = use_numpy
+            try:
+                got = stats_from_samples(iter(samples), policy)
+            finally:
+                traffic_stats.HAS_NUMPY = HAS_NUMPY
+            checker.check(f"stats_from_samples ({label})", got, expected, ctx,
+                          None if use_numpy else pct_expected)
+
+        # Akumulator: potongan acak, digabung berurutan
+        cuts = sorted(rng.sample(range(len(samples) + 1), min(3, len(samples) + 1)))
+        merged = StatsAccumulator(policy)
+        for lo, hi in zip([0] + cuts, cuts + [len(samples)]):
+            part = StatsAccumulator(policy)
+            for sample in samples[lo:hi]:
+                part.add_sample(sample)
+            merged.merge(part)
+        checker.check("StatsAccumulator (+merge)", merged.result(), expected, ctx, pct_expected)
+
+        # WindowIndex: jendela acak
+        index = WindowIndex(samples, policy)
+        first, last = samples[0][0], samples[-1][0]
+        for _ in range(3):
+            start = rng.randint(first - 600, last)
+            end = rng.randint(start, last + 600)
+            window = [s for s in samples if start <= s[0] <= end]
+            checker.check("WindowIndex", index.query(start, end), ref_stats(window, policy),
+                          f"{ctx}, jendela {start - DAY_TS}..{end - DAY_TS}")
+
+        # SlotStats: slot acak di tanggal seri ini, scan per slot (Python & NumPy)
+        # dan WindowIndex (Python, INDEX_MIN_SLOTS dipaksa 1)
+        slots = [(rng.randint(0, 23), rng.choice([0, 15, 30, 55])) for _ in range(3)]
+        slot_engines = [(label, use_numpy, len(slots) + 1) for label, use_numpy in engines]
+        slot_engines.append(("WindowIndex", False, 1))
+        for label, use_numpy, min_slots in slot_engines:
+            traffic_stats.HAS_NUMPY, traffic_stats.INDEX_MIN_SLOTS = use_numpy, min_slots
+            try:
+                slot_stats = SlotStats(DAY, slots, policy)
+                for sample in samples:
+                    slot_stats.add(sample)
+                finished = slot_stats.finish()
+            finally:
+                traffic_stats.HAS_NUMPY, traffic_stats.INDEX_MIN_SLOTS = HAS_NUMPY, INDEX_MIN_SLOTS
+            for hour, minute in slots:
+                start, end = slot_window(DAY, hour, minute)
+                window = [s for s in samples if start <= s[0] <= end]
+                checker.check(f"SlotStats ({label})", finished.get((hour, minute)),
+                              ref_stats(window, policy), f"{ctx}, slot {hour:02d}:{minute:02d}")
+
+        # DayFile: kolom SlotStats ditulis ke file harian lalu dibaca lewat mmap
+        files = day_files.DayFiles(store_dir)
+        files.write("g", DAY, slot_stats.timestamps, slot_stats.inbound, slot_stats.outbound,
+                    first, last, 300)
+        for label, use_numpy in engines:
+            day_files.HAS_NUMPY = use_numpy
+            try:
+                with files.open("g", DAY) as day_file:
+                    for hour, minute in slots:
+                        start, end = slot_window(DAY, hour, minute)
+                        window = [s for s in samples if start <= s[0] <= end]
+                        checker.check(f"DayFile ({label})", day_file.query(start, end, policy),
+                                      ref_stats(window, policy),
+                                      f"{ctx}, slot {hour:02d}:{minute:02d}")
+            finally:
+                day_files.HAS_NUMPY = HAS_NUMPY
+
+    # Rollup store (lebih lambat): sebagian seri saja
+    if series_no % 10 == 0:
+        check_store(checker, rng, samples, series_no, store_dir)
+
+    # Parser CSV: file (parser umum lalu parser cepat) dan respons per chunk
+    text = to_csv_text(rng, samples)
+    expected_samples = ref_parse(text)
+    schemas = SchemaCache()
+    for label in ("parser umum", "parser cepat"):
+        meta = {}
+        with tempfile.TemporaryFile('w+', encoding='utf-8', newline='') as f:
+            f.write(text)
+            f.seek(0)
+            parsed = list(iter_samples(iter_file_lines(f), meta, schemas, "g"))
+        checker.check(f"iter_samples ({label})", parsed, expected_samples, f"seri #{series_no}")
+    meta = {}
+    parsed = list(iter_samples(iter_response_lines(FakeResponse(text.encode('utf-8'), rng), 64),
+                               meta, schemas, "g"))
+    checker.check("iter_samples (respons per chunk)", parsed, expected_samples, f"seri #{series_no}")
+
+    # Export 5 menit tidak boleh diubah regrid
+    uniform = [(DAY_TS + 300 * i, s[1], s[2]) for i, s in enumerate(samples)]
+    checker.check("regrid_samples (5 menit)", list(regrid_samples(iter(uniform), {})), uniform,
+                  f"seri #{series_no}")
+
+    # Blok arsip: timestamp & nilai harus kembali persis
+    deduped = dedup_last(samples)
+    checker.check("sample_codec (encode/decode)", decode_block(encode_block(deduped)[1]), deduped,
+                  f"seri #{series_no}")
+
+
+def check_store(checker, rng, samples, series_no, store_dir):
+    """SampleStore: tambah bertahap (coverage acak), query jendela dari rollup"""
+    deduped = dedup_last(samples)
+    first, last = deduped[0][0], deduped[-1][0]
+    sketch = config.PERCENTILE_ACCURACY
+    path = os.path.join(store_dir, f"s{series_no}.db")
+    store = SampleStore(path, sketch)
+    # Koneksi kedua tanpa sketch: hari utuh di blok dibaca dari header blok
+    plain = SampleStore(path)
+    try:
+        cursor = first - 300
+        while cursor < last:
+            step = rng.randint(1, 60) * 300
+            lo = max(first - 300, cursor - rng.randint(0, 6) * 300)
+            chunk = [s for s in samples if lo <= s[0] <= cursor + step + 600]
+            store.add_samples("g", iter(chunk), lo, cursor + step)
+            cursor += step
+
+        if rng.random() < 0.5:
+            # Sebagian hari dipindah ke blok terkompresi
+            store.compact(rng.randint(first, last + 2 * 86400))
+        checker.check("SampleStore (samples + blok)", store.get_samples("g", first, last), deduped,
+                      f"seri #{series_no}")
+
+        for policy in (NAN_ZERO, NAN_SKIP):
+            for _ in range(3):
+                start = rng.randint(first - 3600, last)
+                end = rng.randint(start, last + 3600)
+                window = [s for s in deduped if start <= s[0] <= end]
+                checker.check("SampleStore rollup", stats_from_bucket(store.window_bucket("g", start, end), policy),
+                              ref_stats(window, policy),
+                              f"seri #{series_no}, policy={policy}, jendela {start - DAY_TS}..{end - DAY_TS}",
+                              ref_pct_values(window, policy) if window else None)
+                checker.check("SampleStore rollup (header blok)",
+                              without_pct(stats_from_bucket(plain.window_bucket("g", start, end), policy)),
+                              without_pct(ref_stats(window, policy)),
+                              f"seri #{series_no}, policy={policy}, jendela {start - DAY_TS}..{end - DAY_TS}")
+    finally:
+        plain.close()
+        store.close()
+
+
+def main():
+    series_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 20260123
+
+    print("=" * 70)
+    print("  VERIFIKASI EKUIVALENSI ENGINE STATISTIK & PARSER")
+    print("=" * 70)
+    print(f"\n  Seri   : {series_count} (seed {seed})")
+    print(f"  NumPy  : {'ya' if traffic_stats.HAS_NUMPY else 'tidak terinstall'}")
+
+    config.PERCENTILE = PERCENTILE
+    config.EXCEL_COL_PCT_IN = config.EXCEL_COL_PCT_IN or 9  # persentil hanya dihitung jika ada kolomnya
+    rng = random.Random(seed)
+    checker = Checker()
+    store_dir = tempfile.mkdtemp(prefix="equivalence_")
+    try:
+        for series_no in range(series_count):
+            check_series(checker, rng, random_series(rng), series_no, store_dir)
+            if (series_no + 1) % 500 == 0:
+                print(f"  ... {series_no + 1} seri")
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+    ok = checker.report()
+    print("\n" + "=" * 70)
+    print("  🎉 SEMUA ENGINE SAMA DENGAN REFERENSI" if ok else "  ❌ ADA ENGINE YANG BERBEDA DARI REFERENSI")
+    print("=" * 70)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())